@@ -0,0 +1,77 @@
+"""
+Caches of the account application.
+
+Known (receiver, visitor) pairs: an entry means that the visitor has already visited the receiver's profile,
+so repeat visits don't touch the profile at all. Only positive answers are cached and visitors are never removed
+from a profile, so an entry can't become stale. Entries are written only after the transaction is committed.
+
+Last visitors, profile cards and profile snapshots are kept in the shared cache. Their namespaces are bumped
+by new visits and by saving the profile or its related rows.
+"""
+from typing import Callable, Iterable, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from epuls_tools.cache import LocalCache
+
+known_visitor_cache = LocalCache(
+    max_size=getattr(settings, "KNOWN_VISITOR_CACHE", {}).get("MAX_SIZE", 100000)
+)
+
+
+def is_known_visitor(receiver_id: int, visitor_id: int) -> bool:
+    return (receiver_id, visitor_id) in known_visitor_cache
+
+
+def remember_visitor(receiver_id: int, visitor_id: int) -> None:
+    transaction.on_commit(
+        lambda: known_visitor_cache.set((receiver_id, visitor_id), True)
+    )
+
+
+LAST_VISITORS_TIMEOUT = 60
+
+
+def get_last_visitors(user_id: int, amt: int, pull: Callable[[], Iterable]) -> List:
+    """Returns the cached last visitors of the user. Only one request pulls them when they are missing."""
+    version = cache.get_namespace_version(f"last_visitors:{user_id}")
+    return cache.get_or_set(
+        f"last_visitors:{user_id}:{amt}",
+        lambda: list(pull()),
+        LAST_VISITORS_TIMEOUT,
+        version=version,
+    )
+
+
+def bump_namespaces(namespaces: List[str]) -> None:
+    """Bumps namespaces now and again after the commit, so readers don't cache uncommitted data in between."""
+
+    def bump() -> None:
+        for namespace in namespaces:
+            cache.bump_namespace(namespace)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def invalidate_last_visitors(user_ids: Iterable[int]) -> None:
+    bump_namespaces([f"last_visitors:{user_id}" for user_id in set(user_ids)])
+
+
+def get_profile_card_version(profile_id: int) -> int:
+    """Returns the version which the cached fragments of the profile card vary on."""
+    return cache.get_namespace_version(f"profile_card:{profile_id}")
+
+
+def invalidate_profile_card(profile_id: int) -> None:
+    bump_namespaces([f"profile_card:{profile_id}"])
+
+
+def get_profile_snapshot_version(user_id: int) -> int:
+    return cache.get_namespace_version(f"profile_snapshot:{user_id}")
+
+
+def invalidate_profile_snapshots(user_ids: Iterable[int]) -> None:
+    bump_namespaces([f"profile_snapshot:{user_id}" for user_id in set(user_ids)])
@@ -148,3 +148,14 @@ class PresentationForm(forms.ModelForm):
 
         for field in self.fields.values():
             field.label = ""
+
+
+class UserSearchForm(forms.Form):
+    q = forms.CharField(required=False, max_length=100)
+    gender = forms.ChoiceField(
+        choices=[("", "Anyone"), *Gender.choices],
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    min_age = forms.IntegerField(required=False, min_value=0, max_value=150)
+    max_age = forms.IntegerField(required=False, min_value=0, max_value=150)
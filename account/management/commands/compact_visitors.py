@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from account.models import DailyVisit, Visitor
+
+
+class Command(BaseCommand):
+    help = (
+        "Folds Visitor rows older than the retention period into daily buckets (DailyVisit) "
+        "and deletes them. The last visits are kept in LastVisit, so the profile visitors don't change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=getattr(settings, "VISITOR_RETENTION_DAYS", 30),
+            help="How many days raw Visitor rows are kept.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="How many Visitor rows are folded in one transaction.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        old_visits = Visitor.objects.filter(date_of_visit__lt=cutoff).order_by("pk")
+
+        compacted = 0
+        while True:
+            ids = list(old_visits.values_list("pk", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+
+            with transaction.atomic():
+                self.fold(ids)
+                Visitor.objects.filter(pk__in=ids).delete()
+
+            compacted += len(ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{compacted} visits have been folded into daily buckets."
+            )
+        )
+
+    def fold(self, ids) -> None:
+        """Adds the amount of visits to the daily buckets."""
+        buckets = (
+            Visitor.objects.filter(pk__in=ids)
+            .annotate(day=TruncDate("date_of_visit"))
+            .values("receiver_id", "visitor_id", "day")
+            .annotate(visits=Count("pk"))
+            .order_by()
+        )
+        visits = {
+            (bucket["receiver_id"], bucket["visitor_id"], bucket["day"]): bucket[
+                "visits"
+            ]
+            for bucket in buckets
+        }
+
+        existing = DailyVisit.objects.filter(
+            receiver_id__in={key[0] for key in visits},
+            visitor_id__in={key[1] for key in visits},
+            day__in={key[2] for key in visits},
+        )
+        to_update = []
+        for daily_visit in existing:
+            key = (daily_visit.receiver_id, daily_visit.visitor_id, daily_visit.day)
+            if key in visits:
+                daily_visit.visits += visits.pop(key)
+                to_update.append(daily_visit)
+
+        DailyVisit.objects.bulk_update(to_update, ["visits"])
+        DailyVisit.objects.bulk_create(
+            [
+                DailyVisit(
+                    receiver_id=receiver_id,
+                    visitor_id=visitor_id,
+                    day=day,
+                    visits=amount,
+                )
+                for (receiver_id, visitor_id, day), amount in visits.items()
+            ]
+        )
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from account.models import Profile
+from epuls_tools.presentation import compile_profile_presentation, hash_presentation
+
+
+class Command(BaseCommand):
+    help = (
+        "Compiles presentations which have no compiled form or whose compiled form is stale. "
+        "Presentations are rendered from scratch until then, so it only makes profile views cheaper."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="How many profiles are updated with one bulk update.",
+        )
+
+    def handle(self, *args, **options):
+        profiles = (
+            Profile.objects.exclude(presentation=None)
+            .exclude(presentation="")
+            .only("presentation", "compiled_presentation_hash")
+            .order_by("pk")
+        )
+
+        compiled, batch = 0, []
+        for profile in profiles.iterator(chunk_size=options["batch_size"]):
+            if profile.compiled_presentation_hash == hash_presentation(
+                profile.presentation
+            ):
+                continue
+            compile_profile_presentation(profile)
+            batch.append(profile)
+            if len(batch) >= options["batch_size"]:
+                compiled += self.update_profiles(batch)
+                batch = []
+        compiled += self.update_profiles(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{compiled} presentations have been compiled.")
+        )
+
+    def update_profiles(self, profiles: list) -> int:
+        Profile.objects.bulk_update(
+            profiles, ["compiled_presentation", "compiled_presentation_hash"]
+        )
+        return len(profiles)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from account.search import is_search_indexed, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the full-text index of users from scratch. "
+        "The index is kept by signals, so it's needed only after bulk changes which bypass them."
+    )
+
+    def handle(self, *args, **options):
+        if not is_search_indexed():
+            raise CommandError("The search index is kept only on SQLite.")
+
+        with transaction.atomic():
+            indexed = rebuild_search_index()
+
+        self.stdout.write(self.style.SUCCESS(f"{indexed} users have been indexed."))
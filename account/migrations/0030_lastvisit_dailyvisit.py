@@ -0,0 +1,120 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_last_visits(apps, schema_editor):
+    Visitor = apps.get_model("account", "Visitor")
+    LastVisit = apps.get_model("account", "LastVisit")
+
+    last_visits = (
+        Visitor.objects.values("receiver", "visitor")
+        .annotate(last_visit=models.Max("date_of_visit"))
+        .order_by()
+    )
+    LastVisit.objects.bulk_create(
+        [
+            LastVisit(
+                receiver_id=visit["receiver"],
+                visitor_id=visit["visitor"],
+                date_of_visit=visit["last_visit"],
+            )
+            for visit in last_visits
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0028_profile_login_counter"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyVisit",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("visits", models.PositiveIntegerField(default=0)),
+                (
+                    "receiver",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_visits",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "visitor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="LastVisit",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date_of_visit", models.DateTimeField()),
+                (
+                    "receiver",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="last_visits",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "visitor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="dailyvisit",
+            constraint=models.UniqueConstraint(
+                fields=("receiver", "visitor", "day"), name="unique_daily_visit"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lastvisit",
+            index=models.Index(
+                fields=["receiver", "-date_of_visit"],
+                name="account_las_receive_7dfdc9_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="lastvisit",
+            constraint=models.UniqueConstraint(
+                fields=("receiver", "visitor"), name="unique_last_visit"
+            ),
+        ),
+        migrations.RunPython(fill_last_visits, migrations.RunPython.noop),
+    ]
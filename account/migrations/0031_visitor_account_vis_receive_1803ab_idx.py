@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0030_lastvisit_dailyvisit"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="visitor",
+            index=models.Index(
+                fields=["receiver", "visitor", "date_of_visit"],
+                name="account_vis_receive_1803ab_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0031_visitor_account_vis_receive_1803ab_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="compiled_presentation",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="Sanitised presentation split into literal chunks and placeholders of tags.",
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.0.1 on 2026-10-18 18:05
+
+from django.db import migrations
+from localflavor.pl.pl_voivodeships import VOIVODESHIP_CHOICES
+
+ABOUT_FIELDS = ("politics", "dish", "film", "song", "idol")
+
+
+def create_user_search(apps, schema_editor):
+    """Creates the FTS5 index of users and fills it. It's kept only on SQLite."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE account_user_search USING fts5("
+        "username, short_description, voivodeship, about, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+
+    Profile = apps.get_model("account", "Profile")
+    voivodeships = {value: str(label) for value, label in VOIVODESHIP_CHOICES}
+    rows = [
+        (
+            user_id,
+            username,
+            short_description or "",
+            voivodeships.get(voivodeship, ""),
+            " ".join(answer for answer in about if answer),
+        )
+        for user_id, username, short_description, voivodeship, *about in Profile.objects.values_list(
+            "user_id",
+            "user__username",
+            "short_description",
+            "voivodeship",
+            *(f"about_me__{field}" for field in ABOUT_FIELDS),
+        )
+    ]
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO account_user_search (rowid, username, short_description, voivodeship, about) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+
+
+def drop_user_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS account_user_search")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0032_profile_compiled_presentation"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_user_search, drop_user_search),
+    ]
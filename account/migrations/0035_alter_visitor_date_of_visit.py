@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-18 17:28
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0033_user_search"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="visitor",
+            name="date_of_visit",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.1 on 2026-10-18 17:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0035_alter_visitor_date_of_visit"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="compiled_presentation_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="SHA-256 of the presentation which the compiled presentation was made from.",
+                max_length=64,
+            ),
+        ),
+    ]
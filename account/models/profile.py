@@ -1,14 +1,16 @@
-from typing import NoReturn, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, NoReturn, Optional, Set, Tuple
 
 from django.contrib.auth.models import User
-from django.db import models
-from django.db.models import F, Max
+from django.db import connection, models
+from django.db.models import F
 from django.db.models.fields.files import ImageField
 from django.forms import ValidationError
 from django.urls import reverse
 from django.utils import timezone
 from localflavor.pl.pl_voivodeships import VOIVODESHIP_CHOICES
 
+from account.cache import invalidate_last_visitors
 from puls.models import Puls
 
 from .emotion import BasicEmotion, DivineEmotion, ProEmotion, XtremeEmotion
@@ -56,6 +58,11 @@ DIVINE_TYPE = {
 TYPE_OF_PROFILE = {"B": BASIC_TYPE, "P": PRO_TYPE, "X": XTREME_TYPE, "D": DIVINE_TYPE}
 
 
+def visitor_counter_field(gender: str) -> str:
+    """Returns the name of the Profile field which counts visitors of the given gender."""
+    return f"{Gender(gender).label.lower()}_visitor"
+
+
 class ProfileType(models.TextChoices):
     BASIC = "B", "Basic"
     PRO = "P", "Pro"
@@ -111,6 +118,17 @@ class Profile(models.Model):
 
     short_description = models.TextField(blank=True, null=True, max_length=100)
     presentation = models.TextField(blank=True, null=True)
+    compiled_presentation = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Sanitised presentation split into literal chunks and placeholders of tags.",
+    )
+    compiled_presentation_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="SHA-256 of the presentation which the compiled presentation was made from.",
+    )
 
     created = models.DateTimeField(auto_now_add=True)
 
@@ -174,17 +192,66 @@ class Profile(models.Model):
 
     __currently_type = None
 
+    # fields whose changes are followed by signals, see 'get_changed_fields()'
+    TRACKED_FIELDS = ("gender", "voivodeship", "profile_picture")
+
     def __str__(self) -> str:
         return f"{self.user.username}"
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
+        self.__saved_values = self.get_tracked_values()
         self.__currently_type = self.type_of_profile
 
     def save(self, *args, **kwargs) -> None:
         super().save(*args, **kwargs)
         self.__currently_type = self.type_of_profile
 
+        saved_values = self.get_tracked_values()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            saved_values = {
+                field: value
+                for field, value in saved_values.items()
+                if field in update_fields
+            }
+        self.__saved_values.update(saved_values)
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        super().refresh_from_db(*args, **kwargs)
+        # loading a deferred field refreshes only that field
+        fields = kwargs.get("fields")
+        self.__saved_values.update(
+            (field, value)
+            for field, value in self.get_tracked_values().items()
+            if fields is None or field in fields
+        )
+
+    def get_tracked_values(self) -> Dict[str, Any]:
+        # deferred fields are skipped, so tracking doesn't query them;
+        # files are compared by name, because saving a file changes the same FieldFile
+        return {
+            field: getattr(self.__dict__[field], "name", self.__dict__[field])
+            for field in self.TRACKED_FIELDS
+            if field in self.__dict__
+        }
+
+    def get_changed_fields(
+        self, update_fields: Optional[Iterable[str]] = None
+    ) -> Set[str]:
+        """
+        Returns tracked fields whose values differ from the ones loaded from or saved to the database.
+        It's meant for post_save receivers, so only fields in 'update_fields' are checked when they are given.
+        """
+        changed = {
+            field
+            for field, value in self.get_tracked_values().items()
+            if field not in self.__saved_values or self.__saved_values[field] != value
+        }
+        if update_fields is not None:
+            changed &= set(update_fields)
+        return changed
+
     def get_absolute_url(self) -> str:
         return reverse("account:profile", kwargs={"username": self.user.username})
 
@@ -268,12 +335,20 @@ class Profile(models.Model):
 
     def set_profile_picture(self, image_field: ImageField) -> None:
         """
-        Set a new profile picture.
+        Set a new profile picture. The file is shared with the picture request, so it gets one more reference.
         """
+        old_picture = self.profile_picture.name
+        image_field.storage.retain(image_field.name)
+
         self.profile_picture = image_field
         self.save(update_fields=["profile_picture"])
 
+        if old_picture:
+            self.profile_picture.storage.delete(old_picture)
+
     def delete_profile_picture(self) -> None:
+        if self.profile_picture:
+            self.profile_picture.delete(save=False)
         self.profile_picture = None
         self.save(update_fields=["profile_picture"])
 
@@ -353,7 +428,8 @@ class Profile(models.Model):
 
 
 class Visitor(models.Model):
-    date_of_visit = models.DateTimeField(auto_now_add=True)
+    # not 'auto_now_add', so the tracker buffer can write the date of a queued visit
+    date_of_visit = models.DateTimeField(default=timezone.now, editable=False)
     visitor = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -364,17 +440,19 @@ class Visitor(models.Model):
         User, on_delete=models.CASCADE, help_text="The user who had been visited."
     )
 
+    class Meta:
+        indexes = [models.Index(fields=["receiver", "visitor", "date_of_visit"])]
+
     @classmethod
     def get_visitor(cls, user: User, amt: int = 5):
         """
         Returns a qs of usernames for visitors who have visited the user's profile.
+        The last visits are read from the LastVisit table, so it's an indexed top-N query.
         """
         return (
-            cls.objects.filter(receiver=user)
+            LastVisit.objects.filter(receiver=user)
             .exclude(visitor=user)
-            .values("visitor")
-            .annotate(max_date=Max("date_of_visit"))
-            .order_by("-max_date")
+            .order_by("-date_of_visit")
             .values_list(
                 "visitor__username",
                 "visitor__profile__gender",
@@ -384,6 +462,83 @@ class Visitor(models.Model):
         )
 
 
+class LastVisit(models.Model):
+    """
+    The latest visit of a visitor on the receiver's profile. It's maintained on every Visitor write.
+    """
+
+    receiver = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="last_visits"
+    )
+    visitor = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    date_of_visit = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["receiver", "visitor"], name="unique_last_visit"
+            )
+        ]
+        indexes = [models.Index(fields=["receiver", "-date_of_visit"])]
+
+    @classmethod
+    def record(cls, visits: Iterable[Tuple[int, int, datetime]]) -> None:
+        """
+        Upserts the last-seen dates. Visits may be written out of order, e.g. by buffers of other processes,
+        so a date is only ever moved forward: each batch keeps the latest date of a pair and the database
+        keeps the stored date when it's newer.
+        Parameters:
+            - visits: (receiver_id, visitor_id, date_of_visit) tuples.
+        """
+        latest = {}
+        for receiver_id, visitor_id, date in visits:
+            key = (receiver_id, visitor_id)
+            if key not in latest or latest[key] < date:
+                latest[key] = date
+        if not latest:
+            return
+
+        # bulk_create(update_conflicts=True) can't make the update conditional
+        table = cls._meta.db_table
+        date_field = cls._meta.get_field("date_of_visit")
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {table} (receiver_id, visitor_id, date_of_visit) VALUES (%s, %s, %s) "
+                "ON CONFLICT (receiver_id, visitor_id) DO UPDATE SET date_of_visit = excluded.date_of_visit "
+                f"WHERE {table}.date_of_visit < excluded.date_of_visit",
+                [
+                    (
+                        receiver_id,
+                        visitor_id,
+                        date_field.get_db_prep_value(date, connection),
+                    )
+                    for (receiver_id, visitor_id), date in latest.items()
+                ],
+            )
+        invalidate_last_visitors(receiver_id for receiver_id, _ in latest)
+
+
+class DailyVisit(models.Model):
+    """
+    Amount of visits of a visitor on the receiver's profile in one day.
+    Old Visitor rows are folded into these buckets by the 'compact_visitors' command.
+    """
+
+    receiver = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="daily_visits"
+    )
+    visitor = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    day = models.DateField()
+    visits = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["receiver", "visitor", "day"], name="unique_daily_visit"
+            )
+        ]
+
+
 class FriendRequest(models.Model):
     from_user = models.ForeignKey(
         User, related_name="from_user", on_delete=models.CASCADE
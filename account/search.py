@@ -0,0 +1,240 @@
+"""
+Full-text search of users.
+
+Users are indexed in the SQLite FTS5 table ``account_user_search`` whose rowid is the user id. Its columns are
+the username, the short description, the voivodeship and the 'about me' answers, so a search never scans
+the user table. Every word of the query is matched as a prefix, which serves typeahead, and results are ranked
+by bm25 with the username weighing the most. Gender and age are filtered by joining the profile through
+its unique user index.
+
+Rows are refreshed by the signals of the account application, see 'index_users()'. The whole index is rebuilt
+by 'manage.py rebuild_user_search'. On databases other than SQLite the index isn't kept and usernames are
+matched with LIKE instead.
+"""
+import re
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.core.exceptions import BadRequest
+from django.db import connection
+from django.db.models import QuerySet
+from django.utils import timezone
+from localflavor.pl.pl_voivodeships import VOIVODESHIP_CHOICES
+
+from epuls_tools.pagination import (
+    KeysetPage,
+    decode_values,
+    encode_values,
+    paginate_by_keyset,
+)
+
+from .models import Profile
+
+SEARCH_TABLE = "account_user_search"
+# bm25 weights of the username, short description, voivodeship and about columns
+WEIGHTS = (10.0, 2.0, 1.0, 1.0)
+ABOUT_FIELDS = ("politics", "dish", "film", "song", "idol")
+INDEX_BATCH_SIZE = 1000
+
+VOIVODESHIPS = {value: str(label) for value, label in VOIVODESHIP_CHOICES}
+WORD = re.compile(r"\w+")
+
+
+def is_search_indexed() -> bool:
+    return connection.vendor == "sqlite"
+
+
+# Indexing
+
+
+def pull_rows(user_ids: Optional[Iterable[int]] = None) -> List[Tuple]:
+    profiles = Profile.objects.values_list(
+        "user_id",
+        "user__username",
+        "short_description",
+        "voivodeship",
+        *(f"about_me__{field}" for field in ABOUT_FIELDS),
+    )
+    if user_ids is not None:
+        profiles = profiles.filter(user_id__in=user_ids)
+
+    return [
+        (
+            user_id,
+            username,
+            short_description or "",
+            VOIVODESHIPS.get(voivodeship, ""),
+            " ".join(answer for answer in about if answer),
+        )
+        for user_id, username, short_description, voivodeship, *about in profiles
+    ]
+
+
+def write_rows(rows: List[Tuple]) -> None:
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, username, short_description, voivodeship, about) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+
+
+def remove_users(user_ids: Iterable[int]) -> None:
+    if not is_search_indexed():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+            [(user_id,) for user_id in set(user_ids)],
+        )
+
+
+def index_users(user_ids: Iterable[int]) -> None:
+    """Writes the current data of the users to the index. Users without a profile are removed."""
+    user_ids = set(user_ids)
+    if not user_ids or not is_search_indexed():
+        return
+    remove_users(user_ids)
+    write_rows(pull_rows(user_ids))
+
+
+def rebuild_search_index() -> int:
+    """Indexes all users from scratch. Returns the number of indexed users."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+    user_ids = list(User.objects.order_by("pk").values_list("pk", flat=True))
+    indexed = 0
+    for start in range(0, len(user_ids), INDEX_BATCH_SIZE):
+        rows = pull_rows(user_ids[start : start + INDEX_BATCH_SIZE])
+        write_rows(rows)
+        indexed += len(rows)
+    return indexed
+
+
+# Searching
+
+
+def build_match(query: str) -> Optional[str]:
+    """Returns the FTS5 query which matches every word of the query as a prefix, e.g. '"ann"* "war"*'."""
+    words = WORD.findall(query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def years_before(day: date, years: int) -> date:
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        # 29th February
+        return day.replace(year=day.year - years, day=28)
+
+
+def get_birth_dates(
+    min_age: Optional[int] = None, max_age: Optional[int] = None
+) -> Tuple[Optional[date], Optional[date]]:
+    """Returns (born after, born on or before) of users whose age is in the range."""
+    today = timezone.localdate()
+    born_after = years_before(today, max_age + 1) if max_age is not None else None
+    born_until = years_before(today, min_age) if min_age is not None else None
+    return born_after, born_until
+
+
+def filter_by_profile(
+    users: QuerySet,
+    gender: Optional[str] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+) -> QuerySet:
+    """Narrows the users to the gender and the age range."""
+    born_after, born_until = get_birth_dates(min_age, max_age)
+    if gender:
+        users = users.filter(profile__gender=gender)
+    if born_after:
+        users = users.filter(profile__date_of_birth__gt=born_after)
+    if born_until:
+        users = users.filter(profile__date_of_birth__lte=born_until)
+    return users
+
+
+def search_usernames(
+    query: str,
+    gender: Optional[str],
+    min_age: Optional[int],
+    max_age: Optional[int],
+    cursor: Optional[str],
+    per_page: int,
+) -> KeysetPage:
+    """Searches usernames with LIKE on databases without FTS5."""
+    users = User.objects.select_related("profile").filter(
+        username__icontains=query.strip()
+    )
+    users = filter_by_profile(users, gender, min_age, max_age)
+    return paginate_by_keyset(users, ("username", "pk"), cursor, per_page)
+
+
+def search_users(
+    query: str,
+    gender: Optional[str] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    cursor: Optional[str] = None,
+    per_page: int = 20,
+) -> KeysetPage:
+    """
+    Returns the page of users who match the query from the best match. The cursor is the (rank, id) of the last
+    user of the previous page. Ranks depend on the whole index, so pages may shift a little when users change.
+    """
+    match = build_match(query)
+    if match is None:
+        return KeysetPage([])
+    if not is_search_indexed():
+        return search_usernames(query, gender, min_age, max_age, cursor, per_page)
+
+    born_after, born_until = get_birth_dates(min_age, max_age)
+
+    rank = f"bm25({SEARCH_TABLE}, {', '.join(map(str, WEIGHTS))})"
+    conditions, params = [f"{SEARCH_TABLE} MATCH %s"], [match]
+    if gender:
+        conditions.append("profile.gender = %s")
+        params.append(gender)
+    if born_after:
+        conditions.append("profile.date_of_birth > %s")
+        params.append(born_after)
+    if born_until:
+        conditions.append("profile.date_of_birth <= %s")
+        params.append(born_until)
+    if cursor:
+        last_rank, last_id = decode_values(cursor, 2)
+        if not isinstance(last_rank, (int, float)) or not isinstance(last_id, int):
+            raise BadRequest(f"Invalid cursor '{cursor}'.")
+        conditions.append(
+            f"({rank} > %s OR ({rank} = %s AND {SEARCH_TABLE}.rowid > %s))"
+        )
+        params.extend([last_rank, last_rank, last_id])
+
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(
+            f"SELECT {SEARCH_TABLE}.rowid, {rank} AS search_rank FROM {SEARCH_TABLE} "
+            f"INNER JOIN {Profile._meta.db_table} profile ON profile.user_id = {SEARCH_TABLE}.rowid "
+            f"WHERE {' AND '.join(conditions)} "
+            f"ORDER BY search_rank, {SEARCH_TABLE}.rowid LIMIT %s",
+            [*params, per_page + 1],
+        )
+        rows = db_cursor.fetchall()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        last_id, last_rank = rows[per_page - 1]
+        next_cursor = encode_values([last_rank, last_id])
+
+    users = User.objects.select_related("profile").in_bulk(
+        [user_id for user_id, _ in rows[:per_page]]
+    )
+    return KeysetPage(
+        [users[user_id] for user_id, _ in rows[:per_page] if user_id in users],
+        next_cursor,
+        is_first=not cursor,
+    )
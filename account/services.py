@@ -0,0 +1,81 @@
+"""
+Profile snapshots.
+
+A snapshot holds everything the profile page shows about the owner: the profile with its user, 'about me'
+and Puls rows and the best friends with their profiles. It's built with two queries and kept in the shared
+cache, so the page doesn't touch these tables on a cache hit. Parts which depend on the viewer are composed
+by the view: the last visitors are cached per the list size of the viewer's tier and the last action comes
+from the last action cache.
+
+Snapshots are invalidated by the signals of the account application and by writes which bypass them,
+see 'invalidate_profile_snapshots()'. Changes of best friends' own profiles are seen after the timeout.
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from .cache import get_profile_snapshot_version
+from .models import Profile
+
+PROFILE_SNAPSHOT_TIMEOUT = 300
+
+
+@dataclass
+class ProfileSnapshot:
+    profile: Profile
+    best_friends: List[User]
+
+
+def build_profile_snapshot(user_id: int) -> Optional[ProfileSnapshot]:
+    profile = (
+        Profile.objects.select_related("user", "about_me", "puls")
+        .prefetch_related(
+            Prefetch(
+                "best_friends",
+                queryset=User.objects.select_related("profile").order_by("pk"),
+            )
+        )
+        .filter(user_id=user_id)
+        .first()
+    )
+    if profile is None:
+        return None
+    return ProfileSnapshot(
+        profile=profile, best_friends=list(profile.best_friends.all())
+    )
+
+
+def get_profile_user_id(username: str) -> Optional[int]:
+    """Returns the id of the user with the username. Ids are cached, because usernames are almost never changed."""
+    key = f"profile_user_id:{username}"
+    user_id = cache.get(key)
+    if user_id is None:
+        user_id = (
+            User.objects.filter(username=username).values_list("pk", flat=True).first()
+        )
+        if user_id is not None:
+            cache.set(key, user_id, PROFILE_SNAPSHOT_TIMEOUT)
+    return user_id
+
+
+def get_profile_snapshot(username: str) -> Optional[ProfileSnapshot]:
+    """Returns the snapshot of the user's profile or None when the user doesn't exist."""
+    user_id = get_profile_user_id(username)
+    if user_id is None:
+        return None
+
+    snapshot = cache.get_or_set(
+        f"profile_snapshot:{user_id}",
+        lambda: build_profile_snapshot(user_id),
+        PROFILE_SNAPSHOT_TIMEOUT,
+        version=get_profile_snapshot_version(user_id),
+    )
+
+    # the cached id belongs to a user who has changed the username
+    if snapshot is None or snapshot.profile.user.username != username:
+        cache.delete(f"profile_user_id:{username}")
+        return None
+    return snapshot
@@ -1,10 +1,15 @@
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
+from epuls_tools.presentation import invalidate_profile_picture
 from puls.models import Puls
 
-from .models.profile import AboutUser, Profile
+from .cache import invalidate_profile_card, invalidate_profile_snapshots
+from .models.profile import AboutUser, LastVisit, Profile, Visitor
+from .search import index_users, remove_users
+
+SEARCHED_PROFILE_FIELDS = {"short_description", "voivodeship", "about_me"}
 
 
 @receiver(post_save, sender=User)
@@ -14,3 +19,98 @@ def create_profile(sender, instance, created, **kwargs):
         about_user = AboutUser.objects.create()
         puls = Puls.objects.create()
         Profile.objects.create(user=instance, about_me=about_user, puls=puls)
+
+
+@receiver(post_save, sender=Visitor)
+def update_last_visit(sender, instance, created, **kwargs):
+    if created:
+        LastVisit.record(
+            [(instance.receiver_id, instance.visitor_id, instance.date_of_visit)]
+        )
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_presentations(sender, instance, created, update_fields, **kwargs):
+    # mentions of the profile show its profile picture or the default one for the gender,
+    # a new profile replaces the empty picture of mentions written before the user has signed up
+    if created or {"profile_picture", "gender"} & instance.get_changed_fields(
+        update_fields
+    ):
+        invalidate_profile_picture(instance.user.username)
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_card(sender, instance, **kwargs):
+    invalidate_profile_card(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_snapshot(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_profile_snapshots([instance.pk])
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_profile_snapshot(sender, instance, **kwargs):
+    invalidate_profile_snapshots([instance.user_id])
+
+
+@receiver(post_save, sender=AboutUser)
+@receiver(post_save, sender=Puls)
+def invalidate_related_snapshot(sender, instance, created, **kwargs):
+    if not created:
+        field = "about_me" if sender is AboutUser else "puls"
+        invalidate_profile_snapshots(
+            Profile.objects.filter(**{field: instance}).values_list(
+                "user_id", flat=True
+            )
+        )
+
+
+@receiver(m2m_changed, sender=Profile.best_friends.through)
+def invalidate_best_friends_snapshot(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate_profile_snapshots([instance.user_id])
+    elif pk_set:
+        invalidate_profile_snapshots(
+            Profile.objects.filter(pk__in=pk_set).values_list("user_id", flat=True)
+        )
+
+
+@receiver(post_delete, sender=Profile)
+def delete_profile_picture_file(sender, instance, **kwargs):
+    if instance.profile_picture:
+        instance.profile_picture.delete(save=False)
+
+
+# search index
+
+
+@receiver(post_save, sender=User)
+def index_user(sender, instance, created, update_fields, **kwargs):
+    # the profile of a new user is indexed when it's created
+    if not created and (update_fields is None or "username" in update_fields):
+        index_users([instance.pk])
+
+
+@receiver(post_save, sender=Profile)
+def index_profile(sender, instance, created, update_fields, **kwargs):
+    if created or update_fields is None or SEARCHED_PROFILE_FIELDS & set(update_fields):
+        index_users([instance.user_id])
+
+
+@receiver(post_save, sender=AboutUser)
+def index_about_user(sender, instance, created, **kwargs):
+    if not created:
+        index_users(
+            Profile.objects.filter(about_me=instance).values_list("user_id", flat=True)
+        )
+
+
+@receiver(post_delete, sender=Profile)
+def remove_from_search(sender, instance, **kwargs):
+    remove_users([instance.user_id])
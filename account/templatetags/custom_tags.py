@@ -7,7 +7,7 @@ from django.utils.safestring import mark_safe
 from typing_extensions import LiteralString
 
 from account.models import PROFILE_PICTURE_PATH, Profile, ProfileType
-from epuls_tools.presentation import Presentation
+from epuls_tools.presentation import render_presentation
 
 register = template.Library()
 
@@ -55,6 +55,5 @@ def find_username(html):
 
 @register.filter(is_safe=True)
 def transform_html_code(html, profile):
-    html_converter = Presentation(html, profile)
-    new_html = html_converter.convert()
+    new_html = render_presentation(html, profile)
     return mark_safe(new_html)  # nosec
@@ -3,6 +3,7 @@ from unittest.mock import patch
 from django.contrib.auth.models import User
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.messages import get_messages
+from django.core import mail
 from django.db.models import Sum
 from django.shortcuts import reverse
 from django.test import TestCase, tag
@@ -11,7 +12,8 @@ from django.utils.http import urlsafe_base64_encode
 from parameterized import parameterized
 
 from account.factories import PASSWORD, UserFactory
-from account.models import ProfileType
+from account.models import Gender, ProfileType
+from epuls_tools.jobs import run_pending_jobs
 from epuls_tools.scaler import (
     CONSTANT_PULS_QTY,
     EXTRA_PULS_BY_PROFILE_TYPE,
@@ -27,6 +29,31 @@ class DataSetWithOneUser(TestCase):
         UserFactory()
 
 
+@tag("a_su")
+class SignupTestCase(TestCase):
+    def test_should_send_confirmation_email_from_job(self):
+        self.client.post(
+            reverse("account:signup"),
+            {
+                "username": "newcomer",
+                "gender": Gender.FEMALE,
+                "email": "newcomer@example.com",
+                "password1": PASSWORD,
+                "password2": PASSWORD,
+            },
+        )
+        self.assertEqual(len(mail.outbox), 0)
+
+        run_pending_jobs()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["newcomer@example.com"])
+        self.assertIn(
+            urlsafe_base64_encode(force_bytes(User.objects.get().pk)),
+            mail.outbox[0].body,
+        )
+
+
 @tag("a_tc")
 class ActivateTestCase(TestCase):
     @classmethod
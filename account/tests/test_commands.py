@@ -0,0 +1,80 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, tag
+from django.utils import timezone
+
+from account.factories import UserFactory, VisitorFactory
+from account.models import DailyVisit, LastVisit, Profile, Visitor
+from epuls_tools.presentation import hash_presentation
+
+
+@tag("c_cv")
+class CompactVisitorsCommandTestCase(TestCase):
+    def setUp(self):
+        self.receiver, self.visitor = UserFactory.create_batch(2)
+        self.old_date = timezone.now() - timedelta(days=40)
+
+    def create_visits(self, amount, date):
+        visits = VisitorFactory.create_batch(
+            amount, visitor=self.visitor, receiver=self.receiver
+        )
+        Visitor.objects.filter(pk__in=[v.pk for v in visits]).update(date_of_visit=date)
+
+    def test_should_fold_old_visits_into_daily_bucket(self):
+        self.create_visits(3, self.old_date)
+        self.create_visits(2, timezone.now())
+
+        call_command("compact_visitors", days=30, stdout=StringIO())
+
+        self.assertEqual(Visitor.objects.count(), 2)
+        bucket = DailyVisit.objects.get()
+        self.assertEqual(bucket.visits, 3)
+        self.assertEqual(bucket.day, self.old_date.date())
+
+    def test_should_add_visits_to_existing_bucket(self):
+        self.create_visits(3, self.old_date)
+        call_command("compact_visitors", days=30, stdout=StringIO())
+
+        self.create_visits(2, self.old_date)
+        call_command("compact_visitors", days=30, batch_size=1, stdout=StringIO())
+
+        self.assertFalse(Visitor.objects.exists())
+        self.assertEqual(DailyVisit.objects.get().visits, 5)
+
+    def test_should_keep_last_visit(self):
+        self.create_visits(1, self.old_date)
+
+        call_command("compact_visitors", days=30, stdout=StringIO())
+
+        self.assertEqual(Visitor.get_visitor(self.receiver).count(), 1)
+        self.assertTrue(
+            LastVisit.objects.filter(
+                receiver=self.receiver, visitor=self.visitor
+            ).exists()
+        )
+
+
+@tag("c_cp")
+class CompilePresentationsCommandTestCase(TestCase):
+    def setUp(self):
+        self.user = UserFactory(username="owner")
+        # saved without compiling, like from the admin
+        Profile.objects.filter(user=self.user).update(
+            presentation="<a href=@owner ></a>"
+        )
+
+    def test_should_compile_stale_presentations_once(self):
+        out = StringIO()
+
+        call_command("compile_presentations", stdout=out)
+        call_command("compile_presentations", stdout=out)
+
+        profile = Profile.objects.get(user=self.user)
+        self.assertEqual(profile.compiled_presentation, [["user", "owner", ""]])
+        self.assertEqual(
+            profile.compiled_presentation_hash, hash_presentation(profile.presentation)
+        )
+        self.assertIn("1 presentations have been compiled.", out.getvalue())
+        self.assertIn("0 presentations have been compiled.", out.getvalue())
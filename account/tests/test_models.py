@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
 from django.contrib.auth.models import User
@@ -8,7 +8,14 @@ from django.utils import timezone
 from parameterized import parameterized
 
 from account.factories import FriendRequestFactory, UserFactory, VisitorFactory
-from account.models import TYPE_OF_PROFILE, FriendRequest, Profile, ProfileType, Visitor
+from account.models import (
+    TYPE_OF_PROFILE,
+    FriendRequest,
+    LastVisit,
+    Profile,
+    ProfileType,
+    Visitor,
+)
 
 
 @tag("p")
@@ -320,6 +327,40 @@ class VisitorModelTest(TestCase):
     def test_should_return_6_visitors_models(self):
         self.assertEqual(Visitor.get_visitor(self.profile.user, 6).count(), 6)
 
+    def test_should_keep_one_last_visit_per_visitor(self):
+        self.assertEqual(LastVisit.objects.count(), 6)
+
+    def test_should_return_the_latest_visitor_first(self):
+        visitor = User.objects.last()
+        VisitorFactory(visitor=visitor, receiver=self.profile.user)
+
+        self.assertEqual(Visitor.get_visitor(self.profile.user)[0][0], visitor.username)
+
+    def test_should_upsert_the_latest_date_of_visit(self):
+        visitor = User.objects.last()
+        date = timezone.now()
+
+        LastVisit.record(
+            [
+                (self.profile.user.pk, visitor.pk, date),
+                (self.profile.user.pk, visitor.pk, date - timedelta(days=1)),
+            ]
+        )
+
+        last_visit = LastVisit.objects.get(receiver=self.profile.user, visitor=visitor)
+        self.assertEqual(last_visit.date_of_visit, date)
+
+    def test_should_not_replace_newer_date_with_older_visit(self):
+        visitor = User.objects.last()
+        date = timezone.now() + timedelta(hours=1)
+        LastVisit.record([(self.profile.user.pk, visitor.pk, date)])
+
+        # flushed later by another process
+        LastVisit.record([(self.profile.user.pk, visitor.pk, date - timedelta(days=1))])
+
+        last_visit = LastVisit.objects.get(receiver=self.profile.user, visitor=visitor)
+        self.assertEqual(last_visit.date_of_visit, date)
+
 
 @tag("fr")
 class FriendRequestModelTest(TestCase):
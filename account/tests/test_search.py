@@ -0,0 +1,172 @@
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.core.exceptions import BadRequest
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, tag
+from django.urls import reverse
+
+from account.factories import UserFactory
+from account.models import Gender
+from account.search import SEARCH_TABLE, build_match, search_users
+
+
+def found(query: str, **kwargs) -> list:
+    return [user.username for user in search_users(query, **kwargs)]
+
+
+@tag("ac_search")
+class UserSearchTestCase(TestCase):
+    def test_should_find_user_by_username_prefix(self):
+        UserFactory(username="kowalski")
+        UserFactory(username="nowak")
+
+        self.assertEqual(found("kowa"), ["kowalski"])
+
+    def test_should_match_every_word(self):
+        user = UserFactory(username="kowalski")
+        user.profile.short_description = "I like cats"
+        user.profile.save()
+        UserFactory(username="kowalczyk")
+
+        self.assertEqual(found("kowal cat"), ["kowalski"])
+
+    def test_should_rank_username_matches_first(self):
+        described = UserFactory(username="nowak")
+        described.profile.short_description = "friend of kowalski"
+        described.profile.save()
+        UserFactory(username="kowalski")
+
+        self.assertEqual(found("kowalski"), ["kowalski", "nowak"])
+
+    def test_should_find_user_by_voivodeship_and_about_me(self):
+        user = UserFactory(username="kowalski")
+        user.profile.voivodeship = "lower_silesia"
+        user.profile.save()
+        user.profile.about_me.film = "Rejs"
+        user.profile.about_me.save()
+
+        self.assertEqual(found("silesian"), ["kowalski"])
+        self.assertEqual(found("rejs"), ["kowalski"])
+
+    def test_should_ignore_diacritics(self):
+        user = UserFactory(username="kowalski")
+        user.profile.short_description = "Jadę do Krakowa"
+        user.profile.save()
+
+        self.assertEqual(found("jade krakow"), ["kowalski"])
+
+    def test_should_follow_username_change(self):
+        user = UserFactory(username="kowalski")
+
+        user.username = "nowak"
+        user.save()
+
+        self.assertEqual(found("kowalski"), [])
+        self.assertEqual(found("nowak"), ["nowak"])
+
+    def test_should_not_reindex_when_other_fields_are_saved(self):
+        user = UserFactory(username="kowalski")
+
+        with mock.patch("account.signals.index_users") as index_users:
+            user.profile.save(update_fields=["login_counter"])
+            user.save(update_fields=["last_login"])
+
+        index_users.assert_not_called()
+
+    def test_should_remove_deleted_user(self):
+        UserFactory(username="kowalski").delete()
+
+        self.assertEqual(found("kowalski"), [])
+
+    def test_should_filter_by_gender_and_age(self):
+        for username, gender, born in [
+            ("anna", Gender.FEMALE, date(2000, 1, 1)),
+            ("annabel", Gender.FEMALE, date(1960, 1, 1)),
+            ("annan", Gender.MALE, date(2000, 1, 1)),
+        ]:
+            user = UserFactory(username=username)
+            user.profile.gender = gender
+            user.profile.date_of_birth = born
+            user.profile.save()
+
+        with mock.patch(
+            "account.search.timezone.localdate", return_value=date(2024, 6, 1)
+        ):
+            self.assertEqual(
+                found("ann", gender=Gender.FEMALE, min_age=18, max_age=30), ["anna"]
+            )
+            self.assertEqual(found("ann", min_age=24, max_age=24), ["anna", "annan"])
+
+    def test_should_paginate_results_with_cursor(self):
+        for number in range(5):
+            UserFactory(username=f"kowalski{number}")
+
+        first_page = search_users("kowalski", per_page=3)
+        second_page = search_users(
+            "kowalski", cursor=first_page.next_cursor, per_page=3
+        )
+
+        self.assertEqual(len(first_page), 3)
+        self.assertEqual(len(second_page), 2)
+        self.assertIsNone(second_page.next_cursor)
+        self.assertEqual(
+            {user.username for user in [*first_page, *second_page]},
+            {f"kowalski{number}" for number in range(5)},
+        )
+
+    def test_should_reject_invalid_cursor(self):
+        with self.assertRaises(BadRequest):
+            search_users("kowalski", cursor="WyJhIiwxXQ")
+
+    def test_should_not_pass_query_syntax_to_index(self):
+        self.assertEqual(build_match('kowal" OR *nowak'), '"kowal"* "OR"* "nowak"*')
+        self.assertIsNone(build_match("*?"))
+        self.assertEqual(found("*?"), [])
+
+
+@tag("ac_search")
+class RebuildUserSearchCommandTestCase(TestCase):
+    def test_should_rebuild_index(self):
+        UserFactory(username="kowalski")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        out = StringIO()
+
+        call_command("rebuild_user_search", stdout=out)
+
+        self.assertEqual(found("kowalski"), ["kowalski"])
+        self.assertIn("1 users have been indexed.", out.getvalue())
+
+
+@tag("ac_search")
+class UserListViewSearchTestCase(TestCase):
+    url = reverse("account:user-list")
+
+    def test_should_list_found_users(self):
+        user = UserFactory(username="nowak")
+        user.profile.short_description = "kowalski's neighbour"
+        user.profile.save()
+        UserFactory(username="kowalski")
+        UserFactory(username="wisniewski")
+
+        response = self.client.get(self.url, {"q": "kowalski"})
+
+        self.assertEqual(
+            [user.username for user in response.context["object_list"]],
+            ["kowalski", "nowak"],
+        )
+
+    def test_should_filter_users_without_query(self):
+        user = UserFactory(username="anna")
+        user.profile.gender = Gender.FEMALE
+        user.profile.save()
+        UserFactory(username="jan")
+
+        response = self.client.get(self.url, {"gender": Gender.FEMALE})
+
+        self.assertEqual(
+            [user.username for user in response.context["object_list"]], ["anna"]
+        )
@@ -0,0 +1,73 @@
+from django.test import TestCase, tag
+
+from account.factories import UserFactory
+from account.services import get_profile_snapshot
+from epuls_tools.test import AppQueriesMixin
+
+
+@tag("ac_snapshot")
+class ProfileSnapshotTestCase(AppQueriesMixin, TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.profile = self.user.profile
+
+    def test_should_build_snapshot_with_related_rows(self):
+        friends = UserFactory.create_batch(2)
+        self.profile.best_friends.add(*friends)
+
+        with self.assertNumQueries(3):
+            snapshot = get_profile_snapshot(self.user.username)
+            self.assertEqual(snapshot.profile, self.profile)
+            self.assertEqual(snapshot.best_friends, friends)
+            # related rows are loaded with the snapshot
+            snapshot.profile.about_me.height
+            snapshot.profile.puls.total
+            [friend.profile.gender for friend in snapshot.best_friends]
+
+    def test_should_return_cached_snapshot(self):
+        get_profile_snapshot(self.user.username)
+
+        with self.assertNumQueries(0):
+            get_profile_snapshot(self.user.username)
+
+    def test_should_return_none_for_unknown_user(self):
+        self.assertIsNone(get_profile_snapshot("unknown"))
+
+    def test_should_rebuild_snapshot_when_profile_is_saved(self):
+        get_profile_snapshot(self.user.username)
+
+        self.profile.short_description = "changed"
+        self.profile.save()
+
+        snapshot = get_profile_snapshot(self.user.username)
+        self.assertEqual(snapshot.profile.short_description, "changed")
+
+    def test_should_rebuild_snapshot_when_about_me_is_saved(self):
+        get_profile_snapshot(self.user.username)
+
+        self.profile.about_me.film = "Rejs"
+        self.profile.about_me.save()
+
+        snapshot = get_profile_snapshot(self.user.username)
+        self.assertEqual(snapshot.profile.about_me.film, "Rejs")
+
+    def test_should_rebuild_snapshot_when_best_friends_change(self):
+        friend = UserFactory()
+        get_profile_snapshot(self.user.username)
+
+        self.profile.best_friends.add(friend)
+        self.assertEqual(
+            get_profile_snapshot(self.user.username).best_friends, [friend]
+        )
+
+        friend.best_friends.remove(self.profile)
+        self.assertEqual(get_profile_snapshot(self.user.username).best_friends, [])
+
+    def test_should_rebuild_snapshot_when_user_logs_in(self):
+        get_profile_snapshot(self.user.username)
+
+        self.client.force_login(self.user)
+        self.user.refresh_from_db()
+
+        snapshot = get_profile_snapshot(self.user.username)
+        self.assertEqual(snapshot.profile.user.last_login, self.user.last_login)
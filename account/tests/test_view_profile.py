@@ -7,18 +7,21 @@ from unittest.mock import patch
 
 from django.contrib.auth.models import User
 from django.contrib.messages import get_messages
+from django.core.cache import cache
 from django.core.files.base import File
 from django.shortcuts import reverse
-from django.test import tag
+from django.test import TestCase, tag
 from django.utils import timezone
 from parameterized import parameterized
 from PIL import Image
 
-from account.factories import PASSWORD, VisitorFactory
+from account.cache import known_visitor_cache
+from account.factories import PASSWORD, UserFactory, VisitorFactory
 from account.models import Profile, ProfileType, Visitor
 from action.factories import ActionFactory
 from action.models import Action, ActionMessage
-from epuls_tools.test import SimpleDBTestCase
+from epuls_tools.presentation import hash_presentation
+from epuls_tools.test import AppQueriesMixin, SimpleDBTestCase
 
 
 @tag("vp")
@@ -279,3 +282,84 @@ class ProfileViewTestCase(SimpleDBTestCase):
 
         user.refresh_from_db()
         self.assertEqual(user.profile.male_visitor, 1)
+
+
+@tag("vp_pu")
+class PresentationUpdateViewTestCase(TestCase):
+    def setUp(self):
+        self.user = UserFactory(username="owner")
+        self.client.force_login(self.user)
+
+    def test_should_compile_presentation_when_it_is_saved(self):
+        presentation = '<p>Hi</p><img src="evil.js" >\n<a href=@owner ></a>'
+
+        self.client.post(
+            reverse("account:presentation"), {"presentation": presentation}
+        )
+
+        profile = Profile.objects.get(user=self.user)
+        self.assertEqual(profile.presentation, presentation)
+        self.assertEqual(
+            profile.compiled_presentation,
+            ['<p>Hi</p><img src="" >\n', ["user", "owner", ""]],
+        )
+        self.assertEqual(
+            profile.compiled_presentation_hash, hash_presentation(presentation)
+        )
+
+    def test_profile_should_render_compiled_presentation(self):
+        self.client.post(
+            reverse("account:presentation"), {"presentation": "<a href=@owner ></a>"}
+        )
+
+        response = self.client.get(reverse("account:profile", args=["owner"]))
+
+        self.assertContains(response, '<a href="/owner/" >owner</a>')
+
+
+@tag("vp_q")
+class ProfileViewQueriesTestCase(AppQueriesMixin, TestCase):
+    def setUp(self):
+        self.viewer = UserFactory()
+        self.owner = UserFactory()
+        self.owner.profile.type_of_profile = ProfileType.DIVINE
+        self.owner.profile.save()
+        self.client.force_login(self.viewer)
+        self.url = reverse("account:profile", args=[self.owner.username])
+
+    def tearDown(self):
+        # ids are reused by the next tests
+        known_visitor_cache.clear()
+        cache.clear()
+        super().tearDown()
+
+    def add_best_friends(self, amount):
+        self.owner.profile.best_friends.add(*UserFactory.create_batch(amount))
+
+    def get_profile(self):
+        # caches are filled after the commit
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(self.url)
+
+    def test_should_render_profile_with_fixed_number_of_queries(self):
+        # the first visit changes the visitor counters of the profile
+        self.get_profile()
+
+        for amount in (1, 5):
+            with self.subTest(best_friends=amount):
+                self.add_best_friends(amount)
+                self.get_profile()
+
+                # session, viewer, viewer's profile, friendship and tracker writes
+                with self.assertNumQueries(7):
+                    response = self.get_profile()
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_should_render_own_profile_with_fixed_number_of_queries(self):
+        self.add_best_friends(3)
+        self.client.force_login(self.owner)
+        self.get_profile()
+
+        # session, owner, owner's profile and the action update
+        with self.assertNumQueries(4):
+            self.get_profile()
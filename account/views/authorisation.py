@@ -19,6 +19,8 @@ from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 
 from account.forms import UserSignupForm
 from account.models import Profile
+from epuls_tools.jobs import job
+from epuls_tools.models import Job
 from epuls_tools.scaler import give_away_puls
 from puls.models import PulsType
 
@@ -36,6 +38,16 @@ def generate_confirmation_token(user) -> str:
 
 
 def send_confirmation_email(current_site, user) -> None:
+    """Queues the e-mail, so the request doesn't wait for the mail server."""
+    deliver_confirmation_email.enqueue(domain=current_site.domain, user_id=user.pk)
+
+
+@job(queue="mail", priority=Job.Priority.HIGH, max_attempts=5)
+def deliver_confirmation_email(domain: str, user_id: int) -> None:
+    user = User.objects.filter(pk=user_id).first()
+    if not user:
+        return
+
     token = generate_confirmation_token(user)
     uid = urlsafe_base64_encode(force_bytes(user.pk))
 
@@ -44,7 +56,7 @@ def send_confirmation_email(current_site, user) -> None:
         "account/authorisation/email.html",
         {
             "user": user,
-            "domain": current_site.domain,
+            "domain": domain,
             "uid": uid,
             "token": token,
         },
@@ -74,7 +86,7 @@ def signup(
 
             # send email
             current_site = get_current_site(request)
-            send_confirmation_email(current_site, profile.user)  # TODO celery
+            send_confirmation_email(current_site, profile.user)
 
             return redirect("account:login")
 
@@ -13,18 +13,20 @@ from django.shortcuts import (
 from django.views.generic import ListView, View
 
 from epuls_tools.mixins import NotBasicTypeMixin, UsernameMatchesMixin
+from epuls_tools.pagination import KeysetPaginationMixin
 from epuls_tools.views import ActionType, EpulsListView
 
 from ..models import FriendRequest, Profile
 
 
-class FriendsListView(LoginRequiredMixin, EpulsListView):
+class FriendsListView(LoginRequiredMixin, KeysetPaginationMixin, EpulsListView):
     template_name = "account/friends.html"
+    keyset_ordering = ("username", "pk")
     activity = ActionType.FRIENDS
 
     def get_queryset(self) -> Any:
         user = self.get_user()
-        return user.profile.friends.all()
+        return user.profile.friends.select_related("profile__puls")
 
     def get_context_data(self, **kwargs) -> Dict[str, Any]:
         """
@@ -60,7 +62,9 @@ def unfriend(request, username) -> HttpResponsePermanentRedirect | HttpResponseR
     return redirect("account:profile", username=user_for_delete)
 
 
-class InvitesListView(LoginRequiredMixin, UsernameMatchesMixin, ListView):
+class InvitesListView(
+    LoginRequiredMixin, UsernameMatchesMixin, KeysetPaginationMixin, ListView
+):
     template_name = "account/invite/list.html"
 
     def get_queryset(self):
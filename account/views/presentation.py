@@ -4,6 +4,7 @@ from django.views.generic import UpdateView
 
 from account.forms import PresentationForm
 from account.models import Profile
+from epuls_tools.presentation import compile_profile_presentation
 
 
 class PresentationUpdateView(LoginRequiredMixin, UpdateView):
@@ -15,3 +16,8 @@ class PresentationUpdateView(LoginRequiredMixin, UpdateView):
     def get_object(self, queryset=None):
         user = self.request.user
         return get_object_or_404(Profile, user=user)
+
+    def form_valid(self, form):
+        # tags are parsed once here, so the profile view doesn't run regular expressions
+        compile_profile_presentation(form.instance)
+        return super().form_valid(form)
@@ -1,10 +1,13 @@
-from typing import Any, Dict, Optional
+from functools import partial
+from typing import Any, Dict, List, Optional
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import QuerySet
+from django.http import Http404
 
+from account.cache import get_last_visitors, get_profile_card_version
 from account.models import TYPE_OF_PROFILE, Profile, Visitor
+from account.services import ProfileSnapshot, get_profile_snapshot
 from action.models import Action
 from epuls_tools.views import ActionType, EpulsDetailView
 
@@ -18,12 +21,27 @@ class ProfileView(LoginRequiredMixin, EpulsDetailView):
     slug_url_kwarg = "username"
     activity = ActionType.PROFILE
 
+    def get_snapshot(self) -> ProfileSnapshot:
+        snapshot = getattr(self, "snapshot", None)
+        if snapshot is None:
+            snapshot = get_profile_snapshot(self.kwargs[self.slug_url_kwarg])
+            if snapshot is None:
+                raise Http404("No profile found matching the query")
+            self.snapshot = snapshot
+        return snapshot
+
+    def get_object(self, queryset=None) -> Profile:
+        return self.get_snapshot().profile
+
     def get_context_data(self, **kwargs) -> Dict[str, Any]:
         """
         Extra context:
             * action: (Action) last user's Action
             * self: (bool)  is current user's profile
             * visitors: (List[Visitor]) list of last visitors
+            * best_friends: (List[User]) best friends with their profiles
+            * is_friend: (bool) is current user a friend of the profile owner
+            * card_version: (int) version of the cached profile card
         """
         context = super(ProfileView, self).get_context_data(**kwargs)
 
@@ -40,14 +58,24 @@ class ProfileView(LoginRequiredMixin, EpulsDetailView):
         # take last visitors:
         context["visitors"] = self.voyeur(instance_user.profile, is_login_user)
 
+        context["best_friends"] = self.get_snapshot().best_friends
+        context["is_friend"] = not is_login_user and self.is_friend(instance_user)
+        context["card_version"] = get_profile_card_version(self.object.pk)
+
         return context
 
-    def voyeur(self, profile: Profile, is_user_profile: bool) -> Optional[QuerySet]:
+    def is_friend(self, user) -> bool:
+        return Profile.friends.through.objects.filter(
+            profile__user=self.get_login_user(), user=user
+        ).exists()
+
+    def voyeur(self, profile: Profile, is_user_profile: bool) -> Optional[List]:
         """
-        Returns a queryset of users who have visited the profile.
-        The size of the queryset may vary depending on the profile type.
+        Returns a list of users who have visited the profile.
+        The size of the list may vary depending on the profile type.
         When user is in on their own profile, they can see 5, 10, or 14 visitors depending on the profile type.
         If a user visits someone else's profile, they can see 0, 5, 10, 14 visitors depending on the profile type.
+        The list is cached per size, so viewers of the same tier share it.
         """
         profile_type = self.get_login_user().profile.type_of_profile
 
@@ -55,11 +83,15 @@ class ProfileView(LoginRequiredMixin, EpulsDetailView):
             "own_visitors" if is_user_profile else "sb_visitors"
         ]
 
-        return Visitor.get_visitor(profile.user, size) if size else None
+        if not size:
+            return None
+        return get_last_visitors(
+            profile.user_id, size, partial(Visitor.get_visitor, profile.user, size)
+        )
 
     def post(self, request, *args, **kwargs) -> Any:
-        # delete profile picture
-        profile = self.get_object()
+        # delete profile picture, the cached snapshot is only for reading
+        profile = super().get_object()
 
         if self.request.user == profile.user:
             profile.delete_profile_picture()
@@ -2,6 +2,11 @@ from django.contrib.auth.models import User
 from django.shortcuts import render
 from django.views.generic import ListView, View
 
+from epuls_tools.pagination import KeysetPaginationMixin
+
+from ..forms import UserSearchForm
+from ..search import filter_by_profile, search_users
+
 
 class HomeView(View):
     # TODO: login here
@@ -16,12 +21,42 @@ class HomeView(View):
         return render(request, "account/home.html", context)
 
 
-class UserListView(ListView):
+class UserListView(KeysetPaginationMixin, ListView):
+    """Users found by the full-text search from the best match or all users by username."""
+
     model = User
     template_name = "account/user_list.html"
+    keyset_ordering = ("username", "pk")
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.form = UserSearchForm(request.GET)
+        self.search = self.form.cleaned_data if self.form.is_valid() else {}
 
     def get_queryset(self):
-        q = self.request.GET.get("q", None)
-        if q:
-            return User.objects.filter(username__icontains=q)
-        return User.objects.all()
+        return filter_by_profile(
+            User.objects.select_related("profile"),
+            gender=self.search.get("gender"),
+            min_age=self.search.get("min_age"),
+            max_age=self.search.get("max_age"),
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.search.get("q"):
+            return super().paginate_queryset(queryset, page_size)
+
+        page = search_users(
+            self.search["q"],
+            gender=self.search.get("gender"),
+            min_age=self.search.get("min_age"),
+            max_age=self.search.get("max_age"),
+            cursor=self.request.GET.get(self.cursor_param),
+            per_page=page_size,
+        )
+        page.query = self.request.GET
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["form"] = self.form
+        return context
@@ -0,0 +1,42 @@
+"""
+Cache of the last Action per user.
+
+Entries are kept in the shared cache, so an Action created by one process is seen by the others after at most
+the L1 timeout of the cache. They are keyed by the user id and hold the last Action instance or None when
+the user has no actions. They are written only after the transaction is committed, so rolled back data never
+gets into the cache. The timeout is set by the LAST_ACTION_CACHE setting.
+"""
+from typing import TYPE_CHECKING, Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from epuls_tools.cache import MISSING
+
+if TYPE_CHECKING:
+    from .models import Action
+
+DEFAULT_TIMEOUT = 300
+
+
+def get_key(user_id: int) -> str:
+    return f"last_action:{user_id}"
+
+
+def get_timeout() -> int:
+    return getattr(settings, "LAST_ACTION_CACHE", {}).get("TIMEOUT", DEFAULT_TIMEOUT)
+
+
+def get_last_action(user_id: int) -> Any:
+    """Returns the cached last Action, None when user has no actions or MISSING when nothing is cached."""
+    return cache.get(get_key(user_id), MISSING)
+
+
+def set_last_action(user_id: int, action: Optional["Action"]) -> None:
+    transaction.on_commit(lambda: cache.set(get_key(user_id), action, get_timeout()))
+
+
+def invalidate_last_action(user_id: int) -> None:
+    cache.delete(get_key(user_id))
+    transaction.on_commit(lambda: cache.delete(get_key(user_id)))
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("action", "0005_alter_action_action"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="action",
+            index=models.Index(
+                fields=["who", "-date"], name="action_acti_who_id_edd455_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-18 17:28
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("action", "0006_action_action_acti_who_id_edd455_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="action",
+            name="date",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
@@ -2,6 +2,11 @@ from typing import Optional
 
 from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
+
+from epuls_tools.cache import MISSING
+
+from .cache import get_last_action, set_last_action
 
 
 class ActionMessage(models.TextChoices):
@@ -40,12 +45,19 @@ class Action(models.Model):
     action = models.CharField(
         max_length=40, choices=ActionMessage.choices, blank=True, null=True
     )
-    date = models.DateTimeField(auto_now_add=True)
+    # not 'auto_now_add', so the tracker buffer can write the date of a queued action
+    date = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ["-date"]
+        indexes = [models.Index(fields=["who", "-date"])]
 
     # https://stackoverflow.com/questions/44640479/type-annotation-for-classmethod-returning-instance
     @classmethod
     def last_user_action(cls, who: User) -> Optional["Action"]:
-        return cls.objects.filter(who=who).first()
+        """Returns the last user's Action. The result is taken from the last action cache when it's possible."""
+        action = get_last_action(who.pk)
+        if action is MISSING:
+            action = cls.objects.filter(who=who).select_related("whom").first()
+            set_last_action(who.pk, action)
+        return action
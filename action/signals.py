@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_last_action, set_last_action
+from .models import Action
+
+
+@receiver(post_save, sender=Action)
+def cache_created_action(sender, instance, created, **kwargs):
+    # the new action is always the last one
+    if created:
+        set_last_action(instance.who_id, instance)
+
+
+@receiver(post_delete, sender=Action)
+def invalidate_deleted_action(sender, instance, **kwargs):
+    invalidate_last_action(instance.who_id)
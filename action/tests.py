@@ -1,3 +1,169 @@
-# from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, tag
 
-# Create your tests here.
+from account.factories import UserFactory
+from epuls_tools.cache import MISSING
+from epuls_tools.test import AppQueriesMixin
+from epuls_tools.views.tracker import ActionType, create_action
+
+from .cache import get_last_action, set_last_action
+from .factories import ActionFactory
+from .models import Action, ActionMessage
+
+
+@tag("lac_t")
+class LastActionCacheTestCase(AppQueriesMixin, TestCase):
+    def setUp(self):
+        self.user, self.receiver = UserFactory.create_batch(2)
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def test_should_cache_action_when_it_is_created(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            action = ActionFactory(who=self.user, whom=self.receiver)
+
+        self.assertEqual(get_last_action(self.user.pk), action)
+
+    def test_should_not_query_database_when_last_action_is_cached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            action = ActionFactory(who=self.user, whom=self.receiver)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Action.last_user_action(self.user), action)
+
+    def test_should_keep_last_action_in_shared_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            action = ActionFactory(who=self.user, whom=self.receiver)
+        # entries of other processes are read from the shared store
+        cache.local.clear()
+
+        self.assertEqual(get_last_action(self.user.pk), action)
+
+    def test_should_cache_missing_action(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(Action.last_user_action(self.user))
+
+        self.assertIsNone(get_last_action(self.user.pk))
+
+    def test_should_invalidate_cache_when_action_is_deleted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            action = ActionFactory(who=self.user, whom=self.receiver)
+
+        action.delete()
+
+        self.assertIs(get_last_action(self.user.pk), MISSING)
+
+    def test_create_action_should_run_only_one_update_when_action_is_the_same(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ActionFactory(
+                who=self.user, whom=self.receiver, action=ActionMessage.SB_PROFILE
+            )
+
+        with self.assertNumQueries(1):
+            create_action(
+                login_user=self.user,
+                whom=self.receiver,
+                is_current=False,
+                activity=ActionType.PROFILE,
+            )
+
+        self.assertEqual(Action.objects.count(), 1)
+
+    def test_create_action_should_create_action_when_cached_one_was_deleted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            action = ActionFactory(
+                who=self.user, whom=self.receiver, action=ActionMessage.SB_PROFILE
+            )
+        # delete without signals
+        Action.objects.filter(pk=action.pk)._raw_delete(Action.objects.db)
+
+        create_action(
+            login_user=self.user,
+            whom=self.receiver,
+            is_current=False,
+            activity=ActionType.PROFILE,
+        )
+
+        self.assertEqual(Action.objects.count(), 1)
+
+    def test_create_action_should_not_update_cached_action_when_newer_one_exists(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            action = ActionFactory(
+                who=self.user, whom=self.receiver, action=ActionMessage.SB_PROFILE
+            )
+        # another process has created an action, bulk_create doesn't update this cache
+        Action.objects.bulk_create(
+            [Action(who=self.user, whom=self.receiver, action=ActionMessage.OWN_DIARY)]
+        )
+
+        create_action(
+            login_user=self.user,
+            whom=self.receiver,
+            is_current=False,
+            activity=ActionType.PROFILE,
+        )
+
+        self.assertEqual(Action.objects.count(), 3)
+        self.assertEqual(Action.objects.get(pk=action.pk).date, action.date)
+
+    def test_create_action_should_not_change_cached_instance(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            action = ActionFactory(
+                who=self.user, whom=self.receiver, action=ActionMessage.SB_PROFILE
+            )
+        date = action.date
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_action(
+                login_user=self.user,
+                whom=self.receiver,
+                is_current=False,
+                activity=ActionType.PROFILE,
+            )
+
+        self.assertEqual(action.date, date)
+        self.assertGreater(get_last_action(self.user.pk).date, date)
+
+    def test_create_action_should_update_newer_action_when_cached_one_is_stale(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ActionFactory(
+                who=self.user, whom=self.receiver, action=ActionMessage.SB_PROFILE
+            )
+        # another process has created the same action, bulk_create doesn't update this cache
+        Action.objects.bulk_create(
+            [Action(who=self.user, whom=self.receiver, action=ActionMessage.SB_PROFILE)]
+        )
+
+        create_action(
+            login_user=self.user,
+            whom=self.receiver,
+            is_current=False,
+            activity=ActionType.PROFILE,
+        )
+
+        self.assertEqual(Action.objects.count(), 2)
+
+    def test_create_action_should_not_trust_cached_action_which_differs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            action = ActionFactory(
+                who=self.user, whom=self.receiver, action=ActionMessage.SB_PROFILE
+            )
+            # cached by a process which hasn't seen the last action
+            set_last_action(
+                self.user.pk,
+                Action(
+                    who=self.user, whom=self.receiver, action=ActionMessage.OWN_DIARY
+                ),
+            )
+
+        create_action(
+            login_user=self.user,
+            whom=self.receiver,
+            is_current=False,
+            activity=ActionType.PROFILE,
+        )
+
+        self.assertEqual(Action.objects.count(), 1)
+        self.assertGreater(Action.objects.get().date, action.date)
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("diary", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="diary",
+            index=models.Index(
+                fields=["author", "is_hide", "-created"],
+                name="diary_diary_author__488a56_idx",
+            ),
+        ),
+    ]
@@ -19,6 +19,7 @@ class Diary(models.Model):
 
     class Meta:
         ordering = ("-created",)
+        indexes = [models.Index(fields=["author", "is_hide", "-created"])]
 
     def get_absolute_url(self):
         return reverse(
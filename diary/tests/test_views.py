@@ -4,13 +4,14 @@ from typing import Tuple
 
 from django.contrib.auth.models import User
 from django.shortcuts import reverse
-from django.test import tag
+from django.test import override_settings, tag
 from notifications.models import Notification
 
 from account.factories import PASSWORD, UserFactory
 from comment.models import DiaryComment
 from diary.factory import DiaryFactory
 from diary.models import Diary
+from epuls_tools.jobs import run_pending_jobs
 from epuls_tools.scaler import PULS_FOR_ACTION
 from epuls_tools.test import SimpleDBTestCase
 from puls.factories import SinglePulsFactory
@@ -161,6 +162,7 @@ class DiaryDetailViewTestCase(DiaryDB):
 
         self.assertEqual(excepted_puls, single_puls.first().quantity)
 
+    @override_settings(INBOX={"WINDOW": 0})
     def test_should_create_notification_when_user_comment_photo_another_user(self):
         new_user, new_diary = self.create_new_user_with_diary()
 
@@ -169,6 +171,8 @@ class DiaryDetailViewTestCase(DiaryDB):
             data=self.payload,
         )
 
+        run_pending_jobs()
+
         # should create 1 notification
 
         self.assertEqual(Notification.objects.count(), 1)
@@ -180,7 +184,8 @@ class DiaryDetailViewTestCase(DiaryDB):
         self.assertEqual(n.recipient, new_user)
         self.assertEqual(n.verb, "commented your diary")
 
-    def test_should_create_five_notification_when_user_comment_photo_another_user(self):
+    @override_settings(INBOX={"WINDOW": 0})
+    def test_should_coalesce_comments_of_diary_into_one_notification(self):
         new_user, new_diary = self.create_new_user_with_diary()
 
         for _ in range(5):
@@ -188,14 +193,17 @@ class DiaryDetailViewTestCase(DiaryDB):
                 self.url(kwargs={"pk": new_diary.pk, "username": new_user.username}),
                 data=self.payload,
             )
+        run_pending_jobs()
 
-        self.assertEqual(Notification.objects.count(), 5)
+        self.assertEqual(Notification.objects.get().data["events"], 5)
 
+    @override_settings(INBOX={"WINDOW": 0})
     def test_should_not_create_notification_when_user_comment_own(self):
         diary = Diary.objects.first()
         self.client.post(
             self.url(kwargs={"pk": diary.pk, "username": self.user.username}),
             data=self.payload,
         )
+        run_pending_jobs()
 
         self.assertFalse(Notification.objects.count())
@@ -11,6 +11,7 @@ from django.views.generic.edit import FormMixin
 from comment.forms import DiaryCommentForm
 from comment.models import DiaryComment
 from epuls_tools.mixins import UsernameMatchesMixin
+from epuls_tools.pagination import KeysetPaginationMixin
 from epuls_tools.tools import puls_valid_time_gap_comments
 from epuls_tools.views import (
     ActionType,
@@ -137,9 +138,10 @@ class DiaryDeleteView(LoginRequiredMixin, UsernameMatchesMixin, EpulsDeleteView)
         )
 
 
-class DiaryListView(LoginRequiredMixin, EpulsListView):
+class DiaryListView(LoginRequiredMixin, KeysetPaginationMixin, EpulsListView):
     template_name = "diary/list.html"
     paginate_by = 10
+    keyset_ordering = ("-created", "-pk")
     activity = ActionType.DIARY
 
     def get_queryset(self) -> Any:
@@ -44,6 +44,8 @@ INSTALLED_EXTENSIONS = [
     "shouter",
     "comment",
     "like",
+    "inbox",
+    "epuls_tools",
 ]
 
 INSTALLED_APPS += INSTALLED_EXTENSIONS
@@ -149,6 +151,12 @@ LOGIN_REDIRECT_URL = "/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 MEDIA_URL = "/media/"
 
+# Media files are named by their content and shared by identical uploads.
+STORAGES = {
+    "default": {"BACKEND": "epuls_tools.storage.ContentAddressedStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
 MESSAGE_TAGS = {
     messages.DEBUG: "alert-secondary",
     messages.INFO: "alert-info",
@@ -171,9 +179,71 @@ INTERNAL_IPS = [
 ]
 
 
+# Each process keeps hot entries in memory in front of a file-based cache shared by all processes.
+# CACHE_LOCATION is a directory which only the application can write to, by default inside the project.
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
-        "LOCATION": "unique-snowflake",
+        "BACKEND": "epuls_tools.cache_backends.TwoTierCache",
+        "LOCATION": env("CACHE_LOCATION", default=str(BASE_DIR / ".cache")),
+        "OPTIONS": {
+            "MAX_ENTRIES": 10000,
+            # the entries are counted by listing the directory, so not on every write
+            "CULL_INTERVAL": 60,  # seconds
+            "L1_MAX_SIZE": 1000,
+            "L1_TIMEOUT": 5,  # seconds
+            "LOCK_TIMEOUT": 10,  # seconds
+        },
     }
 }
+
+TEST_RUNNER = "epuls_tools.test.EpulsTestRunner"
+
+# TRACKER
+# When the buffer is enabled, tracking events are written in batches.
+TRACKER_BUFFER = {
+    "ENABLED": env.bool("TRACKER_BUFFER_ENABLED", default=False),
+    "MAX_SIZE": 100,
+    "FLUSH_INTERVAL": 5,  # seconds
+}
+
+# Cache of the last user's Action, it's kept in the shared cache.
+LAST_ACTION_CACHE = {
+    "TIMEOUT": 300,  # seconds
+}
+
+# When the buffer is enabled, picture and gallery statistics are written in batches,
+# so popularity lags behind by at most FLUSH_INTERVAL.
+STATS_BUFFER = {
+    "ENABLED": env.bool("STATS_BUFFER_ENABLED", default=True),
+    "MAX_SIZE": 500,
+    "FLUSH_INTERVAL": 10,  # seconds
+}
+
+# The shouter ticker is shared by all sessions as a few pre-rendered variants of SIZE shouters.
+SHOUTER_TICKER = {"VARIANTS": 4, "SIZE": 10, "TIMEOUT": 300}
+
+# How many of the most popular pictures and galleries are kept in every leaderboard.
+LEADERBOARD_SIZE = 100
+
+# How many days raw Visitor rows are kept before 'compact_visitors' folds them into daily buckets.
+VISITOR_RETENTION_DAYS = 30
+
+# Worker threads for in-process work like the shouter ticker. When ASYNC is False, tasks run in the request.
+BACKGROUND_TASKS = {
+    "ASYNC": env.bool("BACKGROUND_TASKS_ASYNC", default=True),
+    "WORKERS": 2,
+}
+
+# Database job queue for e-mails, notifications and image processing, run by 'manage.py run_jobs'.
+# CONCURRENCY limits how many jobs of a queue run at the same time in all workers.
+JOBS = {
+    "CONCURRENCY": {"images": 2},
+    "LOCK_TIMEOUT": 300,  # seconds
+    "BACKOFF": 10,  # seconds, doubled with every attempt
+    "MAX_BACKOFF": 3600,  # seconds
+    "POLL_INTERVAL": 1,  # seconds
+    "KEEP_DONE": 7,  # days
+}
+
+# Notifications of a recipient are collected for WINDOW seconds and coalesced. 0 writes them at once.
+INBOX = {"WINDOW": env.int("INBOX_WINDOW", default=30)}
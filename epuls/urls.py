@@ -1,4 +1,3 @@
-import notifications.urls
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
@@ -9,12 +8,11 @@ urlpatterns = [
     # conflict with profile
     path("silk/", include("silk.urls", namespace="silk")),
     path("shouter/", include("shouter.urls")),
+    path("inbox/", include("inbox.urls")),
+    path("like/", include("like.urls")),
     path("", include("account.urls")),
     path("photo/", include("photo.urls")),
     path("__debug__/", include("debug_toolbar.urls")),
-    path(
-        "inbox/notifications/", include(notifications.urls, namespace="notifications")
-    ),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -0,0 +1,109 @@
+"""
+Local pool of worker threads for work which shouldn't block the request, like processing images.
+
+Tasks are submitted after the transaction is committed, so they always see the committed rows.
+When ``BACKGROUND_TASKS["ASYNC"]`` is False, tasks run in the calling thread, which is handy in tests.
+'PeriodicFlusher' is a thread which flushes a write-behind buffer on a timer.
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_background_settings() -> dict:
+    return getattr(settings, "BACKGROUND_TASKS", {})
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_background_settings().get("WORKERS", DEFAULT_WORKERS),
+                thread_name_prefix="epuls-background",
+            )
+    return _executor
+
+
+def run_task(func: Callable, *args, **kwargs) -> None:
+    """Runs the task and closes database connections of the worker thread."""
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s has failed.", func.__name__)
+    finally:
+        connections.close_all()
+
+
+def submit(func: Callable, *args, **kwargs) -> Optional[Future]:
+    if not get_background_settings().get("ASYNC", True):
+        func(*args, **kwargs)
+        return None
+    return get_executor().submit(run_task, func, *args, **kwargs)
+
+
+def run_in_background(func: Callable, *args, **kwargs) -> None:
+    """Submits the task to the worker pool when the current transaction is committed."""
+    transaction.on_commit(lambda: submit(func, *args, **kwargs))
+
+
+class PeriodicFlusher:
+    """
+    Daemon thread which calls 'func' every 'interval' seconds or sooner, when it's woken up.
+    Write-behind buffers use it, so queued writes are flushed outside of requests. The thread is started
+    by the first 'start()' call; when ``BACKGROUND_TASKS["ASYNC"]`` is False, it isn't started at all
+    and the buffer flushes in the calling thread.
+    """
+
+    def __init__(self, func: Callable, get_interval: Callable[[], float]) -> None:
+        self.func = func
+        self.get_interval = get_interval
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Starts the thread if it isn't running yet. Returns False when background tasks are disabled."""
+        if not get_background_settings().get("ASYNC", True):
+            return False
+        with self._lock:
+            if not self.is_running:
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self.run,
+                    name=f"epuls-flusher-{self.func.__qualname__}",
+                    daemon=True,
+                )
+                self._thread.start()
+        return True
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        """Stops the thread after its current flush."""
+        self._stopped.set()
+        self._wakeup.set()
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.get_interval())
+            self._wakeup.clear()
+            if not self._stopped.is_set():
+                run_task(self.func)
@@ -0,0 +1,76 @@
+"""
+In-process caches shared by the Epuls applications.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+POLICIES = ("lru", "fifo")
+
+# returned by get() when the key is missing and it must be told apart from a cached None
+MISSING = object()
+
+
+class LocalCache:
+    """
+    Thread-safe in-process cache with a size limit and an optional timeout.
+
+    Parameters:
+        - max_size (int): The maximum amount of entries. When it's exceeded, the oldest entry is evicted.
+        - timeout (float): How many seconds an entry is valid. None means forever.
+        - policy (str): 'lru' evicts the least recently used entry, 'fifo' evicts the least recently set entry.
+    """
+
+    def __init__(
+        self, max_size: int = 1000, timeout: Optional[float] = None, policy="lru"
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Policy must be one of {POLICIES}, not '{policy}'.")
+
+        self.max_size = max_size
+        self.timeout = timeout
+        self.policy = policy
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, MISSING) is not MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                expire, value = self._data[key]
+            except KeyError:
+                return default
+
+            if expire is not None and expire < time.monotonic():
+                del self._data[key]
+                return default
+
+            if self.policy == "lru":
+                self._data.move_to_end(key)
+
+            return value
+
+    def set(self, key: Hashable, value: Any, timeout: Optional[float] = None) -> None:
+        timeout = self.timeout if timeout is None else timeout
+        expire = time.monotonic() + timeout if timeout is not None else None
+
+        with self._lock:
+            self._data[key] = (expire, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,230 @@
+"""
+Two-tier cache backend.
+
+Every process keeps recently used entries in an LRU (L1) in front of a store shared by all processes (L2),
+which is ``SharedFileBasedCache`` by default. Entries written by other processes are seen after at most
+``L1_TIMEOUT`` seconds.
+
+``get_or_set()`` computes a missing value once per process: threads of a process wait for the first one.
+Other processes wait until the value appears in the shared store or ``LOCK_TIMEOUT`` passes, but only
+when the lock is taken with an atomic ``add()``. The file-based store checks and writes the lock file in two
+steps, so with it a few processes may still compute the same value at the same time; a store with atomic
+``add()``, like Memcached or Redis, makes it single-flight for all processes.
+Groups of entries are invalidated by bumping the version of their namespace, see ``get_namespace_version()``.
+
+Options:
+    - SHARED_BACKEND: import path of the L2 backend. The other options are passed to it.
+      LOCATION has to be set, e.g. a directory which only the application can write to.
+    - L1_MAX_SIZE, L1_TIMEOUT: size and timeout of the in-process LRU.
+    - LOCK_TIMEOUT: how many seconds other processes wait for a value which is being computed.
+    - CULL_INTERVAL: option of ``SharedFileBasedCache``, see below.
+"""
+import threading
+import time
+from typing import Any
+from weakref import WeakValueDictionary
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from .cache import MISSING, LocalCache
+
+DEFAULT_SHARED_BACKEND = "epuls_tools.cache_backends.SharedFileBasedCache"
+DEFAULT_L1_MAX_SIZE = 1000
+DEFAULT_L1_TIMEOUT = 5
+DEFAULT_LOCK_TIMEOUT = 10
+DEFAULT_CULL_INTERVAL = 60
+
+TWO_TIER_OPTIONS = ("SHARED_BACKEND", "L1_MAX_SIZE", "L1_TIMEOUT", "LOCK_TIMEOUT")
+
+
+class SharedFileBasedCache(FileBasedCache):
+    """
+    File-based cache which culls at most once every ``CULL_INTERVAL`` seconds in each process.
+    Django's file-based cache lists the whole directory on every set() to count the entries, so each write
+    costs O(entries). Here a write usually only writes its file. Between culls, the directory may exceed
+    ``MAX_ENTRIES`` by the entries which have been written in the meantime.
+    """
+
+    def __init__(self, dir: str, params: dict) -> None:
+        super().__init__(dir, params)
+        self.cull_interval = params.get("OPTIONS", {}).get(
+            "CULL_INTERVAL", DEFAULT_CULL_INTERVAL
+        )
+        self._next_cull = 0.0
+        self._cull_lock = threading.Lock()
+
+    def _cull(self) -> None:
+        with self._cull_lock:
+            now = time.monotonic()
+            if now < self._next_cull:
+                return
+            self._next_cull = now + self.cull_interval
+        super()._cull()
+
+
+class TwoTierCache(BaseCache):
+    def __init__(self, location: str, params: dict) -> None:
+        super().__init__(params)
+        if not location:
+            raise ImproperlyConfigured("LOCATION of the shared cache has to be set.")
+        options = params.get("OPTIONS", {})
+
+        shared_options = {
+            key: value for key, value in options.items() if key not in TWO_TIER_OPTIONS
+        }
+        backend = import_string(options.get("SHARED_BACKEND", DEFAULT_SHARED_BACKEND))
+        self.shared: BaseCache = backend(
+            location, {**params, "OPTIONS": shared_options}
+        )
+
+        self.l1_timeout = options.get("L1_TIMEOUT", DEFAULT_L1_TIMEOUT)
+        self.local = LocalCache(
+            max_size=options.get("L1_MAX_SIZE", DEFAULT_L1_MAX_SIZE),
+            timeout=self.l1_timeout,
+        )
+        self.lock_timeout = options.get("LOCK_TIMEOUT", DEFAULT_LOCK_TIMEOUT)
+
+        self._locks: WeakValueDictionary = WeakValueDictionary()
+        self._locks_lock = threading.Lock()
+
+    def get_local_timeout(self, timeout: Any = DEFAULT_TIMEOUT) -> float:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return self.l1_timeout
+        return min(timeout, self.l1_timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._set_local(key, value, timeout, version)
+        return added
+
+    def get(self, key, default=None, version=None) -> Any:
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self.local.get(local_key, MISSING)
+
+        if value is MISSING:
+            value = self.shared.get(key, MISSING, version=version)
+            if value is MISSING:
+                return default
+            self.local.set(local_key, value)
+
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None) -> None:
+        self.shared.set(key, value, timeout, version=version)
+        self._set_local(key, value, timeout, version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+        self.local.delete(self.make_and_validate_key(key, version=version))
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None) -> bool:
+        self.local.delete(self.make_and_validate_key(key, version=version))
+        return self.shared.delete(key, version=version)
+
+    def has_key(self, key, version=None) -> bool:
+        return self.get(key, MISSING, version=version) is not MISSING
+
+    def incr(self, key, delta=1, version=None) -> int:
+        self.local.delete(self.make_and_validate_key(key, version=version))
+        return self.shared.incr(key, delta, version=version)
+
+    def clear(self) -> None:
+        self.local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs) -> None:
+        self.shared.close(**kwargs)
+
+    def _set_local(self, key, value, timeout, version) -> None:
+        local_key = self.make_and_validate_key(key, version=version)
+        local_timeout = self.get_local_timeout(timeout)
+        if local_timeout > 0:
+            self.local.set(local_key, value, local_timeout)
+        else:
+            self.local.delete(local_key)
+
+    # Stampede protection
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None) -> Any:
+        """
+        Returns the cached value or computes it once when many requests miss it at the same time.
+        See the module docstring for when other processes wait for it.
+        """
+        value = self.get(key, MISSING, version=version)
+        if value is not MISSING:
+            return value
+
+        with self._get_lock(self.make_and_validate_key(key, version=version)):
+            value = self.get(key, MISSING, version=version)
+            if value is not MISSING:
+                return value
+
+            lock_key = f"{key}:lock"
+            is_locked = self.shared.add(
+                lock_key, True, self.lock_timeout, version=version
+            )
+            if not is_locked:
+                value = self._wait_for(key, version)
+                if value is not MISSING:
+                    return value
+
+            try:
+                value = default() if callable(default) else default
+                self.set(key, value, timeout, version=version)
+            finally:
+                if is_locked:
+                    self.shared.delete(lock_key, version=version)
+
+        return value
+
+    def _get_lock(self, key: str) -> threading.Lock:
+        with self._locks_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _wait_for(self, key, version) -> Any:
+        """Waits until another process sets the value. Returns MISSING when it took too long."""
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = self.shared.get(key, MISSING, version=version)
+            if value is not MISSING:
+                return value
+        return MISSING
+
+    # Version-based invalidation
+
+    def get_namespace_version(self, namespace: str) -> int:
+        """
+        Returns the current version of the namespace. Pass it as 'version' of keys which belong to the namespace.
+        New versions start from the current time, so a namespace which was evicted never reuses old versions.
+        """
+        key = f"namespace:{namespace}"
+        version = self.get(key)
+        if version is None:
+            self.shared.add(key, time.time_ns() // 1000, timeout=None)
+            version = self.shared.get(key)
+            self.local.set(self.make_and_validate_key(key), version)
+        return version
+
+    def bump_namespace(self, namespace: str) -> None:
+        """
+        Makes all entries of the namespace unreachable.
+        The new version is written with 'set' instead of 'incr', which keeps the version key without a timeout
+        and doesn't rely on an atomic 'incr' of the shared store. Concurrent bumps may write the same version,
+        but it's always newer than the one they have seen, which is all that invalidation needs.
+        """
+        key = f"namespace:{namespace}"
+        version = self.shared.get(key)
+        new_version = time.time_ns() // 1000
+        if version is not None:
+            new_version = max(new_version, version + 1)
+        self.set(key, new_version, timeout=None)
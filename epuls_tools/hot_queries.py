@@ -0,0 +1,130 @@
+"""
+Registry of the hot query shapes.
+
+Each registered function returns a QuerySet with the same shape as the query run on a busy page.
+The 'audit_indexes' command EXPLAINs all of them and flags the full table scans.
+Parameters like primary keys are sample values, the query plan doesn't depend on them.
+"""
+from typing import Callable, Dict
+
+from django.db.models import QuerySet
+from django.utils import timezone
+
+HOT_QUERIES: Dict[str, Callable[[], QuerySet]] = {}
+
+
+def register_hot_query(name: str):
+    """Decorator which registers a function returning the QuerySet to audit."""
+
+    def decorator(func: Callable[[], QuerySet]) -> Callable[[], QuerySet]:
+        HOT_QUERIES[name] = func
+        return func
+
+    return decorator
+
+
+@register_hot_query("last user's action")
+def last_user_action() -> QuerySet:
+    from action.models import Action
+
+    return Action.objects.filter(who_id=1)[:1]
+
+
+@register_hot_query("last visitors")
+def last_visitors() -> QuerySet:
+    from account.models import LastVisit
+
+    return (
+        LastVisit.objects.filter(receiver_id=1)
+        .exclude(visitor_id=1)
+        .order_by("-date_of_visit")[:5]
+    )
+
+
+@register_hot_query("visits of visitor")
+def visits_of_visitor() -> QuerySet:
+    from account.models import Visitor
+
+    return Visitor.objects.filter(receiver_id=1, visitor_id=2).order_by("date_of_visit")
+
+
+@register_hot_query("not accepted pulses")
+def not_accepted_pulses() -> QuerySet:
+    from puls.models import SinglePuls
+
+    return SinglePuls.objects.filter(puls_id=1, is_accepted=False, type="logins")
+
+
+@register_hot_query("pending pulses")
+def pending_pulses() -> QuerySet:
+    from puls.models import PendingPuls
+
+    return PendingPuls.objects.filter(puls_id=1)
+
+
+@register_hot_query("puls ranking")
+def puls_ranking() -> QuerySet:
+    from puls.models import Puls
+
+    return Puls.objects.order_by("-total")[:10]
+
+
+@register_hot_query("time gap of comments")
+def time_gap_comments() -> QuerySet:
+    from puls.models import SinglePuls
+
+    return SinglePuls.objects.filter(
+        puls_id=1, type="comment_activity_picture", created__gte=timezone.now()
+    )
+
+
+@register_hot_query("guestbook entries")
+def guestbook_entries() -> QuerySet:
+    from guestbook.models import Guestbook
+
+    return Guestbook.objects.filter(receiver_id=1)[:10]
+
+
+@register_hot_query("guestbook entry of sender")
+def guestbook_entry_of_sender() -> QuerySet:
+    from guestbook.models import Guestbook
+
+    return Guestbook.objects.filter(sender_id=1, receiver_id=2)
+
+
+@register_hot_query("diary entries")
+def diary_entries() -> QuerySet:
+    from diary.models import Diary
+
+    return Diary.objects.filter(author_id=1, is_hide=False)[:10]
+
+
+@register_hot_query("presentation pictures")
+def presentation_pictures() -> QuerySet:
+    from photo.models import Picture
+
+    return Picture.objects.filter(profile_id=1, presentation_tag__in=["a", "b"])
+
+
+@register_hot_query("profile pictures to examine")
+def profile_pictures_to_examine() -> QuerySet:
+    from photo.models import ProfilePictureRequest
+
+    return ProfilePictureRequest.objects.filter(is_accepted=False, is_rejected=False)
+
+
+@register_hot_query("profile picture request of profile")
+def profile_picture_request_of_profile() -> QuerySet:
+    from photo.models import ProfilePictureRequest
+
+    return ProfilePictureRequest.objects.filter(
+        profile_id=1, is_accepted=False, is_rejected=False
+    )
+
+
+@register_hot_query("active bonuses")
+def active_bonuses() -> QuerySet:
+    from puls.models import Bonus
+
+    today = timezone.now().date()
+    return Bonus.objects.filter(start__lte=today, end__gte=today)
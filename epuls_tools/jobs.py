@@ -0,0 +1,266 @@
+"""
+Durable job queue kept in the database.
+
+Unlike 'epuls_tools.background', jobs survive restarts and are run by separate worker processes
+('manage.py run_jobs'). A job is inserted in the current transaction, so it's run only when the transaction
+is committed and it's lost together with the rolled back data.
+
+    @job(queue="mail", priority=Job.Priority.HIGH)
+    def deliver_email(user_id: int) -> None:
+        ...
+
+    deliver_email.enqueue(user_id=user.pk)
+
+Arguments are stored as JSON, so jobs take ids instead of model instances.
+Failed jobs are retried with an exponential backoff until 'max_attempts' is reached.
+The number of jobs which run at the same time can be limited per queue by ``JOBS["CONCURRENCY"]``;
+the limit is checked before a job is claimed, so concurrent workers can exceed it for a moment.
+
+Tests run jobs in process with 'run_pending_jobs()'.
+"""
+import logging
+import threading
+import traceback
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Callable, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    "CONCURRENCY": {},
+    "LOCK_TIMEOUT": 300,  # seconds
+    "BACKOFF": 10,  # seconds, doubled with every attempt
+    "MAX_BACKOFF": 3600,  # seconds
+    "POLL_INTERVAL": 1,  # seconds
+    "KEEP_DONE": 7,  # days
+}
+
+
+def get_jobs_settings() -> dict:
+    return {**DEFAULT_SETTINGS, **getattr(settings, "JOBS", {})}
+
+
+def get_job_name(func: Callable) -> str:
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def enqueue(
+    func: Callable,
+    *,
+    queue: str = "default",
+    priority: int = Job.Priority.NORMAL,
+    max_attempts: int = 3,
+    idempotency_key: Optional[str] = None,
+    run_at: Optional[datetime] = None,
+    **kwargs,
+) -> Job:
+    """
+    Adds the job to the queue. When a job with the same idempotency key exists, it's returned instead.
+    """
+    fields = dict(
+        name=get_job_name(func),
+        kwargs=kwargs,
+        queue=queue,
+        priority=priority,
+        max_attempts=max_attempts,
+        run_at=run_at or timezone.now(),
+    )
+    if idempotency_key is None:
+        return Job.objects.create(**fields)
+
+    try:
+        with transaction.atomic():
+            return Job.objects.create(idempotency_key=idempotency_key, **fields)
+    except IntegrityError:
+        return Job.objects.get(idempotency_key=idempotency_key)
+
+
+def job(
+    queue: str = "default",
+    priority: int = Job.Priority.NORMAL,
+    max_attempts: int = 3,
+) -> Callable:
+    """Adds 'enqueue(**kwargs)' to the function, which queues the call with the given options."""
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(enqueue)
+        def enqueue_job(**kwargs) -> Job:
+            kwargs.setdefault("queue", queue)
+            kwargs.setdefault("priority", priority)
+            kwargs.setdefault("max_attempts", max_attempts)
+            return enqueue(func, **kwargs)
+
+        func.enqueue = enqueue_job
+        return func
+
+    return decorator
+
+
+def get_backoff(attempts: int) -> timedelta:
+    config = get_jobs_settings()
+    return timedelta(
+        seconds=min(config["BACKOFF"] * 2 ** (attempts - 1), config["MAX_BACKOFF"])
+    )
+
+
+# Worker
+
+
+def get_full_queues() -> List[str]:
+    """Returns queues which have reached their concurrency limit."""
+    limits = get_jobs_settings()["CONCURRENCY"]
+    if not limits:
+        return []
+
+    running = Job.objects.filter(
+        status=Job.Status.RUNNING,
+        queue__in=limits.keys(),
+        locked_until__gt=timezone.now(),
+    )
+    counts = {queue: 0 for queue in limits}
+    for queue in running.values_list("queue", flat=True):
+        counts[queue] += 1
+    return [queue for queue, limit in limits.items() if counts[queue] >= limit]
+
+
+def claim_job(queues: Optional[Iterable[str]] = None) -> Optional[Job]:
+    """
+    Marks the first due job as running and returns it. Jobs whose worker has died are taken over.
+    A job is claimed by a conditional UPDATE, so two workers never run the same job.
+    """
+    now = timezone.now()
+    candidates = Job.objects.filter(
+        Q(status=Job.Status.PENDING, run_at__lte=now)
+        | Q(status=Job.Status.RUNNING, locked_until__lt=now)
+    ).exclude(queue__in=get_full_queues())
+    if queues:
+        candidates = candidates.filter(queue__in=queues)
+
+    lock_timeout = timedelta(seconds=get_jobs_settings()["LOCK_TIMEOUT"])
+    for candidate in candidates.order_by("priority", "run_at", "pk")[:10]:
+        claimed = (
+            Job.objects.filter(
+                pk=candidate.pk,
+                status=candidate.status,
+                locked_until=candidate.locked_until,
+            )
+            .exclude(attempts__gte=F("max_attempts"), status=Job.Status.RUNNING)
+            .update(
+                status=Job.Status.RUNNING,
+                attempts=F("attempts") + 1,
+                locked_until=now + lock_timeout,
+            )
+        )
+        if claimed:
+            candidate.refresh_from_db()
+            return candidate
+
+        # the job has been taken over with all its attempts used
+        Job.objects.filter(
+            pk=candidate.pk,
+            status=Job.Status.RUNNING,
+            locked_until__lt=now,
+            attempts__gte=F("max_attempts"),
+        ).update(
+            status=Job.Status.FAILED,
+            last_error="The worker has stopped while running the job.",
+            finished=now,
+        )
+    return None
+
+
+def run_job(claimed: Job) -> bool:
+    """Runs the claimed job. Returns True when it has succeeded."""
+    try:
+        func = import_string(claimed.name)
+        with transaction.atomic():
+            func(**claimed.kwargs)
+    except Exception:
+        logger.exception("Job %s (%s) has failed.", claimed.pk, claimed.name)
+        error = traceback.format_exc()
+        if claimed.attempts < claimed.max_attempts:
+            changes = dict(
+                status=Job.Status.PENDING,
+                run_at=timezone.now() + get_backoff(claimed.attempts),
+            )
+        else:
+            changes = dict(status=Job.Status.FAILED, finished=timezone.now())
+        Job.objects.filter(pk=claimed.pk).update(
+            locked_until=None, last_error=error, **changes
+        )
+        return False
+
+    Job.objects.filter(pk=claimed.pk).update(
+        status=Job.Status.DONE, locked_until=None, finished=timezone.now()
+    )
+    return True
+
+
+def purge_finished_jobs() -> int:
+    """Deletes jobs which have succeeded more than ``JOBS["KEEP_DONE"]`` days ago. Failed jobs are kept."""
+    deadline = timezone.now() - timedelta(days=get_jobs_settings()["KEEP_DONE"])
+    deleted, _ = Job.objects.filter(
+        status=Job.Status.DONE, finished__lt=deadline
+    ).delete()
+    return deleted
+
+
+def run_pending_jobs(queues: Optional[Iterable[str]] = None) -> int:
+    """Runs due jobs in the calling thread until there is none. Returns the number of run jobs."""
+    amount = 0
+    while claimed := claim_job(queues):
+        run_job(claimed)
+        amount += 1
+    return amount
+
+
+class Worker:
+    """Runs jobs in 'threads' threads until it's stopped."""
+
+    def __init__(
+        self, queues: Optional[Iterable[str]] = None, threads: int = 1
+    ) -> None:
+        self.queues = list(queues) if queues else None
+        self.threads = threads
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def work(self) -> None:
+        poll_interval = get_jobs_settings()["POLL_INTERVAL"]
+        try:
+            while not self._stop.is_set():
+                close_old_connections()
+                claimed = claim_job(self.queues)
+                if claimed:
+                    run_job(claimed)
+                else:
+                    self._stop.wait(poll_interval)
+        finally:
+            connections.close_all()
+
+    def run(self) -> None:
+        purge_finished_jobs()
+        threads = [
+            threading.Thread(target=self.work, name=f"epuls-jobs-{number}")
+            for number in range(self.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            self.stop()
+            for thread in threads:
+                thread.join()
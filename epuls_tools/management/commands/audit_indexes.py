@@ -0,0 +1,66 @@
+import re
+from typing import List
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from epuls_tools.hot_queries import HOT_QUERIES
+
+# SQLite: "SCAN table" without index, PostgreSQL: "Seq Scan on table"
+FULL_SCAN_PATTERNS = (
+    re.compile(r"\bSCAN (?!CONSTANT)(\w+)(?!.*\bUSING\b.*\bINDEX\b)"),
+    re.compile(r"Seq Scan on (\w+)"),
+)
+
+
+def find_full_scans(plan: str) -> List[str]:
+    """Returns the names of tables which are scanned without an index."""
+    tables = []
+    for line in plan.splitlines():
+        for pattern in FULL_SCAN_PATTERNS:
+            match = pattern.search(line)
+            if match:
+                tables.append(match.group(1))
+    return tables
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAINs every registered hot query and flags the full table scans. "
+        "On PostgreSQL small tables can be scanned even if the index exists, run it on realistic data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fail-on-scan",
+            action="store_true",
+            help="Exit with an error when any hot query scans a whole table.",
+        )
+        parser.add_argument(
+            "--show-plan",
+            action="store_true",
+            help="Print the whole query plan of every query.",
+        )
+
+    def handle(self, *args, **options):
+        flagged = []
+
+        for name, build_queryset in HOT_QUERIES.items():
+            plan = build_queryset().explain()
+            tables = find_full_scans(plan)
+
+            if tables:
+                flagged.append(name)
+                self.stdout.write(
+                    self.style.WARNING(f"FULL SCAN  {name}: {', '.join(tables)}")
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS(f"OK         {name}"))
+
+            if options["show_plan"]:
+                self.stdout.write(plan)
+
+        if flagged and options["fail_on_scan"]:
+            raise CommandError(
+                f"{len(flagged)} hot queries scan whole tables on {connection.vendor}."
+            )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from epuls_tools.jobs import Worker, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Runs jobs of the database queue until it's stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            help="Run only jobs of this queue. It can be repeated.",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=1,
+            help="How many jobs the worker runs at the same time.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Run the due jobs and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["burst"]:
+            amount = run_pending_jobs(options["queues"])
+            self.stdout.write(self.style.SUCCESS(f"{amount} jobs have been run."))
+            return
+
+        self.stdout.write(f"Worker is running with {options['threads']} threads.")
+        Worker(options["queues"], options["threads"]).run()
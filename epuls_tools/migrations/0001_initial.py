@@ -0,0 +1,66 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:01
+
+from collections import Counter
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+FILE_FIELDS = [
+    ("account", "Profile", "profile_picture"),
+    ("photo", "Picture", "picture"),
+    ("photo", "ProfilePictureRequest", "picture"),
+    ("photo", "Rendition", "file"),
+]
+
+
+def fill_blobs(apps, schema_editor):
+    """Counts references of files which have been saved before."""
+    Blob = apps.get_model("epuls_tools", "Blob")
+
+    references = Counter()
+    for app_label, model_name, field in FILE_FIELDS:
+        model = apps.get_model(app_label, model_name)
+        references.update(
+            model.objects.exclude(**{field: ""})
+            .exclude(**{field: None})
+            .values_list(field, flat=True)
+        )
+
+    Blob.objects.bulk_create(
+        [
+            Blob(name=name, size=default_storage.size(name), references=amount)
+            for name, amount in references.items()
+            if default_storage.exists(name)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("account", "0032_profile_compiled_presentation"),
+        ("photo", "0025_picture_renditions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Blob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("size", models.PositiveIntegerField()),
+                ("references", models.PositiveIntegerField(default=1)),
+            ],
+        ),
+        migrations.RunPython(fill_blobs, migrations.RunPython.noop),
+    ]
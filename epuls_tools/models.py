@@ -0,0 +1,78 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Blob(models.Model):
+    """
+    File in the content addressed storage. 'references' counts rows of models which point at the file.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveIntegerField()
+    references = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.name} ({self.references})"
+
+
+class Job(models.Model):
+    """
+    Task in the database queue, see 'epuls_tools.jobs'.
+    'name' is the import path of the function, which is called with 'kwargs'.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    class Priority(models.IntegerChoices):
+        HIGH = 0
+        NORMAL = 10
+        LOW = 20
+
+    name = models.CharField(max_length=200)
+    kwargs = models.JSONField(default=dict, blank=True)
+    queue = models.CharField(max_length=50, default="default")
+    priority = models.SmallIntegerField(
+        choices=Priority.choices, default=Priority.NORMAL
+    )
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    idempotency_key = models.CharField(
+        max_length=255,
+        unique=True,
+        blank=True,
+        null=True,
+        help_text="A job with the same key is enqueued only once.",
+    )
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+
+    created = models.DateTimeField(auto_now_add=True)
+    run_at = models.DateTimeField(
+        default=timezone.now, help_text="The job isn't run before this date."
+    )
+    locked_until = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="A running job whose lock has expired is taken over by another worker.",
+    )
+    finished = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["priority", "run_at"],
+                condition=models.Q(status="pending"),
+                name="job_pending_idx",
+            ),
+            models.Index(fields=["status", "queue"], name="job_status_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
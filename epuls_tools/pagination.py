@@ -0,0 +1,174 @@
+"""
+Keyset pagination.
+
+A page is selected by an opaque cursor which holds the ordering values of the last row of the previous page,
+so the next page is a range scan from that row instead of an OFFSET which reads and discards every row before
+it. Pages cost the same however deep they are and don't shift when rows are added in front of them.
+The ordering has to end with a unique field (``pk``) and its fields can't be null; an index on the filter
+and ordering fields makes every page a single index range scan.
+
+    class DiaryListView(KeysetPaginationMixin, EpulsListView):
+        paginate_by = 10
+        keyset_ordering = ("-created", "-pk")
+
+Templates render the links with ``{% include "account/cursor_pagination.html" %}``.
+"""
+import base64
+import binascii
+import datetime
+import json
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence
+
+from django.core.exceptions import BadRequest, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, Q, QuerySet
+from django.http import QueryDict
+
+DEFAULT_CURSOR_PARAM = "cursor"
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    def default(self, o: Any) -> Any:
+        # DjangoJSONEncoder cuts microseconds, the cursor needs the exact value
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def get_ordering_fields(model: type[Model], ordering: Sequence[str]) -> List:
+    return [
+        model._meta.pk
+        if name.lstrip("-") == "pk"
+        else model._meta.get_field(name.lstrip("-"))
+        for name in ordering
+    ]
+
+
+def encode_values(values: Sequence[Any]) -> str:
+    data = json.dumps(list(values), cls=CursorEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_values(cursor: str, length: int) -> List:
+    """Returns the JSON values stored in the cursor. Raises BadRequest when the cursor is invalid."""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(data)
+    except (ValueError, binascii.Error):
+        raise BadRequest(f"Invalid cursor '{cursor}'.")
+    if not isinstance(values, list) or len(values) != length:
+        raise BadRequest(f"Invalid cursor '{cursor}'.")
+    return values
+
+
+def encode_cursor(obj: Model, ordering: Sequence[str]) -> str:
+    """Returns the cursor of the page which starts after the object."""
+    return encode_values([getattr(obj, name.lstrip("-")) for name in ordering])
+
+
+def decode_cursor(cursor: str, model: type[Model], ordering: Sequence[str]) -> List:
+    """Returns the ordering values stored in the cursor. Raises BadRequest when the cursor is invalid."""
+    values = decode_values(cursor, len(ordering))
+    try:
+        return [
+            model_field.to_python(value)
+            for model_field, value in zip(get_ordering_fields(model, ordering), values)
+        ]
+    except (TypeError, ValidationError):
+        raise BadRequest(f"Invalid cursor '{cursor}'.")
+
+
+def get_after_filter(ordering: Sequence[str], values: Sequence[Any]) -> Q:
+    """
+    Returns the condition of rows which come after the values in the ordering, e.g. for ("-created", "-pk"):
+    created < x OR (created = x AND pk < y).
+    """
+    condition = Q()
+    for position, name in enumerate(ordering):
+        lookup = "lt" if name.startswith("-") else "gt"
+        equal = {
+            previous.lstrip("-"): value
+            for previous, value in zip(ordering[:position], values)
+        }
+        condition |= Q(**equal, **{f"{name.lstrip('-')}__{lookup}": values[position]})
+    return condition
+
+
+@dataclass
+class KeysetPage:
+    """Page of objects with the cursor of the next one. It's rendered by 'account/cursor_pagination.html'."""
+
+    object_list: List
+    next_cursor: Optional[str] = None
+    is_first: bool = True
+    query: QueryDict = field(default_factory=QueryDict)
+    cursor_param: str = DEFAULT_CURSOR_PARAM
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or not self.is_first
+
+    def first_page_query(self) -> str:
+        query = self.query.copy()
+        query.pop(self.cursor_param, None)
+        return query.urlencode()
+
+    def next_page_query(self) -> str:
+        query = self.query.copy()
+        query[self.cursor_param] = self.next_cursor
+        return query.urlencode()
+
+
+def paginate_by_keyset(
+    queryset: QuerySet,
+    ordering: Sequence[str],
+    cursor: Optional[str] = None,
+    per_page: int = 20,
+) -> KeysetPage:
+    """Returns the page of the queryset in the ordering which starts after the cursor."""
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, ordering)
+        queryset = queryset.filter(get_after_filter(ordering, values))
+
+    objects = list(queryset[: per_page + 1])
+    next_cursor = (
+        encode_cursor(objects[per_page - 1], ordering)
+        if len(objects) > per_page
+        else None
+    )
+    return KeysetPage(objects[:per_page], next_cursor, is_first=not cursor)
+
+
+class KeysetPaginationMixin:
+    """
+    Replaces the OFFSET pagination of ListView with keyset pagination. Subclasses define 'keyset_ordering',
+    which ends with "pk" or "-pk". 'page_obj' of the context is a KeysetPage and 'paginator' is None.
+    """
+
+    paginate_by = 20
+    keyset_ordering: Sequence[str] = ("-pk",)
+    cursor_param = DEFAULT_CURSOR_PARAM
+
+    def get_keyset_ordering(self) -> Sequence[str]:
+        return self.keyset_ordering
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple:
+        page = paginate_by_keyset(
+            queryset,
+            self.get_keyset_ordering(),
+            cursor=self.request.GET.get(self.cursor_param),
+            per_page=page_size,
+        )
+        page.query = self.request.GET
+        page.cursor_param = self.cursor_param
+        return None, page, page.object_list, page.has_other_pages()
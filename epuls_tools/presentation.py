@@ -1,3 +1,4 @@
+import hashlib
 import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
@@ -5,6 +6,9 @@ from functools import partial
 from typing import Dict, List, NamedTuple, Optional, Tuple
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import CharField, F, Value
 from django.shortcuts import reverse
 
 from account.models import Profile
@@ -196,13 +200,31 @@ class PictureComponent(ProfilePictureComponent):
 
 
 class Presentation:
-    def __init__(self, html: str, profile: Profile):
+    def __init__(self, html: str, profile: Optional[Profile]):
         self.user_component = UserComponent()
         self.profile_picture = ProfilePictureComponent()
         self.picture = PictureComponent(profile)
 
         self.html = html
 
+    @property
+    def components(self) -> Dict[str, Component]:
+        return {
+            "user": self.user_component,
+            "profile_picture": self.profile_picture,
+            "picture": self.picture,
+        }
+
+    @property
+    def pattern(self) -> re.Pattern:
+        """Returns one pattern which matches tags of all components."""
+        return re.compile(
+            "|".join(
+                f"(?P<{name}>{component._pattern.pattern})"
+                for name, component in self.components.items()
+            )
+        )
+
     def check_html(self) -> None:
         """
         Search for unwanted 'src' attributes in the HTML code and replace them with an empty string.
@@ -212,10 +234,202 @@ class Presentation:
         pattern = re.compile(r"\ssrc\s*=\s*[\"\']\S+[\"\'](?=[\s>])")
         self.html = pattern.sub(' src=""', self.html)
 
-    def convert(self) -> str:
+    def find(self) -> List[Tuple[re.Match, Component, Tag]]:
+        """
+        Finds tags of all components in one pass and sets them in the components' tags.
+        """
+        found = []
+        for match in self.pattern.finditer(self.html):
+            component = self.components[match.lastgroup]
+            index = match.re.groupindex[match.lastgroup]
+            username, extra_property = match.group(index + 1, index + 2)
+
+            tag = Tag(
+                tag=match.group(),
+                username=username,
+                extra_property=extra_property.replace(" ", ""),
+            )
+            component.tags.append(tag)
+            found.append((match, component, tag))
+
+        return found
+
+    def pull_url_pictures(self) -> None:
+        """
+        Retrieves URLs of mentioned profile pictures and pictures with one query and updates the tags.
+        """
+        usernames = [tag.username for tag in self.profile_picture.tags]
+        presentation_tags = [tag.username for tag in self.picture.tags]
+
+        # both querysets select only annotations, so the columns of the union are in the same order
+        querysets = []
+        if usernames:
+            querysets.append(
+                Profile.objects.filter(user__username__in=usernames)
+                .annotate(
+                    kind=Value("profile_picture", output_field=CharField()),
+                    name=F("user__username"),
+                    image=F("profile_picture"),
+                    gender_of_user=F("gender"),
+                )
+                .values_list("kind", "name", "image", "gender_of_user")
+            )
+        if presentation_tags:
+            querysets.append(
+                Picture.objects.filter(
+                    profile=self.picture.profile, presentation_tag__in=presentation_tags
+                )
+                .order_by()
+                .annotate(
+                    kind=Value("picture", output_field=CharField()),
+                    name=F("presentation_tag"),
+                    image=F("picture"),
+                    gender_of_user=Value("", output_field=CharField()),
+                )
+                .values_list("kind", "name", "image", "gender_of_user")
+            )
+        if not querysets:
+            return
+
+        urls = {"profile_picture": {}, "picture": {}}
+        for kind, name, picture, gender in querysets[0].union(*querysets[1:], all=True):
+            if picture:
+                urls[kind][name] = Component.media_suffix + picture
+            else:
+                urls[kind][name] = self.profile_picture.get_default_profile_picture(
+                    gender
+                )
+
+        self.profile_picture.update_tags(urls["profile_picture"])
+        self.picture.update_tags(urls["picture"])
+
+    def compile(self) -> List:
+        """
+        Sanitises HTML and splits it into literal chunks and placeholders of tags.
+        Placeholders are lists of the component name, username or picture tag and extra properties,
+        so the result can be stored in JSONField and rendered without regular expressions.
+        """
         self.check_html()
 
-        for func in [self.user_component, self.profile_picture, self.picture]:
-            self.html = func.link(self.html)
+        chunks, position = [], 0
+        for match, component, tag in self.find():
+            if match.start() > position:
+                chunks.append(self.html[position : match.start()])
+            chunks.append([match.lastgroup, tag.username, tag.extra_property])
+            position = match.end()
+        if position < len(self.html):
+            chunks.append(self.html[position:])
+
+        return chunks
+
+    def render(self, chunks: List) -> str:
+        """
+        Joins literal chunks and replacements of placeholders. URLs of pictures are retrieved with one query.
+        """
+        parts = []
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                parts.append(chunk)
+                continue
+
+            name, username, extra_property = chunk
+            component = self.components[name]
+            tag = Tag(tag="", username=username, extra_property=extra_property)
+            component.tags.append(tag)
+            parts.append((component, tag))
+
+        self.pull_url_pictures()
 
+        self.html = "".join(
+            part if isinstance(part, str) else part[0]._build_replacement(part[1])
+            for part in parts
+        )
         return self.html
+
+    def convert(self) -> str:
+        """
+        Converts tags of all components with one pass over HTML and one query.
+        """
+        return self.render(self.compile())
+
+
+def compile_presentation(html: Optional[str]) -> List:
+    return Presentation(html or "", profile=None).compile()
+
+
+def hash_presentation(html: Optional[str]) -> str:
+    return hashlib.sha256((html or "").encode()).hexdigest()
+
+
+def compile_profile_presentation(profile: Profile) -> None:
+    """Compiles the presentation of the profile and stores the hash of its source next to it."""
+    profile.compiled_presentation = compile_presentation(profile.presentation)
+    profile.compiled_presentation_hash = hash_presentation(profile.presentation)
+
+
+# Rendered presentations are cached by the profile and hash of the presentation.
+# Keys also contain versions of the owner's pictures and of the profile pictures of the mentioned users,
+# so changing a picture makes the old entries unreachable in every process.
+PRESENTATION_TIMEOUT = 60 * 60
+
+
+def get_pictures_namespace(profile_id: int) -> str:
+    return f"pictures:{profile_id}"
+
+
+def get_profile_picture_namespace(username: str) -> str:
+    return f"profile_picture:{username}"
+
+
+def invalidate_pictures(profile_id: int) -> None:
+    """Invalidates presentations of the profile when its Picture is changed."""
+    namespace = get_pictures_namespace(profile_id)
+    cache.bump_namespace(namespace)
+    transaction.on_commit(lambda: cache.bump_namespace(namespace))
+
+
+def invalidate_profile_picture(username: str) -> None:
+    """Invalidates presentations which mention the profile picture of the user."""
+    namespace = get_profile_picture_namespace(username)
+    cache.bump_namespace(namespace)
+    transaction.on_commit(lambda: cache.bump_namespace(namespace))
+
+
+def get_mentioned_usernames(chunks: List) -> List[str]:
+    """Returns usernames whose profile pictures are shown by the compiled presentation."""
+    return sorted(
+        {
+            chunk[1]
+            for chunk in chunks
+            if not isinstance(chunk, str) and chunk[0] == "profile_picture"
+        }
+    )
+
+
+def render_presentation(html: str, profile: Profile) -> str:
+    """
+    The compiled presentation of the profile is rendered only when it was made from the same HTML.
+    Presentations saved without compiling, e.g. in the admin, are compiled from scratch.
+    """
+    digest = hash_presentation(html)
+    if profile.compiled_presentation_hash == digest:
+        chunks = profile.compiled_presentation
+    else:
+        chunks = compile_presentation(html)
+
+    namespaces = [get_pictures_namespace(profile.pk)] + [
+        get_profile_picture_namespace(username)
+        for username in get_mentioned_usernames(chunks)
+    ]
+    versions = ":".join(
+        str(cache.get_namespace_version(namespace)) for namespace in namespaces
+    )
+    versions_digest = hashlib.sha256(versions.encode()).hexdigest()
+    key = f"presentation:{profile.pk}:{digest}:{versions_digest}"
+    rendered = cache.get(key)
+
+    if rendered is None:
+        rendered = Presentation(html, profile).render(chunks)
+        transaction.on_commit(lambda: cache.set(key, rendered, PRESENTATION_TIMEOUT))
+
+    return rendered
@@ -0,0 +1,93 @@
+"""
+Random sampling of rows without ORDER BY RANDOM(), which scans and sorts the whole table.
+
+There are two ways:
+    - sample_by_id_range() jumps to random points of the primary key range and takes the next row.
+      It costs one query per drawn row and suits big tables. Rows which follow a gap of ids are drawn more often.
+    - SamplingPool keeps ids of the rows which can be drawn in process and draws from them.
+      It costs one query per sample and suits small sets of live rows like active shouters.
+"""
+import random
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Max, Min, QuerySet
+from django.utils import timezone
+
+from .cache import LocalCache
+
+
+def sample_by_id_range(queryset: QuerySet, k: int) -> QuerySet:
+    """Returns up to k random rows of the queryset."""
+    bounds = queryset.aggregate(low=Min("pk"), high=Max("pk"))
+    if bounds["low"] is None:
+        return queryset.none()
+
+    ordered = queryset.order_by("pk").values_list("pk", flat=True)
+    ids = {
+        ordered.filter(pk__gte=random.randint(bounds["low"], bounds["high"])).first()
+        for _ in range(k)
+    }
+    return queryset.filter(pk__in=ids)
+
+
+class SamplingPool:
+    """
+    In-process pool of ids of rows which can be drawn.
+
+    Parameters:
+        - get_queryset: returns rows of the pool. It's called when the pool is loaded.
+        - expiration_field: a date after which the row isn't drawn anymore, even before the pool is reloaded.
+        - timeout (float): how many seconds the pool is kept.
+    """
+
+    def __init__(
+        self,
+        get_queryset: Callable[[], QuerySet],
+        expiration_field: Optional[str] = None,
+        timeout: float = 60,
+    ) -> None:
+        self.get_queryset = get_queryset
+        self.expiration_field = expiration_field
+        self._cache = LocalCache(max_size=1, timeout=timeout)
+
+    def load(self) -> List[Tuple[int, Optional[datetime]]]:
+        queryset = self.get_queryset()
+        if self.expiration_field:
+            return list(queryset.values_list("pk", self.expiration_field))
+        return [(pk, None) for pk in queryset.values_list("pk", flat=True)]
+
+    def get_pool(self) -> List[Tuple[int, Optional[datetime]]]:
+        pool = self._cache.get("pool")
+        if pool is None:
+            pool = self.load()
+            self._cache.set("pool", pool)
+        return pool
+
+    def get_ids(self) -> List[int]:
+        now = timezone.now()
+        return [
+            pk
+            for pk, expiration in self.get_pool()
+            if expiration is None or expiration > now
+        ]
+
+    def get_next_expiration(self) -> Optional[datetime]:
+        """Returns when the first live row of the pool expires."""
+        now = timezone.now()
+        expirations = [
+            expiration
+            for _, expiration in self.get_pool()
+            if expiration and expiration > now
+        ]
+        return min(expirations, default=None)
+
+    def sample(self, k: int) -> List[int]:
+        """Returns up to k random ids."""
+        ids = self.get_ids()
+        return random.sample(ids, min(k, len(ids)))
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+        transaction.on_commit(self._cache.clear)
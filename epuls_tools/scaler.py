@@ -1,10 +1,13 @@
 from functools import wraps
+from itertools import islice
+from typing import Iterable, Optional
 
-from django.db.models import Q, Sum
+from django.db import transaction
 from django.utils import timezone
 
 from account.models import Profile, ProfileType
-from puls.models import Bonus, PulsType, SinglePuls
+from puls.cache import get_bonus_scaler
+from puls.models import PendingPuls, PulsType, SinglePuls
 
 CONSTANT_PULS = (
     "profile_photo",
@@ -46,17 +49,7 @@ def give_away_bonus(func):
         if puls_type in CONSTANT_PULS:
             return puls_for_action
 
-        bonus = Bonus.objects.aggregate(
-            bonus_sum=Sum(
-                "scaler",
-                filter=Q(
-                    start__lte=timezone.now().date(),
-                    end__gte=timezone.now().date(),
-                    type__in=["all", puls_type],
-                ),
-                default=0,
-            )
-        ).get("bonus_sum")
+        bonus = get_bonus_scaler(puls_type, timezone.now().date())
 
         quantity = puls_for_action * bonus
         if quantity:
@@ -70,6 +63,23 @@ def give_away_bonus(func):
     return wrapper
 
 
+def count_puls_quantity(
+    type_of_profile: ProfileType,
+    type: PulsType,
+    extra_points: int = 1,
+    rate: Optional[float] = None,
+) -> float:
+    """
+    rate -> overrides the rate of the action from 'PULS_FOR_ACTION'
+    """
+    if type in CONSTANT_PULS:
+        return CONSTANT_PULS_QTY
+
+    if rate is None:
+        rate = PULS_FOR_ACTION[type]
+    return rate * EXTRA_PULS_BY_PROFILE_TYPE[type_of_profile] * extra_points
+
+
 @give_away_bonus
 def give_away_puls(
     *, user_profile: Profile, type: PulsType, extra_points: int = 1
@@ -77,14 +87,56 @@ def give_away_puls(
     """
     extra_points -> when user pay for activity, user will get extra point
     """
-    if type not in CONSTANT_PULS:
-        quantity = (
-            PULS_FOR_ACTION[type]
-            * EXTRA_PULS_BY_PROFILE_TYPE[user_profile.type_of_profile]
-            * extra_points
-        )
-    else:
-        quantity = CONSTANT_PULS_QTY
+    quantity = count_puls_quantity(user_profile.type_of_profile, type, extra_points)
 
     SinglePuls.objects.create(quantity=quantity, puls=user_profile.puls, type=type)
     return quantity
+
+
+def give_away_puls_bulk(
+    profiles: Iterable[Profile],
+    type: PulsType,
+    extra_points: int = 1,
+    batch_size: int = 1000,
+    rate: Optional[float] = None,
+) -> int:
+    """
+    Gives away pulses to many profiles, the same as 'give_away_puls' does for one.
+    Pulses and bonuses of each chunk are written with one bulk_create.
+    Profiles need only 'puls_id' and 'type_of_profile' fields.
+    Types without a rate in 'PULS_FOR_ACTION', e.g. TYPE, need the 'rate' argument.
+
+    Returns amount of profiles which have got pulses.
+    """
+    bonus = 0
+    if type not in CONSTANT_PULS:
+        bonus = get_bonus_scaler(type, timezone.now().date())
+
+    profiles = iter(profiles)
+    awarded = 0
+    while chunk := list(islice(profiles, batch_size)):
+        pulses = []
+        for profile in chunk:
+            quantity = count_puls_quantity(
+                profile.type_of_profile, type, extra_points, rate
+            )
+            pulses.append(
+                SinglePuls(quantity=quantity, puls_id=profile.puls_id, type=type)
+            )
+            if quantity * bonus:
+                pulses.append(
+                    SinglePuls(
+                        quantity=quantity * bonus,
+                        puls_id=profile.puls_id,
+                        type=PulsType.BONUS,
+                    )
+                )
+
+        with transaction.atomic():
+            SinglePuls.objects.bulk_create(pulses)
+            # bulk_create doesn't send post_save, so the ledger is recomputed here
+            PendingPuls.rebuild({profile.puls_id for profile in chunk})
+
+        awarded += len(chunk)
+
+    return awarded
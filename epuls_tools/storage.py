@@ -0,0 +1,90 @@
+"""
+Content addressed, deduplicating storage of media files.
+
+Files are named by the SHA-256 of their content, so identical uploads share one file on disk.
+Each file has a Blob row which counts its references. Saving a file adds a reference and deleting it
+removes one. The file is removed from disk only when the last reference goes and the transaction is committed.
+Files saved before the storage was introduced have no Blob row and are deleted at once, as before.
+"""
+import hashlib
+import os
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+BLOB_DIRECTORY = "blobs"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def blob_name(self, name: str, digest: str) -> str:
+        extension = os.path.splitext(name)[1].lower()
+        return "/".join([BLOB_DIRECTORY, digest[:2], digest[2:4], digest + extension])
+
+    def get_available_name(self, name, max_length=None):
+        # the same name means the same content, so the file is never renamed
+        return name
+
+    def _save(self, name, content):
+        from epuls_tools.models import Blob
+
+        sha256 = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        content.seek(0)
+
+        name = self.blob_name(name, sha256.hexdigest())
+        # the reference is rolled back when the file couldn't be written
+        with transaction.atomic():
+            blob, created = Blob.objects.select_for_update().get_or_create(
+                name=name, defaults={"size": content.size}
+            )
+            if not self.exists(name):
+                self.write_blob(name, content)
+            if not created:
+                Blob.objects.filter(pk=blob.pk).update(references=F("references") + 1)
+        return name
+
+    def write_blob(self, name: str, content) -> None:
+        # the file is moved into place at once, so a parallel upload of the same content is safe
+        temporary = super()._save(f"{name}.{uuid.uuid4().hex}.tmp", content)
+        try:
+            os.replace(self.path(temporary), self.path(name))
+        except OSError:
+            super().delete(temporary)
+            raise
+
+    def retain(self, name: str) -> None:
+        """Adds a reference to the already saved file, e.g. when it's assigned to another model."""
+        from epuls_tools.models import Blob
+
+        if not Blob.objects.filter(name=name).update(references=F("references") + 1):
+            # the file saved before the storage was introduced has its first reference too
+            Blob.objects.create(name=name, size=self.size(name), references=2)
+
+    def delete(self, name):
+        """Removes a reference. The file is deleted when there are no references."""
+        from epuls_tools.models import Blob
+
+        if not name:
+            raise ValueError("The name must be given to delete().")
+
+        with transaction.atomic():
+            if Blob.objects.filter(name=name, references__gt=1).update(
+                references=F("references") - 1
+            ):
+                return
+            tracked = Blob.objects.filter(name=name).delete()[0]
+
+        if not tracked:
+            super().delete(name)
+            return
+
+        def delete_file():
+            # the same content could have been uploaded again in the meantime
+            if not Blob.objects.filter(name=name).exists():
+                super(ContentAddressedStorage, self).delete(name)
+
+        transaction.on_commit(delete_file)
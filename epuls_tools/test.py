@@ -1,8 +1,42 @@
-from django.test import TestCase
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TestCase, override_settings
+from django.test.runner import DiscoverRunner
+from django.test.testcases import _AssertNumQueriesContext
 
 from account.factories import UserFactory
 
 
+class _AssertNumAppQueriesContext(_AssertNumQueriesContext):
+    @property
+    def captured_queries(self):
+        return [
+            query
+            for query in super().captured_queries
+            if not query["sql"].startswith("EXPLAIN")
+            and '"silk_' not in query["sql"]
+            and "SAVEPOINT" not in query["sql"]
+        ]
+
+
+class AppQueriesMixin:
+    """
+    Overwrites assertNumQueries so it doesn't count queries run by the profiler.
+    When DEBUG is on, silk runs EXPLAIN for every query and saves requests in its own tables.
+    """
+
+    def assertNumQueries(self, num, func=None, *args, using=DEFAULT_DB_ALIAS, **kwargs):
+        context = _AssertNumAppQueriesContext(self, num, connections[using])
+        if func is None:
+            return context
+
+        with context:
+            func(*args, **kwargs)
+
+
 class SimpleDBTestCase(TestCase):
     """
     Test creates a simple database:
@@ -18,3 +52,30 @@ class SimpleDBTestCase(TestCase):
 
         for user in users[1:]:
             main_user.profile.friends.add(user)
+
+
+class EpulsTestRunner(DiscoverRunner):
+    """
+    Keeps the shared cache in a temporary directory, so test runs don't see each other's entries.
+    Background tasks run in the calling thread and statistics are written at once, so nothing is written
+    by threads outside of test transactions or left in the buffer when the test database is gone.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.cache_location = tempfile.mkdtemp(prefix="epuls_cache_")
+        caches = {
+            alias: {**config, "LOCATION": self.cache_location}
+            for alias, config in settings.CACHES.items()
+        }
+        self.test_settings = override_settings(
+            CACHES=caches,
+            BACKGROUND_TASKS={"ASYNC": False},
+            STATS_BUFFER={"ENABLED": False},
+        )
+        self.test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.test_settings.disable()
+        shutil.rmtree(self.cache_location, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
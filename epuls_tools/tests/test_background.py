@@ -0,0 +1,55 @@
+import threading
+
+from django.test import SimpleTestCase, override_settings, tag
+
+from epuls_tools.background import PeriodicFlusher
+
+
+@tag("et_background")
+class PeriodicFlusherTestCase(SimpleTestCase):
+    def test_should_flush_when_woken_up(self):
+        flushed = threading.Event()
+        flusher = PeriodicFlusher(flushed.set, lambda: 60)
+        self.addCleanup(flusher.stop)
+
+        with override_settings(BACKGROUND_TASKS={"ASYNC": True}):
+            self.assertTrue(flusher.start())
+        flusher.wake()
+
+        self.assertTrue(flushed.wait(5))
+        self.assertTrue(flusher.is_running)
+
+    def test_should_flush_on_timer(self):
+        flushed = threading.Event()
+        flusher = PeriodicFlusher(flushed.set, lambda: 0.01)
+        self.addCleanup(flusher.stop)
+
+        with override_settings(BACKGROUND_TASKS={"ASYNC": True}):
+            flusher.start()
+
+        self.assertTrue(flushed.wait(5))
+
+    def test_should_keep_running_after_error(self):
+        calls = []
+        flushed = threading.Event()
+
+        def flush():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ValueError
+            flushed.set()
+
+        flusher = PeriodicFlusher(flush, lambda: 0.01)
+        self.addCleanup(flusher.stop)
+        with override_settings(BACKGROUND_TASKS={"ASYNC": True}), self.assertLogs(
+            "epuls_tools.background", "ERROR"
+        ):
+            flusher.start()
+            self.assertTrue(flushed.wait(5))
+
+    def test_should_not_start_when_background_tasks_are_disabled(self):
+        flusher = PeriodicFlusher(lambda: None, lambda: 0.01)
+
+        with override_settings(BACKGROUND_TASKS={"ASYNC": False}):
+            self.assertFalse(flusher.start())
+        self.assertFalse(flusher.is_running)
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, tag
+
+from epuls_tools.cache import MISSING, LocalCache
+
+
+@tag("lc_t")
+class LocalCacheTestCase(SimpleTestCase):
+    def test_should_return_default_when_key_is_missing(self):
+        cache = LocalCache()
+
+        self.assertIsNone(cache.get("key"))
+        self.assertIs(cache.get("key", MISSING), MISSING)
+
+    def test_should_store_none_value(self):
+        cache = LocalCache()
+        cache.set("key", None)
+
+        self.assertIn("key", cache)
+        self.assertIsNone(cache.get("key", MISSING))
+
+    def test_should_evict_least_recently_used_entry(self):
+        cache = LocalCache(max_size=2, policy="lru")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+
+    def test_should_evict_first_set_entry(self):
+        cache = LocalCache(max_size=2, policy="fifo")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertNotIn("a", cache)
+        self.assertIn("b", cache)
+
+    def test_should_expire_entry_after_timeout(self):
+        cache = LocalCache(timeout=10)
+
+        with patch("epuls_tools.cache.time.monotonic", return_value=100):
+            cache.set("key", "value")
+
+        with patch("epuls_tools.cache.time.monotonic", return_value=111):
+            self.assertIsNone(cache.get("key"))
+
+    def test_should_raise_error_when_policy_is_unknown(self):
+        with self.assertRaises(ValueError):
+            LocalCache(policy="random")
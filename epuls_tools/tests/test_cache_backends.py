@@ -0,0 +1,153 @@
+import tempfile
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, tag
+
+from epuls_tools.cache_backends import SharedFileBasedCache, TwoTierCache
+
+
+def build_cache(**options):
+    return TwoTierCache(
+        "two-tier-test",
+        {
+            "OPTIONS": {
+                "SHARED_BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "L1_TIMEOUT": 60,
+                "LOCK_TIMEOUT": 1,
+                **options,
+            }
+        },
+    )
+
+
+@tag("c_tt")
+class TwoTierCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        self.cache = build_cache()
+        self.other_process = build_cache()
+
+    def tearDown(self):
+        self.cache.clear()
+
+    def test_should_read_shared_entries(self):
+        self.other_process.set("key", "value")
+
+        self.assertEqual(self.cache.get("key"), "value")
+
+    def test_should_serve_entries_from_process_memory(self):
+        self.cache.set("key", "value")
+        self.cache.shared.delete("key")
+
+        self.assertEqual(self.cache.get("key"), "value")
+        self.assertIsNone(self.other_process.get("key"))
+
+    def test_should_delete_entry_from_both_tiers(self):
+        self.cache.set("key", "value")
+
+        self.cache.delete("key")
+
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_should_not_keep_entry_longer_than_l1_timeout(self):
+        cache = build_cache(L1_TIMEOUT=0.01)
+        cache.set("key", "value")
+        cache.shared.delete("key")
+
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get("key"))
+        cache.clear()
+
+    def test_should_compute_missing_value_once(self):
+        compute = Mock(side_effect=lambda: time.sleep(0.1) or "value")
+
+        threads = [
+            threading.Thread(target=self.cache.get_or_set, args=("key", compute))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        compute.assert_called_once()
+        self.assertEqual(self.cache.get("key"), "value")
+
+    def test_should_wait_for_value_computed_by_another_process(self):
+        self.cache.shared.add("key:lock", True)
+        timer = threading.Timer(0.1, self.other_process.set, args=("key", "value"))
+        timer.start()
+
+        value = self.cache.get_or_set("key", Mock(return_value="computed"))
+
+        timer.join()
+        self.assertEqual(value, "value")
+
+    def test_should_compute_value_when_other_process_took_too_long(self):
+        self.cache.shared.add("key:lock", True)
+
+        self.assertEqual(self.cache.get_or_set("key", lambda: "computed"), "computed")
+
+    def test_bumped_namespace_should_make_entries_unreachable(self):
+        version = self.cache.get_namespace_version("profile")
+        self.cache.set("key", "old", version=version)
+
+        self.other_process.bump_namespace("profile")
+        self.cache.local.clear()
+
+        new_version = self.cache.get_namespace_version("profile")
+        self.assertGreater(new_version, version)
+        self.assertIsNone(self.cache.get("key", version=new_version))
+
+    def test_bumped_namespace_version_should_not_expire(self):
+        self.cache.get_namespace_version("profile")
+
+        self.cache.bump_namespace("profile")
+
+        key = self.cache.shared.make_and_validate_key("namespace:profile")
+        self.assertIsNone(self.cache.shared._expire_info[key])
+
+    def test_should_require_location(self):
+        with self.assertRaises(ImproperlyConfigured):
+            TwoTierCache("", {})
+
+    def test_namespace_should_never_reuse_evicted_versions(self):
+        version = self.cache.get_namespace_version("profile")
+        self.cache.bump_namespace("profile")
+        self.cache.clear()
+
+        self.assertGreater(self.cache.get_namespace_version("profile"), version + 1)
+
+
+@tag("c_sfb")
+class SharedFileBasedCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        self.cache = SharedFileBasedCache(
+            tempfile.mkdtemp(prefix="epuls_cache_"),
+            {"OPTIONS": {"MAX_ENTRIES": 2, "CULL_INTERVAL": 60}},
+        )
+
+    def tearDown(self):
+        self.cache.clear()
+
+    def test_should_not_list_entries_on_every_write(self):
+        with patch.object(
+            self.cache, "_list_cache_files", wraps=self.cache._list_cache_files
+        ) as list_cache_files:
+            for number in range(5):
+                self.cache.set(f"key{number}", number)
+
+        list_cache_files.assert_called_once()
+        self.assertEqual(self.cache.get("key4"), 4)
+
+    def test_should_cull_when_interval_has_passed(self):
+        for number in range(3):
+            self.cache.set(f"key{number}", number)
+        self.cache._next_cull = 0
+
+        self.cache.set("key3", 3)
+
+        self.assertLess(len(self.cache._list_cache_files()), 4)
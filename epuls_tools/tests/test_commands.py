@@ -0,0 +1,53 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, tag
+
+from action.models import Action
+from epuls_tools.hot_queries import HOT_QUERIES
+from epuls_tools.management.commands.audit_indexes import find_full_scans
+
+
+@tag("ai_fs")
+class FindFullScansTestCase(SimpleTestCase):
+    def test_should_find_sqlite_scan(self):
+        self.assertEqual(find_full_scans("2 0 0 SCAN action_action"), ["action_action"])
+
+    def test_should_not_find_sqlite_scan_using_index(self):
+        plan = "2 0 0 SCAN action_action USING INDEX action_acti_who_id_edd455_idx"
+        self.assertEqual(find_full_scans(plan), [])
+
+    def test_should_not_find_sqlite_search(self):
+        plan = "3 0 0 SEARCH action_action USING INDEX action_acti_who_id_edd455_idx (who_id=?)"
+        self.assertEqual(find_full_scans(plan), [])
+
+    def test_should_find_postgres_seq_scan(self):
+        plan = "Seq Scan on action_action  (cost=0.00..1.01 rows=1 width=4)"
+        self.assertEqual(find_full_scans(plan), ["action_action"])
+
+
+@tag("ai_c")
+class AuditIndexesCommandTestCase(TestCase):
+    def test_hot_queries_should_use_indexes(self):
+        out = StringIO()
+        call_command("audit_indexes", "--fail-on-scan", stdout=out)
+
+        self.assertNotIn("FULL SCAN", out.getvalue())
+        self.assertEqual(out.getvalue().count("OK"), len(HOT_QUERIES))
+
+    def test_should_raise_error_when_query_scans_table(self):
+        queries = {"actions by name": lambda: Action.objects.filter(action="x")}
+
+        with patch.dict(HOT_QUERIES, queries, clear=True):
+            with self.assertRaises(CommandError):
+                call_command("audit_indexes", "--fail-on-scan", stdout=StringIO())
+
+    def test_should_only_warn_without_fail_on_scan(self):
+        out = StringIO()
+        queries = {"actions by name": lambda: Action.objects.filter(action="x")}
+
+        with patch.dict(HOT_QUERIES, queries, clear=True):
+            call_command("audit_indexes", stdout=out)
+
+        self.assertIn("FULL SCAN  actions by name: action_action", out.getvalue())
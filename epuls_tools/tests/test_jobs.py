@@ -0,0 +1,127 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings, tag
+from django.utils import timezone
+
+from epuls_tools.jobs import claim_job, enqueue, job, run_pending_jobs
+from epuls_tools.models import Blob, Job
+
+calls = []
+
+
+@job(queue="test")
+def record(value):
+    calls.append(value)
+
+
+@job(queue="test", max_attempts=2)
+def fail(value):
+    calls.append(value)
+    raise ValueError("failed")
+
+
+@job(max_attempts=1)
+def create_and_fail():
+    Blob.objects.create(name="blob", size=1)
+    raise ValueError("failed")
+
+
+@tag("et_jobs")
+@override_settings(JOBS={"BACKOFF": 10})
+class JobQueueTestCase(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_should_run_enqueued_job(self):
+        record.enqueue(value=1)
+        self.assertEqual(calls, [])
+
+        self.assertEqual(run_pending_jobs(), 1)
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(Job.objects.get().status, Job.Status.DONE)
+
+    def test_should_run_jobs_by_priority(self):
+        record.enqueue(value="low", priority=Job.Priority.LOW)
+        record.enqueue(value="normal")
+        record.enqueue(value="high", priority=Job.Priority.HIGH)
+
+        run_pending_jobs()
+
+        self.assertEqual(calls, ["high", "normal", "low"])
+
+    def test_should_not_run_job_before_its_date(self):
+        record.enqueue(value=1, run_at=timezone.now() + timedelta(minutes=1))
+
+        self.assertEqual(run_pending_jobs(), 0)
+
+    def test_should_enqueue_job_once_per_idempotency_key(self):
+        first = record.enqueue(value=1, idempotency_key="once")
+        second = record.enqueue(value=2, idempotency_key="once")
+
+        run_pending_jobs()
+
+        self.assertEqual(first, second)
+        self.assertEqual(calls, [1])
+
+    def test_should_retry_failed_job_with_backoff(self):
+        fail.enqueue(value=1)
+
+        with self.assertLogs("epuls_tools.jobs", "ERROR"):
+            run_pending_jobs()
+
+        failed = Job.objects.get()
+        self.assertEqual(failed.status, Job.Status.PENDING)
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn("ValueError", failed.last_error)
+        self.assertGreater(failed.run_at, timezone.now() + timedelta(seconds=5))
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs("epuls_tools.jobs", "ERROR"):
+            run_pending_jobs()
+
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, Job.Status.FAILED)
+        self.assertEqual(calls, [1, 1])
+
+    def test_should_roll_back_changes_of_failed_job(self):
+        create_and_fail.enqueue()
+
+        with self.assertLogs("epuls_tools.jobs", "ERROR"):
+            run_pending_jobs()
+
+        self.assertFalse(Blob.objects.exists())
+
+    def test_should_take_over_job_of_stopped_worker(self):
+        record.enqueue(value=1)
+        claimed = claim_job()
+        Job.objects.filter(pk=claimed.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+
+        run_pending_jobs()
+
+        claimed.refresh_from_db()
+        self.assertEqual(claimed.status, Job.Status.DONE)
+        self.assertEqual(claimed.attempts, 2)
+
+    @override_settings(JOBS={"CONCURRENCY": {"test": 1}})
+    def test_should_respect_concurrency_limit_of_queue(self):
+        record.enqueue(value=1)
+        record.enqueue(value=2)
+        enqueue(record, queue="other", value=3)
+
+        self.assertEqual(claim_job().kwargs, {"value": 1})
+        self.assertEqual(claim_job().kwargs, {"value": 3})
+        self.assertIsNone(claim_job())
+
+    def test_command_should_run_due_jobs(self):
+        record.enqueue(value=1)
+        out = StringIO()
+
+        call_command("run_jobs", "--burst", stdout=out)
+
+        self.assertEqual(calls, [1])
+        self.assertIn("1 jobs have been run.", out.getvalue())
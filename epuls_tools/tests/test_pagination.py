@@ -0,0 +1,111 @@
+from django.contrib.auth.models import User
+from django.core.exceptions import BadRequest
+from django.test import TestCase, tag
+from django.urls import reverse
+from django.utils import timezone
+
+from account.factories import UserFactory
+from diary.factory import DiaryFactory
+from diary.models import Diary
+from epuls_tools.pagination import decode_cursor, encode_cursor, paginate_by_keyset
+
+ORDERING = ("-created", "-pk")
+
+
+@tag("et_pagination")
+class KeysetPaginationTestCase(TestCase):
+    def setUp(self):
+        self.author = UserFactory()
+        self.diaries = DiaryFactory.create_batch(5, author=self.author)
+        # the same creation date, so the order depends on ids
+        Diary.objects.update(created=timezone.now().replace(microsecond=123456))
+        self.diaries = list(Diary.objects.order_by(*ORDERING))
+
+    def get_pages(self, ordering, per_page: int) -> list:
+        pages, cursor = [], None
+        while True:
+            page = paginate_by_keyset(Diary.objects.all(), ordering, cursor, per_page)
+            pages.append(page.object_list)
+            cursor = page.next_cursor
+            if cursor is None:
+                return pages
+
+    def test_should_return_all_objects_once(self):
+        pages = self.get_pages(ORDERING, per_page=2)
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), self.diaries)
+
+    def test_should_paginate_in_ascending_order(self):
+        pages = self.get_pages(("created", "pk"), per_page=3)
+
+        self.assertEqual(sum(pages, []), self.diaries[::-1])
+
+    def test_should_not_return_cursor_of_last_page(self):
+        page = paginate_by_keyset(Diary.objects.all(), ORDERING, per_page=5)
+
+        self.assertIsNone(page.next_cursor)
+        self.assertFalse(page.has_other_pages())
+
+    def test_should_keep_microseconds_in_cursor(self):
+        cursor = encode_cursor(self.diaries[0], ORDERING)
+
+        self.assertEqual(
+            decode_cursor(cursor, Diary, ORDERING),
+            [self.diaries[0].created, self.diaries[0].pk],
+        )
+
+    def test_should_not_shift_page_when_object_is_added(self):
+        first_page = paginate_by_keyset(Diary.objects.all(), ORDERING, per_page=2)
+        DiaryFactory(author=self.author)
+
+        second_page = paginate_by_keyset(
+            Diary.objects.all(), ORDERING, first_page.next_cursor, per_page=2
+        )
+
+        self.assertEqual(second_page.object_list, self.diaries[2:4])
+
+    def test_should_reject_invalid_cursor(self):
+        for cursor in ["abc", "W10", encode_cursor(self.diaries[0], ("-pk",))]:
+            with self.subTest(cursor=cursor), self.assertRaises(BadRequest):
+                paginate_by_keyset(Diary.objects.all(), ORDERING, cursor)
+
+
+@tag("et_pagination")
+class KeysetPaginationMixinTestCase(TestCase):
+    url = reverse("account:user-list")
+
+    def setUp(self):
+        UserFactory.create_batch(25)
+
+    def test_should_paginate_list_view(self):
+        first_page = self.client.get(self.url)
+        second_page = self.client.get(
+            self.url, {"cursor": first_page.context["page_obj"].next_cursor}
+        )
+
+        usernames = list(
+            User.objects.order_by("username").values_list("username", flat=True)
+        )
+        self.assertEqual(
+            [user.username for user in first_page.context["object_list"]],
+            usernames[:20],
+        )
+        self.assertEqual(
+            [user.username for user in second_page.context["object_list"]],
+            usernames[20:],
+        )
+
+    def test_should_keep_query_in_page_links(self):
+        for number in range(21):
+            UserFactory(username=f"searched{number:02}")
+
+        response = self.client.get(self.url, {"q": "searched"})
+
+        self.assertEqual(len(response.context["object_list"]), 20)
+        self.assertContains(response, "?q=searched&amp;cursor=")
+
+    def test_should_return_400_for_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "abc"})
+
+        self.assertEqual(response.status_code, 400)
@@ -3,13 +3,14 @@ from io import BytesIO
 from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.files.base import File
 from django.test import TestCase, tag
 from parameterized import parameterized
 from PIL import Image
 
 from account.factories import UserFactory
-from account.models import Profile
+from account.models import Gender, Profile
 from epuls_tools.presentation import (
     Component,
     PictureComponent,
@@ -17,7 +18,11 @@ from epuls_tools.presentation import (
     ProfilePictureComponent,
     Tag,
     UserComponent,
+    compile_presentation,
+    hash_presentation,
+    render_presentation,
 )
+from epuls_tools.test import AppQueriesMixin
 from photo.factories import GalleryFactory, PictureFactory
 from photo.models import Picture
 
@@ -337,3 +342,180 @@ class PresentationTestCase(TestCase):
                 ' <iframe src=""></iframe> '
             ),
         )
+
+
+@tag("p_rp")
+class RenderPresentationTestCase(AppQueriesMixin, TestCase):
+    def setUp(self):
+        self.user = UserFactory(username="owner")
+        self.friend = UserFactory(username="friend")
+        gallery = GalleryFactory(profile=self.user.profile)
+        self.picture = PictureFactory(
+            profile=self.user.profile, gallery=gallery, presentation_tag="cat"
+        )
+        self.html = (
+            "<p>Hi</p>\n"
+            "<a href=@friend ></a>\n"
+            '<img src=@prof-friend class="round" >\n'
+            "<img src=@img-cat >\n"
+            "<img src=@img-dog >"
+        )
+        self.expected = (
+            "<p>Hi</p>\n"
+            '<a href="/friend/" >friend</a>\n'
+            f'<a href="/friend/"><img src="/static/account/profile_picture/default_{self.friend.profile.gender}_picture.jpeg" class="round"></a>\n'
+            f'<img src="/media/{self.picture.picture}" >\n'
+            '<img src="" >'
+        )
+
+    def tearDown(self):
+        cache.clear()
+        path = self.picture.picture.path
+        if os.path.exists(path):
+            os.remove(path)
+
+    def render(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return render_presentation(self.html, self.user.profile)
+
+    def test_should_convert_all_tags_with_one_query(self):
+        with self.assertNumQueries(1):
+            html = Presentation(self.html, self.user.profile).convert()
+
+        self.assertEqual(html, self.expected)
+
+    def test_should_return_the_same_html_as_components(self):
+        presentation = Presentation(self.html, self.user.profile)
+        presentation.check_html()
+        html = presentation.html
+        for component in [
+            UserComponent(),
+            ProfilePictureComponent(),
+            PictureComponent(self.user.profile),
+        ]:
+            html = component.link(html)
+
+        self.assertEqual(Presentation(self.html, self.user.profile).convert(), html)
+
+    def test_should_not_query_without_pictures(self):
+        with self.assertNumQueries(0):
+            html = Presentation("<a href=@friend ></a>", self.user.profile).convert()
+
+        self.assertEqual(html, '<a href="/friend/" >friend</a>')
+
+    def test_should_compile_presentation_to_chunks_and_placeholders(self):
+        chunks = compile_presentation(
+            '<img src="x.js" ><a href=@friend class="a" ></a>'
+        )
+
+        self.assertEqual(chunks, ['<img src="" >', ["user", "friend", 'class="a"']])
+
+    def test_should_compile_empty_presentation(self):
+        self.assertEqual(compile_presentation(None), [])
+
+    def test_should_render_compiled_presentation_with_one_query(self):
+        chunks = compile_presentation(self.html)
+
+        with self.assertNumQueries(1):
+            html = Presentation("", self.user.profile).render(chunks)
+
+        self.assertEqual(html, self.expected)
+
+    def test_should_render_compiled_presentation_of_profile(self):
+        profile = self.user.profile
+        profile.presentation = self.html
+        profile.compiled_presentation = ["compiled"]
+        profile.compiled_presentation_hash = hash_presentation(self.html)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            html = render_presentation(self.html, profile)
+
+        self.assertEqual(html, "compiled")
+
+    def test_should_not_render_stale_compiled_presentation(self):
+        profile = self.user.profile
+        profile.compiled_presentation = ["compiled"]
+        profile.compiled_presentation_hash = hash_presentation("<p>Old</p>")
+        # changed without compiling, e.g. in the admin
+        profile.presentation = self.html
+        profile.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            html = render_presentation(self.html, profile)
+
+        self.assertEqual(html, self.expected)
+
+    def test_should_render_cached_presentation_without_queries(self):
+        self.render()
+
+        with self.assertNumQueries(0):
+            html = self.render()
+
+        self.assertEqual(html, self.expected)
+
+    def test_should_render_again_when_picture_is_changed(self):
+        self.render()
+
+        self.picture.presentation_tag = "dog"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.picture.save()
+
+        self.assertIn('<img src="" >\n<img src="/media/', self.render())
+
+    def test_should_render_again_when_profile_picture_is_changed(self):
+        self.render()
+
+        self.friend.profile.profile_picture = generate_photo_file("friend")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.friend.profile.save(update_fields=["profile_picture"])
+
+        html = self.render()
+        os.remove(self.friend.profile.profile_picture.path)
+
+        self.assertIn(f'<img src="/media/{self.friend.profile.profile_picture}"', html)
+
+    def test_should_keep_profile_pictures_when_profile_is_saved_without_changes(self):
+        profile = self.friend.profile
+
+        with patch("account.signals.invalidate_profile_picture") as invalidate:
+            profile.add_friend(self.user)
+            profile.gender = profile.gender
+            profile.save()
+
+        invalidate.assert_not_called()
+
+    def test_should_render_again_when_gender_is_changed(self):
+        profile = Profile.objects.get(user=self.friend)
+
+        with patch("account.signals.invalidate_profile_picture") as invalidate:
+            profile.gender = (
+                Gender.FEMALE if profile.gender == Gender.MALE else Gender.MALE
+            )
+            profile.save()
+
+        invalidate.assert_called_once_with(self.friend.username)
+
+    def test_should_keep_presentation_when_other_profile_picture_is_changed(self):
+        self.render()
+        stranger = UserFactory()
+
+        stranger.profile.profile_picture = generate_photo_file("stranger")
+        with self.captureOnCommitCallbacks(execute=True):
+            stranger.profile.save(update_fields=["profile_picture"])
+        os.remove(stranger.profile.profile_picture.path)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.render(), self.expected)
+
+    def test_should_render_again_when_mentioned_user_signs_up(self):
+        self.html = "<img src=@prof-newcomer >"
+        self.assertEqual(self.render(), '<a href="/newcomer/"><img src="" ></a>')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            newcomer = UserFactory(username="newcomer")
+
+        self.assertEqual(
+            self.render(),
+            '<a href="/newcomer/"><img src="/static/account/profile_picture/'
+            f'default_{newcomer.profile.gender}_picture.jpeg" ></a>',
+        )
@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+from django.test import TestCase, tag
+from django.utils import timezone
+
+from account.factories import UserFactory
+from epuls_tools.sampling import SamplingPool, sample_by_id_range
+from epuls_tools.test import AppQueriesMixin
+from shouter.factory import ShouterFactory
+from shouter.models import Shouter
+
+
+@tag("s_smp")
+class SampleByIdRangeTestCase(AppQueriesMixin, TestCase):
+    def setUp(self):
+        user = UserFactory()
+        self.shouters = ShouterFactory.create_batch(5, user=user)
+
+    def test_should_draw_rows_of_queryset(self):
+        queryset = Shouter.objects.exclude(pk=self.shouters[0].pk)
+
+        for _ in range(20):
+            sample = list(sample_by_id_range(queryset, 3))
+            self.assertTrue(1 <= len(sample) <= 3)
+            self.assertNotIn(self.shouters[0], sample)
+
+    def test_should_draw_every_row(self):
+        drawn = set()
+        for _ in range(100):
+            drawn.update(sample_by_id_range(Shouter.objects.all(), 1))
+
+        self.assertEqual(drawn, set(self.shouters))
+
+    def test_should_return_nothing_for_empty_queryset(self):
+        queryset = Shouter.objects.filter(text="")
+
+        with self.assertNumQueries(1):
+            self.assertFalse(sample_by_id_range(queryset, 3).exists())
+
+
+@tag("s_smp")
+class SamplingPoolTestCase(AppQueriesMixin, TestCase):
+    def setUp(self):
+        user = UserFactory()
+        now = timezone.now()
+        self.live = ShouterFactory(user=user, expiration=now + timedelta(hours=1))
+        self.expiring = ShouterFactory(user=user, expiration=now + timedelta(hours=1))
+        self.pool = SamplingPool(Shouter.objects.all, expiration_field="expiration")
+
+    def test_should_load_pool_once(self):
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                self.assertCountEqual(
+                    self.pool.sample(5), [self.live.pk, self.expiring.pk]
+                )
+
+    def test_should_skip_expired_rows_without_reloading(self):
+        self.pool.sample(5)
+        self.pool._cache.set(
+            "pool",
+            [(self.live.pk, None), (self.expiring.pk, timezone.now())],
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.pool.sample(5), [self.live.pk])
+
+    def test_should_reload_pool_after_invalidation(self):
+        self.pool.sample(5)
+        self.pool.invalidate()
+
+        with self.assertNumQueries(1):
+            self.pool.sample(5)
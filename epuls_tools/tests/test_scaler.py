@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from account.factories import UserFactory
+from account.models import Profile, ProfileType
+from epuls_tools.scaler import give_away_puls, give_away_puls_bulk
+from puls.models import Bonus, PendingPuls, PulsType, SinglePuls
+
+
+@tag("s_gb")
+class GiveAwayPulsBulkTestCase(TestCase):
+    def setUp(self):
+        UserFactory.create_batch(4)
+        for profile, type_of_profile in zip(Profile.objects.all(), ProfileType):
+            profile.type_of_profile = type_of_profile
+            profile.save()
+
+    def get_profiles(self):
+        return Profile.objects.only("puls_id", "type_of_profile")
+
+    def test_should_give_the_same_quantity_as_give_away_puls(self):
+        profiles = list(self.get_profiles())
+
+        give_away_puls_bulk(profiles, PulsType.LOGINS)
+        expected = [
+            give_away_puls(user_profile=profile, type=PulsType.LOGINS)
+            for profile in profiles
+        ]
+
+        for profile, quantity in zip(profiles, expected):
+            pulses = SinglePuls.objects.filter(puls_id=profile.puls_id)
+            self.assertEqual(
+                [p.quantity for p in pulses], [quantity, quantity], profile
+            )
+
+    def test_should_give_constant_quantity(self):
+        give_away_puls_bulk(self.get_profiles(), PulsType.SCHOOLS)
+
+        self.assertEqual(
+            set(SinglePuls.objects.values_list("quantity", flat=True)), {15}
+        )
+
+    def test_should_give_bonus(self):
+        today = timezone.now().date()
+        Bonus.objects.create(
+            name="bonus",
+            start=today - timedelta(days=1),
+            end=today + timedelta(days=1),
+            scaler=2,
+            type=PulsType.TYPE,
+        )
+
+        give_away_puls_bulk(self.get_profiles(), PulsType.TYPE, rate=1)
+
+        bonuses = SinglePuls.objects.filter(type=PulsType.BONUS).order_by("quantity")
+        self.assertEqual([b.quantity for b in bonuses], [2, 4, 6, 8])
+
+    def test_should_not_give_type_puls_without_rate(self):
+        with self.assertRaises(KeyError):
+            give_away_puls_bulk(self.get_profiles(), PulsType.TYPE)
+
+        self.assertFalse(SinglePuls.objects.exists())
+
+    def test_should_write_chunk_with_one_insert(self):
+        profiles = list(self.get_profiles())
+
+        with CaptureQueriesContext(connection) as context:
+            awarded = give_away_puls_bulk(profiles, PulsType.LOGINS, batch_size=2)
+
+        inserts = [
+            query
+            for query in context.captured_queries
+            if query["sql"].startswith('INSERT INTO "puls_singlepuls"')
+        ]
+        self.assertEqual(awarded, 4)
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(SinglePuls.objects.count(), 4)
+
+    def test_should_update_ledger(self):
+        give_away_puls_bulk(self.get_profiles(), PulsType.GUESTBOOKS, extra_points=2)
+
+        profile = Profile.objects.get(type_of_profile=ProfileType.DIVINE)
+        pending = PendingPuls.objects.get(puls_id=profile.puls_id)
+        self.assertAlmostEqual(pending.quantity, 0.8)
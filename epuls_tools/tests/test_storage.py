@@ -0,0 +1,164 @@
+import os
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, tag
+
+from account.factories import UserFactory
+from account.models import Profile
+from epuls_tools.models import Blob
+from photo.factories import GalleryFactory, PictureFactory
+from photo.models import ProfilePictureRequest
+
+
+@tag("s_cas")
+class ContentAddressedStorageTestCase(TestCase):
+    def setUp(self):
+        self.names = []
+
+    def tearDown(self):
+        for name in self.names:
+            if os.path.exists(default_storage.path(name)):
+                os.remove(default_storage.path(name))
+
+    def save(self, content, name="test.txt"):
+        name = default_storage.save(name, ContentFile(content))
+        self.names.append(name)
+        return name
+
+    def delete(self, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            default_storage.delete(name)
+
+    def test_should_name_file_by_content(self):
+        first = self.save(b"content", "a.TXT")
+        second = self.save(b"content", "dir/b.txt")
+
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith("blobs/"))
+        self.assertTrue(first.endswith(".txt"))
+        self.assertEqual(Blob.objects.get(name=first).references, 2)
+
+    def test_should_save_different_content_to_different_files(self):
+        self.assertNotEqual(self.save(b"first"), self.save(b"second"))
+
+    def test_should_keep_file_until_last_reference_is_deleted(self):
+        name = self.save(b"content")
+        self.save(b"content")
+
+        self.delete(name)
+        self.assertTrue(default_storage.exists(name))
+        self.assertEqual(Blob.objects.get(name=name).references, 1)
+
+        self.delete(name)
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(Blob.objects.exists())
+
+    def test_should_not_add_reference_when_file_is_not_written(self):
+        name = self.save(b"content")
+        os.remove(default_storage.path(name))
+
+        with patch(
+            "epuls_tools.storage.ContentAddressedStorage.write_blob",
+            side_effect=OSError,
+        ):
+            for content in [b"content", b"other content"]:
+                with self.subTest(content=content), self.assertRaises(OSError):
+                    self.save(content)
+
+        self.assertEqual(Blob.objects.get(name=name).references, 1)
+        self.assertEqual(Blob.objects.count(), 1)
+
+    def test_should_not_delete_file_before_commit(self):
+        name = self.save(b"content")
+
+        default_storage.delete(name)
+
+        self.assertTrue(default_storage.exists(name))
+
+    def test_should_delete_untracked_file_at_once(self):
+        name = "legacy.txt"
+        with open(default_storage.path(name), "wb") as file:
+            file.write(b"legacy")
+        self.names.append(name)
+
+        default_storage.delete(name)
+
+        self.assertFalse(default_storage.exists(name))
+
+    def test_retain_should_add_reference(self):
+        name = self.save(b"content")
+
+        default_storage.retain(name)
+
+        self.assertEqual(Blob.objects.get(name=name).references, 2)
+
+    def test_retain_should_track_untracked_file(self):
+        name = "legacy.txt"
+        with open(default_storage.path(name), "wb") as file:
+            file.write(b"legacy")
+        self.names.append(name)
+
+        default_storage.retain(name)
+
+        blob = Blob.objects.get(name=name)
+        self.assertEqual((blob.references, blob.size), (2, 6))
+
+
+@tag("s_cas_m")
+class ContentAddressedModelsTestCase(TestCase):
+    def setUp(self):
+        self.profile = UserFactory().profile
+        self.gallery = GalleryFactory(profile=self.profile)
+
+    def tearDown(self):
+        for blob in Blob.objects.all():
+            if default_storage.exists(blob.name):
+                os.remove(default_storage.path(blob.name))
+
+    def test_identical_pictures_should_share_file(self):
+        first, second = PictureFactory.create_batch(
+            2, profile=self.profile, gallery=self.gallery
+        )
+
+        self.assertEqual(first.picture.name, second.picture.name)
+        self.assertEqual(Blob.objects.get().references, 2)
+
+    def test_deleting_shared_picture_should_keep_file_and_update_quota(self):
+        first, second = PictureFactory.create_batch(
+            2, profile=self.profile, gallery=self.gallery
+        )
+        size = first.picture.size
+        Profile.objects.filter(pk=self.profile.pk).update(size_of_pictures=2 * size)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.size_of_pictures, size)
+        self.assertTrue(default_storage.exists(second.picture.name))
+
+    def test_accepted_profile_picture_should_share_file_with_request(self):
+        request = ProfilePictureRequest.objects.create(
+            profile=self.profile, picture=ContentFile(b"image", name="me.jpg")
+        )
+
+        name = request.picture.name
+
+        request.accept()
+        request.delete()
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.profile_picture.name, name)
+        self.assertEqual(Blob.objects.get().references, 1)
+
+    def test_deleting_profile_picture_should_release_file(self):
+        request = ProfilePictureRequest.objects.create(
+            profile=self.profile, picture=ContentFile(b"image", name="me.jpg")
+        )
+        request.accept()
+
+        self.profile.delete_profile_picture()
+
+        self.assertEqual(Blob.objects.get().references, 1)
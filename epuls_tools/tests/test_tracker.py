@@ -1,11 +1,22 @@
+from datetime import timedelta
 from unittest.mock import Mock, patch
 
 from django.contrib.auth.models import User
-from django.test import TestCase, tag
-
-from account.factories import UserFactory
+from django.db import DatabaseError, connection
+from django.shortcuts import reverse
+from django.test import TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from account.cache import known_visitor_cache
+from account.factories import PASSWORD, UserFactory
+from account.models import Gender, Profile, Visitor
+from action.factories import ActionFactory
+from action.models import Action, ActionMessage
 from epuls_tools.expections import TrackerUserNotFoundError
-from epuls_tools.views.tracker import EpulsTracker
+from epuls_tools.test import AppQueriesMixin
+from epuls_tools.views.buffer import TrackerBuffer
+from epuls_tools.views.tracker import EpulsTracker, create_visitor
 from photo.factories import GalleryFactory
 
 
@@ -112,3 +123,246 @@ class EpulsTrackerTestCase(TestCase):
         expected = tracker.get_login_user()
 
         self.assertEqual(expected, self.user)
+
+
+@tag("t_tb")
+@override_settings(
+    TRACKER_BUFFER={"ENABLED": True, "MAX_SIZE": 100, "FLUSH_INTERVAL": 60}
+)
+class TrackerBufferTestCase(TestCase):
+    def setUp(self):
+        self.buffer = TrackerBuffer()
+        self.user, self.receiver = UserFactory.create_batch(2)
+
+    def test_should_not_write_anything_before_flush(self):
+        self.buffer.add_action(
+            who_id=self.user.pk,
+            whom_id=self.receiver.pk,
+            action=ActionMessage.SB_PROFILE,
+        )
+        self.buffer.add_visit(visitor_id=self.user.pk, receiver_id=self.receiver.pk)
+
+        self.assertEqual(len(self.buffer), 2)
+        self.assertFalse(Action.objects.exists())
+        self.assertFalse(Visitor.objects.exists())
+
+    def test_should_flush_when_buffer_is_full(self):
+        with override_settings(TRACKER_BUFFER={"ENABLED": True, "MAX_SIZE": 2}):
+            self.buffer.add_visit(visitor_id=self.user.pk, receiver_id=self.receiver.pk)
+            self.buffer.add_visit(visitor_id=self.user.pk, receiver_id=self.receiver.pk)
+
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(Visitor.objects.count(), 2)
+
+    def test_should_wake_flusher_instead_of_flushing_in_request(self):
+        self.buffer._flusher = Mock(**{"start.return_value": True})
+
+        with override_settings(
+            TRACKER_BUFFER={"ENABLED": True, "MAX_SIZE": 1}
+        ), self.assertNumQueries(0):
+            self.buffer.add_visit(visitor_id=self.user.pk, receiver_id=self.receiver.pk)
+
+        self.buffer._flusher.wake.assert_called_once()
+        self.assertEqual(len(self.buffer), 1)
+
+    def test_should_keep_events_when_writing_fails(self):
+        self.buffer.add_action(
+            who_id=self.user.pk,
+            whom_id=self.receiver.pk,
+            action=ActionMessage.SB_PROFILE,
+        )
+        self.buffer.add_visit(visitor_id=self.user.pk, receiver_id=self.receiver.pk)
+
+        with patch(
+            "epuls_tools.views.buffer.flush_actions", side_effect=DatabaseError
+        ), self.assertLogs("epuls_tools.views.buffer", "ERROR"):
+            self.buffer.flush()
+
+        self.assertEqual(len(self.buffer), 1)
+        self.assertEqual(Visitor.objects.count(), 1)
+
+        self.buffer.flush()
+
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(Action.objects.count(), 1)
+
+    def test_should_write_queued_dates_with_inserts_only(self):
+        self.buffer.add_action(
+            who_id=self.user.pk,
+            whom_id=self.receiver.pk,
+            action=ActionMessage.SB_PROFILE,
+        )
+        self.buffer.add_visit(visitor_id=self.user.pk, receiver_id=self.receiver.pk)
+        queued_at = self.buffer._actions[0].date, self.buffer._visits[0].date
+
+        with CaptureQueriesContext(connection) as context:
+            self.buffer.flush()
+
+        self.assertFalse(
+            [
+                query
+                for query in context.captured_queries
+                if query["sql"].startswith(
+                    ('UPDATE "action_action"', 'UPDATE "account_visitor"')
+                )
+            ]
+        )
+        self.assertEqual(
+            (Action.objects.get().date, Visitor.objects.get().date_of_visit),
+            queued_at,
+        )
+
+    def test_should_collapse_consecutive_identical_actions(self):
+        for action in [
+            ActionMessage.SB_PROFILE,
+            ActionMessage.SB_PROFILE,
+            ActionMessage.OWN_DIARY,
+            ActionMessage.SB_PROFILE,
+        ]:
+            self.buffer.add_action(
+                who_id=self.user.pk, whom_id=self.receiver.pk, action=action
+            )
+
+        self.buffer.flush()
+
+        self.assertListEqual(
+            list(Action.objects.values_list("action", flat=True)),
+            [
+                ActionMessage.SB_PROFILE,
+                ActionMessage.OWN_DIARY,
+                ActionMessage.SB_PROFILE,
+            ],
+        )
+
+    def test_should_update_last_action_from_database_when_it_is_the_same(self):
+        ActionFactory(
+            who=self.user,
+            whom=self.receiver,
+            action=ActionMessage.SB_PROFILE,
+            date=timezone.now() - timedelta(days=4),
+        )
+        self.buffer.add_action(
+            who_id=self.user.pk,
+            whom_id=self.receiver.pk,
+            action=ActionMessage.SB_PROFILE,
+        )
+
+        self.buffer.flush()
+
+        self.assertEqual(Action.objects.count(), 1)
+        self.assertEqual(Action.objects.first().date.day, timezone.now().day)
+
+    def test_should_count_gender_only_for_first_visit(self):
+        visitor_female = UserFactory()
+        visitor_female.profile.gender = Gender.FEMALE
+        visitor_female.profile.save()
+
+        for _ in range(3):
+            self.buffer.add_visit(visitor_id=self.user.pk, receiver_id=self.receiver.pk)
+            self.buffer.add_visit(
+                visitor_id=visitor_female.pk, receiver_id=self.receiver.pk
+            )
+        self.buffer.flush()
+        self.buffer.add_visit(visitor_id=self.user.pk, receiver_id=self.receiver.pk)
+        self.buffer.flush()
+
+        profile = Profile.objects.get(user=self.receiver)
+        self.assertEqual(Visitor.objects.count(), 7)
+        self.assertEqual(profile.male_visitor, 1)
+        self.assertEqual(profile.female_visitor, 1)
+        self.assertEqual(profile.visitors.count(), 2)
+
+    def test_should_drop_visits_of_deleted_users(self):
+        self.buffer.add_visit(visitor_id=self.user.pk, receiver_id=self.receiver.pk)
+        self.receiver.delete()
+
+        self.buffer.flush()
+
+        self.assertFalse(Visitor.objects.exists())
+
+    def test_should_drop_actions_of_deleted_users(self):
+        self.buffer.add_action(
+            who_id=self.user.pk,
+            whom_id=self.receiver.pk,
+            action=ActionMessage.SB_PROFILE,
+        )
+        self.receiver.delete()
+
+        self.buffer.flush()
+
+        self.assertEqual(len(self.buffer), 0)
+        self.assertFalse(Action.objects.exists())
+
+    def test_tracker_should_use_buffer_when_it_is_enabled(self):
+        self.client.login(username=self.user.username, password=PASSWORD)
+
+        with patch("epuls_tools.views.tracker.tracker_buffer", self.buffer):
+            self.client.get(
+                reverse("account:profile", kwargs={"username": self.receiver.username})
+            )
+
+        self.assertEqual(len(self.buffer), 2)
+        self.assertFalse(Action.objects.exists())
+
+
+@tag("t_cv")
+class CreateVisitorTestCase(AppQueriesMixin, TestCase):
+    def setUp(self):
+        self.user, self.receiver = UserFactory.create_batch(2)
+
+    def tearDown(self):
+        known_visitor_cache.clear()
+        super().tearDown()
+
+    def test_should_count_first_visit_and_add_visitor(self):
+        create_visitor(self.receiver, self.user)
+
+        profile = Profile.objects.get(user=self.receiver)
+        self.assertEqual(profile.male_visitor, 1)
+        self.assertTrue(profile.visitors.filter(pk=self.user.pk).exists())
+
+    def test_should_count_gender_of_visitor(self):
+        Profile.objects.filter(user=self.user).update(gender=Gender.FEMALE)
+
+        create_visitor(self.receiver, self.user)
+
+        profile = Profile.objects.get(user=self.receiver)
+        self.assertEqual(profile.female_visitor, 1)
+        self.assertEqual(profile.male_visitor, 0)
+
+    def test_should_only_create_visitor_when_visit_is_repeated(self):
+        create_visitor(self.receiver, self.user)
+
+        # Visitor INSERT, LastVisit upsert, profile lock and the rejected 'visitors' INSERT
+        with self.assertNumQueries(4):
+            create_visitor(self.receiver, self.user)
+
+        profile = Profile.objects.get(user=self.receiver)
+        self.assertEqual(profile.male_visitor, 1)
+        self.assertEqual(Visitor.objects.count(), 2)
+
+    def test_should_not_count_visitor_twice_when_visitor_was_added_elsewhere(self):
+        self.receiver.profile.visitors.add(self.user)
+
+        create_visitor(self.receiver, self.user)
+
+        profile = Profile.objects.get(user=self.receiver)
+        self.assertEqual(profile.male_visitor, 0)
+        self.assertEqual(profile.visitors.count(), 1)
+
+    def test_should_keep_visitors_when_profile_is_saved(self):
+        profile = self.receiver.profile
+
+        create_visitor(self.receiver, self.user)
+        profile.save()
+
+        self.assertTrue(profile.visitors.filter(pk=self.user.pk).exists())
+
+    def test_should_skip_profile_when_visitor_is_known_from_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_visitor(self.receiver, self.user)
+        receiver = User.objects.get(pk=self.receiver.pk)
+
+        # Visitor INSERT and LastVisit upsert
+        with self.assertNumQueries(2):
+            create_visitor(receiver, self.user)
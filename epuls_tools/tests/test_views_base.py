@@ -1,11 +1,13 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from notifications.models import Notification
 
 from account.factories import UserFactory
+from epuls_tools.jobs import run_pending_jobs
 from epuls_tools.views.base import EpulsBaseView
 
 
 class EpulsBaseViewTestCase(TestCase):
+    @override_settings(INBOX={"WINDOW": 0})
     def test_should_create_notification(self):
         user_one, user_two = UserFactory.create_batch(2)
         bv = EpulsBaseView()
@@ -13,6 +15,7 @@ class EpulsBaseViewTestCase(TestCase):
         bv.user_object = user_two
 
         bv.send_notification("test")
+        run_pending_jobs()
 
         self.assertEqual(Notification.objects.count(), 1)
 
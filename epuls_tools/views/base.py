@@ -1,5 +1,6 @@
-from typing import Any
+from typing import Any, Optional
 
+from django.db import models
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -7,7 +8,8 @@ from django.views.generic import (
     ListView,
     UpdateView,
 )
-from notifications.signals import notify
+
+from inbox.services import notify_user
 
 from .tracker import EpulsTracker
 
@@ -15,14 +17,15 @@ from .tracker import EpulsTracker
 class EpulsBaseView(EpulsTracker):
     """Handles a basic view of custom view."""
 
-    def send_notification(self, verb: str, **kwargs):
-        """Creates notification."""
-        notify.send(
-            sender=self.get_login_user(),
+    def send_notification(
+        self, verb: str, action_object: Optional[models.Model] = None
+    ):
+        """Queues notification from the login user to the user of the view. Bursts of them are coalesced."""
+        notify_user(
             actor=self.get_login_user(),
             recipient=self.get_user(),
             verb=verb,
-            **kwargs
+            action_object=action_object,
         )
 
     def get(self, request, *args, **kwargs) -> Any:
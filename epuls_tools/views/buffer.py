@@ -0,0 +1,316 @@
+"""
+Write-behind buffer for the tracker system.
+
+When ``TRACKER_BUFFER["ENABLED"]`` is set, ``EpulsTracker.tracker`` doesn't write to the database on every request.
+Tracking events are queued in process and written in batches by a background thread every ``FLUSH_INTERVAL``
+seconds or as soon as the buffer reaches ``MAX_SIZE`` events. Events which couldn't be written are queued again.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
+
+from account.cache import (
+    invalidate_profile_snapshots,
+    is_known_visitor,
+    remember_visitor,
+)
+from account.models import LastVisit, Profile, Visitor, visitor_counter_field
+from action.cache import set_last_action
+from action.models import Action
+from epuls_tools.background import PeriodicFlusher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 5
+
+
+def get_buffer_settings() -> dict:
+    return getattr(settings, "TRACKER_BUFFER", {})
+
+
+def is_buffer_enabled() -> bool:
+    return bool(get_buffer_settings().get("ENABLED", False))
+
+
+@dataclass
+class ActionEvent:
+    who_id: int
+    whom_id: int
+    action: str
+    date: datetime
+
+
+@dataclass
+class VisitEvent:
+    visitor_id: int
+    receiver_id: int
+    date: datetime
+
+
+def collapse_actions(events: Iterable[ActionEvent]) -> Dict[int, List[ActionEvent]]:
+    """
+    Groups events by user and collapses consecutive identical actions.
+    A collapsed action keeps the first 'whom' and takes the date of the latest event, the same as 'create_action' does.
+    """
+    runs: Dict[int, List[ActionEvent]] = {}
+    for event in events:
+        user_runs = runs.setdefault(event.who_id, [])
+        if user_runs and user_runs[-1].action == event.action:
+            user_runs[-1] = replace(user_runs[-1], date=event.date)
+        else:
+            user_runs.append(event)
+    return runs
+
+
+def pull_last_actions(user_ids: Iterable[int]) -> Dict[int, Action]:
+    """
+    Returns the last action of each user with one query.
+    The last action cache isn't read, because entries of other processes may be stale.
+    """
+    latest = Action.objects.filter(who=OuterRef("who")).order_by("-date", "-pk")
+    return {
+        action.who_id: action
+        for action in Action.objects.filter(
+            who_id__in=user_ids, pk=Subquery(latest.values("pk")[:1])
+        )
+    }
+
+
+def flush_actions(events: List[ActionEvent]) -> None:
+    """
+    Writes action events with at most one query for the last actions, one bulk update and one bulk create.
+    Events of users who have been deleted while they were queued are dropped.
+    """
+    existing = set(
+        User.objects.filter(
+            pk__in={
+                user_id for event in events for user_id in (event.who_id, event.whom_id)
+            }
+        ).values_list("pk", flat=True)
+    )
+    runs = collapse_actions(
+        event
+        for event in events
+        if event.who_id in existing and event.whom_id in existing
+    )
+    if not runs:
+        return
+    last_actions = pull_last_actions(runs.keys())
+
+    to_update, to_create = [], []
+    for who_id, user_runs in runs.items():
+        last_action = last_actions.get(who_id)
+
+        if last_action and last_action.action == user_runs[0].action:
+            last_action.date = user_runs[0].date
+            to_update.append(last_action)
+            user_runs = user_runs[1:]
+
+        to_create.extend(
+            Action(
+                who_id=event.who_id,
+                whom_id=event.whom_id,
+                action=event.action,
+                date=event.date,
+            )
+            for event in user_runs
+        )
+
+    with transaction.atomic():
+        if to_update:
+            Action.objects.bulk_update(to_update, ["date"])
+        if to_create:
+            Action.objects.bulk_create(to_create)
+
+        # bulk operations don't send signals, so the cache has to be updated here
+        for action in [*to_update, *to_create]:
+            set_last_action(action.who_id, action)
+
+
+def pull_profiles(user_ids: Iterable[int]) -> Dict[int, Tuple[int, str]]:
+    """Returns (profile id, gender) by user id. Users who have been deleted in the meantime are missing."""
+    return {
+        user_id: (profile_id, gender)
+        for user_id, profile_id, gender in Profile.objects.filter(
+            user_id__in=set(user_ids)
+        ).values_list("user_id", "pk", "gender")
+    }
+
+
+def lock_profiles(profile_ids: Iterable[int]) -> None:
+    """
+    Locks the profiles until the end of the transaction. They are locked in the same order everywhere,
+    so concurrent flushes don't deadlock.
+    """
+    list(
+        Profile.objects.select_for_update()
+        .filter(pk__in=set(profile_ids))
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def flush_visits(events: List[VisitEvent]) -> None:
+    """
+    Writes visit events and counts the first visits by gender, like 'create_visitor' does.
+    Events of users who have been deleted while they were queued are dropped.
+    """
+    profiles = pull_profiles(
+        user_id for event in events for user_id in (event.visitor_id, event.receiver_id)
+    )
+    events = [
+        event
+        for event in events
+        if event.visitor_id in profiles and event.receiver_id in profiles
+    ]
+    if not events:
+        return
+
+    with transaction.atomic():
+        Visitor.objects.bulk_create(
+            Visitor(
+                visitor_id=event.visitor_id,
+                receiver_id=event.receiver_id,
+                date_of_visit=event.date,
+            )
+            for event in events
+        )
+        # bulk_create doesn't send post_save, so the last visits are upserted here
+        LastVisit.record(
+            (event.receiver_id, event.visitor_id, event.date) for event in events
+        )
+        add_first_visitors(
+            {(event.receiver_id, event.visitor_id) for event in events}, profiles
+        )
+
+
+def add_first_visitors(
+    pairs: set[Tuple[int, int]], profiles: Dict[int, Tuple[int, str]]
+) -> None:
+    """
+    Adds visitors to the profile 'visitors' and updates the gender counters only for the first visits.
+    The receivers' profiles are locked before the 'visitors' query, like 'add_visitor' does, so a visitor
+    is counted once when visits are written at the same time. Pairs known from the cache skip the query.
+    Parameters:
+        - pairs: set of (receiver_id, visitor_id) tuples.
+        - profiles: (profile id, gender) by user id of both sides of the pairs, see 'pull_profiles()'.
+    """
+    pairs = {pair for pair in pairs if not is_known_visitor(*pair)}
+    if not pairs:
+        return
+
+    through = Profile.visitors.through
+    counters: Dict[int, Counter] = defaultdict(Counter)
+    with transaction.atomic():
+        lock_profiles(profiles[receiver_id][0] for receiver_id, _ in pairs)
+        existing = set(
+            through.objects.filter(
+                profile_id__in=[profiles[receiver_id][0] for receiver_id, _ in pairs],
+                user_id__in=[visitor_id for _, visitor_id in pairs],
+            ).values_list("profile_id", "user_id")
+        )
+
+        new_visitors = []
+        for receiver_id, visitor_id in pairs:
+            profile_id = profiles[receiver_id][0]
+            if (profile_id, visitor_id) not in existing:
+                new_visitors.append(through(profile_id=profile_id, user_id=visitor_id))
+                counters[receiver_id][
+                    visitor_counter_field(profiles[visitor_id][1])
+                ] += 1
+        through.objects.bulk_create(new_visitors, ignore_conflicts=True)
+
+        for receiver_id, counter in counters.items():
+            Profile.objects.filter(pk=profiles[receiver_id][0]).update(
+                **{field: F(field) + amount for field, amount in counter.items()}
+            )
+    invalidate_profile_snapshots(counters.keys())
+
+    for pair in pairs:
+        remember_visitor(*pair)
+
+
+class TrackerBuffer:
+    """Queues tracking events in process and flushes them in batches."""
+
+    def __init__(self) -> None:
+        self._actions: List[ActionEvent] = []
+        self._visits: List[VisitEvent] = []
+        self._lock = threading.Lock()
+        self._flusher = PeriodicFlusher(self.flush, lambda: self.flush_interval)
+
+    def __len__(self) -> int:
+        return len(self._actions) + len(self._visits)
+
+    @property
+    def max_size(self) -> int:
+        return get_buffer_settings().get("MAX_SIZE", DEFAULT_MAX_SIZE)
+
+    @property
+    def flush_interval(self) -> float:
+        return get_buffer_settings().get("FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+
+    def add_action(self, *, who_id: int, whom_id: int, action: str) -> None:
+        with self._lock:
+            self._actions.append(ActionEvent(who_id, whom_id, action, timezone.now()))
+        self.on_added()
+
+    def add_visit(self, *, visitor_id: int, receiver_id: int) -> None:
+        with self._lock:
+            self._visits.append(VisitEvent(visitor_id, receiver_id, timezone.now()))
+        self.on_added()
+
+    def on_added(self) -> None:
+        is_full = len(self) >= self.max_size
+        if not self._flusher.start():
+            # background tasks are disabled, so the calling thread flushes a full buffer
+            if is_full:
+                self.flush()
+        elif is_full:
+            self._flusher.wake()
+
+    def flush(self) -> None:
+        """
+        Writes all queued events to the database.
+        Events which couldn't be written are put back in front of the queue and wait for the next flush.
+        """
+        with self._lock:
+            actions, self._actions = self._actions, []
+            visits, self._visits = self._visits, []
+
+        if actions and not write_events(flush_actions, actions):
+            with self._lock:
+                self._actions[:0] = actions
+        if visits and not write_events(flush_visits, visits):
+            with self._lock:
+                self._visits[:0] = visits
+
+
+def write_events(write: Callable[[List], None], events: List) -> bool:
+    """Returns False when the events couldn't be written. The error is logged, so it never reaches a request."""
+    try:
+        write(events)
+    except Exception:
+        logger.exception(
+            "%d tracking events couldn't be written, they wait for the next flush.",
+            len(events),
+        )
+        return False
+    return True
+
+
+tracker_buffer = TrackerBuffer()
+
+# don't lose queued events when the process is stopped
+atexit.register(tracker_buffer.flush)
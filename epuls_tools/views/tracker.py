@@ -1,18 +1,28 @@
+from copy import copy
 from enum import StrEnum, auto
 from functools import wraps
-from typing import Optional
+from typing import Dict, Optional
 
 from django.contrib.auth.models import User
-from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
-from django.db.models import F
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Exists, F, When
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.views import View
 
-from account.models import Profile, Visitor
+from account.cache import (
+    invalidate_profile_snapshots,
+    is_known_visitor,
+    remember_visitor,
+)
+from account.models import Gender, Profile, Visitor, visitor_counter_field
+from action.cache import set_last_action
 from action.models import Action, ActionMessage
 from epuls_tools.expections import TrackerUserNotFoundError
 
+from .buffer import is_buffer_enabled, lock_profiles, tracker_buffer
+
 
 class ActionType(StrEnum):
     def _generate_next_value_(name, start, count, last_values):
@@ -43,40 +53,93 @@ def validate_view_inheritance(method):
     return wrapper
 
 
-def add_visitor(whom: User, login_user: User) -> None:
+def visitor_counters_increment(visitor_id: int) -> Dict[str, Case]:
+    """
+    Returns expressions which increase the gender counter of the visitor.
+    The visitor's gender is taken by a subquery, so the visitor's profile doesn't have to be fetched.
+    """
+    return {
+        visitor_counter_field(gender): Case(
+            When(
+                Exists(Profile.objects.filter(user_id=visitor_id, gender=gender)),
+                then=F(visitor_counter_field(gender)) + 1,
+            ),
+            default=F(visitor_counter_field(gender)),
+        )
+        for gender in Gender.values
+    }
+
+
+def add_visitor(whom: User, login_user: User) -> bool:
     """
-    Updates the visitor count for a gender-specific field in the Profile model.
+    Adds the user to the visitors of the profile and updates the gender counter on the first visit.
+    The unique row of the 'visitors' table decides which visit is the first one, so concurrent first visits
+    are counted once. Returns True when it was the first visit.
 
     Parameters:
         - whom (User): The user whose profile is being visited.
         - login_user (User): The user who is visiting the profile.
     """
-    user_gender = login_user.profile.get_gender_display().lower()
+    profile_id = whom.profile.pk
 
-    try:
-        whom.profile.visitors.add(login_user)
-
-        Profile.objects.filter(pk=whom.pk).update(
-            **{f"{user_gender}_visitor": F(f"{user_gender}_visitor") + 1}
+    with transaction.atomic():
+        # the tracker buffer counts first visits under the same lock
+        lock_profiles([profile_id])
+        try:
+            with transaction.atomic():
+                Profile.visitors.through.objects.create(
+                    profile_id=profile_id, user_id=login_user.pk
+                )
+        except IntegrityError:
+            return False
+
+        Profile.objects.filter(pk=profile_id).update(
+            **visitor_counters_increment(login_user.pk)
         )
-
-    except FieldDoesNotExist as e:
-        raise e
+        # the visitor counters are shown on the profile
+        invalidate_profile_snapshots([whom.pk])
+    return True
 
 
 def create_visitor(whom: User, login_user: User) -> None:
     """
     Creates a visitor who visits the profile of someone and triggers the add_visitor function
+    Repeat visits are recognised by the known visitor cache without a query.
     Parameters:
         - whom (User): The user whose profile is being visited.
         - login_user (User): The user who is visiting the profile.
     """
     Visitor.objects.create(visitor=login_user, receiver=whom)
 
-    # add only first time
-    if not whom.profile.visitors.filter(pk=login_user.pk).exists():
-        # add gender to the counter
-        add_visitor(whom, login_user)
+    if is_known_visitor(whom.pk, login_user.pk):
+        return
+
+    # add gender to the counter only the first time
+    add_visitor(whom, login_user)
+    remember_visitor(whom.pk, login_user.pk)
+
+
+def update_last_action(last_action: Action) -> bool:
+    """
+    Moves the date of the last action to now. Returns False when the action has been deleted or followed
+    by another one in the meantime, so it isn't the last action anymore.
+    """
+    newer_actions = Action.objects.filter(
+        who_id=last_action.who_id, pk__gt=last_action.pk
+    )
+    date = timezone.now()
+    if (
+        not Action.objects.filter(pk=last_action.pk)
+        .filter(~Exists(newer_actions))
+        .update(date=date)
+    ):
+        return False
+
+    # the cached instance is shared by threads, so it's replaced instead of changed
+    updated_action = copy(last_action)
+    updated_action.date = date
+    set_last_action(last_action.who_id, updated_action)
+    return True
 
 
 def create_action(
@@ -86,18 +149,31 @@ def create_action(
     Track user activity and create or update Action models.
     If the last recorded Action from the user is the same as the current activity, only update the date field
     of the last action. Unless the last Action is different or there's no previous action then create new one.
+    The last Action comes from the last action cache, so the common case is a single UPDATE.
+    The cache may be behind other processes, so before a new Action is created the last one is read
+    from the database again.
     """
     # capture action message
     action_message = EpulsTracker.get_action_message(activity, is_current)
 
     last_action = Action.last_user_action(who=login_user)
+    if (
+        last_action
+        and last_action.action == action_message
+        and update_last_action(last_action)
+    ):
+        return
+
+    # the cached action could be stale, e.g. missing an action created by another process
+    last_action = Action.objects.filter(who=login_user).first()
+    if (
+        last_action
+        and last_action.action == action_message
+        and update_last_action(last_action)
+    ):
+        return
 
-    # update Action when Action exists and is the same that last one or create new
-    if last_action and last_action.action == action_message:
-        last_action.date = timezone.now()
-        last_action.save(update_fields=["date"])
-    else:
-        Action.objects.create(who=login_user, whom=whom, action=action_message)
+    Action.objects.create(who=login_user, whom=whom, action=action_message)
 
 
 class EpulsTracker:
@@ -194,6 +270,10 @@ class EpulsTracker:
         login_user: User = self.get_login_user()
         is_current_user = self.check_users()
 
+        if is_buffer_enabled():
+            self.buffered_tracker(whom, login_user, is_current_user)
+            return
+
         create_action(
             login_user=login_user,
             whom=whom,
@@ -204,6 +284,21 @@ class EpulsTracker:
         if not is_current_user:
             create_visitor(whom, login_user)
 
+    def buffered_tracker(
+        self, whom: User, login_user: User, is_current_user: bool
+    ) -> None:
+        """
+        Queues the tracking events in the tracker buffer instead of writing them to the database.
+        """
+        tracker_buffer.add_action(
+            who_id=login_user.pk,
+            whom_id=whom.pk,
+            action=self.get_action_message(self.activity, is_current_user),
+        )
+
+        if not is_current_user:
+            tracker_buffer.add_visit(visitor_id=login_user.pk, receiver_id=whom.pk)
+
     @staticmethod
     def get_action_message(activity: str, is_owner: bool) -> str:
         return (
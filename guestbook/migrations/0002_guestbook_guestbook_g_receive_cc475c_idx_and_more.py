@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("guestbook", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="guestbook",
+            index=models.Index(
+                fields=["receiver", "-created"], name="guestbook_g_receive_cc475c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="guestbook",
+            index=models.Index(
+                fields=["sender", "receiver"], name="guestbook_g_sender__ea00ba_idx"
+            ),
+        ),
+    ]
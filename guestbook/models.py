@@ -20,3 +20,7 @@ class Guestbook(models.Model):
 
     class Meta:
         ordering = ["-created"]
+        indexes = [
+            models.Index(fields=["receiver", "-created"]),
+            models.Index(fields=["sender", "receiver"]),
+        ]
@@ -3,12 +3,13 @@ from functools import partial
 from django.contrib.auth.models import User
 from django.contrib.messages import get_messages
 from django.shortcuts import reverse
-from django.test import tag
+from django.test import override_settings, tag
 from notifications.models import Notification
 
 from account.factories import PASSWORD
 from account.models import Visitor
 from action.models import Action, ActionMessage
+from epuls_tools.jobs import run_pending_jobs
 from epuls_tools.test import SimpleDBTestCase
 from guestbook.factory import GuestbookFactory
 from guestbook.models import Guestbook
@@ -38,7 +39,7 @@ class GuestbookViewTestCase(SimpleDBTestCase):
 
         object_list = response.context.get("object_list")
 
-        self.assertEqual(object_list.count(), 2)
+        self.assertEqual(len(object_list), 2)
 
     def test_when_user_visit_sb_gb_should_not_see_anny_entries(self):
         user = User.objects.last()
@@ -46,7 +47,7 @@ class GuestbookViewTestCase(SimpleDBTestCase):
 
         object_list = response.context.get("object_list")
 
-        self.assertEqual(object_list.count(), 0)
+        self.assertEqual(len(object_list), 0)
 
     def test_user_cannot_add_entry_on_own_gb(self):
         payload = {"entry": "Hello"}
@@ -99,6 +100,7 @@ class GuestbookViewTestCase(SimpleDBTestCase):
         self.assertEqual(visitor.visitor, self.user)
         self.assertEqual(visitor.receiver, user)
 
+    @override_settings(INBOX={"WINDOW": 0})
     def test_should_create_notification(self):
         payload = {"entry": "Hello"}
         user = User.objects.last()
@@ -106,5 +108,6 @@ class GuestbookViewTestCase(SimpleDBTestCase):
             self.url(kwargs={"username": user.username}),
             data=payload,
         )
+        run_pending_jobs()
 
         self.assertEqual(Notification.objects.count(), 1)
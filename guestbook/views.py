@@ -4,6 +4,7 @@ from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
 
+from epuls_tools.pagination import KeysetPaginationMixin
 from epuls_tools.scaler import give_away_puls
 from epuls_tools.views import ActionType, EpulsListView
 from puls.models import PulsType
@@ -12,9 +13,11 @@ from .forms import GuestbookUserForm
 from .models import Guestbook
 
 
-class GuestbookView(LoginRequiredMixin, EpulsListView):
+class GuestbookView(LoginRequiredMixin, KeysetPaginationMixin, EpulsListView):
     template_name = "guestbook/guestbook.html"
     model = Guestbook
+    paginate_by = 10
+    keyset_ordering = ("-created", "-pk")
     extra_context = {"form": GuestbookUserForm}
     activity = ActionType.GUESTBOOK
 
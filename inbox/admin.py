@@ -0,0 +1,6 @@
+from django.contrib import admin
+
+from .models import NotificationEvent, UnreadCounter
+
+admin.site.register(NotificationEvent)
+admin.site.register(UnreadCounter)
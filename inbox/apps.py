@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class InboxConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "inbox"
+
+    def ready(self):
+        import inbox.signals
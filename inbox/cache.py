@@ -0,0 +1,41 @@
+"""
+Cached numbers of unread notifications.
+
+The navbar shows the number on every page, so it's read from the shared cache and the UnreadCounter row is
+the fallback when the entry is missing. When the counter changes, the entry is deleted after the transaction
+is committed and the next read pulls the counter again. The entry isn't changed in place, because 'incr'
+of the file based cache isn't atomic between processes and would let the number drift from the counter.
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import UnreadCounter
+
+UNREAD_COUNT_TIMEOUT = 600
+
+
+def get_unread_count_key(user_id: int) -> str:
+    return f"unread_count:{user_id}"
+
+
+def pull_unread_count(user_id: int) -> int:
+    unread = (
+        UnreadCounter.objects.filter(user_id=user_id)
+        .values_list("unread", flat=True)
+        .first()
+    )
+    return unread or 0
+
+
+def get_unread_count(user_id: int) -> int:
+    unread = cache.get_or_set(
+        get_unread_count_key(user_id),
+        lambda: pull_unread_count(user_id),
+        UNREAD_COUNT_TIMEOUT,
+    )
+    return max(unread, 0)
+
+
+def invalidate_unread_count(user_id: int) -> None:
+    key = get_unread_count_key(user_id)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-18 17:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Index of inbox pages on the table of django-notifications, which can't be changed by its own migrations.
+    """
+
+    dependencies = [
+        ("inbox", "0001_initial"),
+        ("notifications", "0009_alter_notification_options_and_more"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX inbox_notification_page_idx "
+                "ON notifications_notification (recipient_id, timestamp, id)"
+            ),
+            reverse_sql="DROP INDEX inbox_notification_page_idx",
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class NotificationEvent(models.Model):
+    """
+    Event which hasn't been turned into a notification yet. Events of a recipient are collected for
+    ``INBOX["WINDOW"]`` seconds and coalesced, see 'inbox.services'.
+    """
+
+    recipient = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="notification_events"
+    )
+    actor = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    verb = models.CharField(max_length=255)
+    action_object_content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, blank=True, null=True
+    )
+    action_object_id = models.PositiveBigIntegerField(blank=True, null=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["recipient", "id"])]
+
+    def __str__(self):
+        return f"{self.actor_id} {self.verb} ({self.recipient_id})"
+
+
+class UnreadCounter(models.Model):
+    """Denormalized number of unread notifications of the user."""
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    unread = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread}"
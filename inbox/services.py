@@ -0,0 +1,193 @@
+"""
+Notification pipeline.
+
+'notify_user()' only stores a NotificationEvent and schedules 'flush_notifications' for the end of the
+recipient's window of ``INBOX["WINDOW"]`` seconds, so a burst of events is written at once.
+Events with the same verb and action object are coalesced into one notification like
+"anna and 4 others commented your photo". Notifications are inserted with one 'bulk_create'
+and the recipient's UnreadCounter is increased by the number of new notifications.
+
+Notifications are marked as read only by the functions of this module, which decrease the counter,
+so the number of unread notifications is never counted, see 'inbox.cache'.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from notifications.models import Notification
+
+from epuls_tools.jobs import job
+from epuls_tools.pagination import KeysetPage, paginate_by_keyset
+
+from .cache import invalidate_unread_count
+from .models import NotificationEvent, UnreadCounter
+
+DEFAULT_WINDOW = 30
+
+
+def get_window() -> int:
+    return getattr(settings, "INBOX", {}).get("WINDOW", DEFAULT_WINDOW)
+
+
+def notify_user(
+    actor: User,
+    recipient: User,
+    verb: str,
+    action_object: Optional[models.Model] = None,
+) -> NotificationEvent:
+    """Queues the notification. It's written when the recipient's window is over."""
+    event = NotificationEvent(actor=actor, recipient=recipient, verb=verb)
+    if action_object is not None:
+        event.action_object_content_type = ContentType.objects.get_for_model(
+            action_object
+        )
+        event.action_object_id = action_object.pk
+    event.save()
+
+    window = get_window()
+    if not window:
+        flush_notifications.enqueue(recipient_id=recipient.pk)
+        return event
+
+    # every window of the recipient has one flush, which is run when the window is over
+    now = timezone.now()
+    bucket = int(now.timestamp()) // window
+    flush_notifications.enqueue(
+        recipient_id=recipient.pk,
+        run_at=now + timedelta(seconds=window - int(now.timestamp()) % window),
+        idempotency_key=f"flush_notifications:{recipient.pk}:{bucket}",
+    )
+    return event
+
+
+def describe(actors: List[User], verb: str) -> Optional[str]:
+    """Returns the description of coalesced events, e.g. "anna and 4 others commented your photo"."""
+    if len(actors) < 2:
+        return None
+    others = len(actors) - 1
+    return f"{actors[0].username} and {others} {'other' if others == 1 else 'others'} {verb}"
+
+
+def coalesce(events: List[NotificationEvent]) -> List[Notification]:
+    """
+    Returns one notification per verb and action object. The latest actor is the actor of the notification,
+    the others are mentioned in the description and all are listed in 'data'.
+    """
+    groups: Dict[Tuple, List[NotificationEvent]] = defaultdict(list)
+    for event in events:
+        key = (event.verb, event.action_object_content_type_id, event.action_object_id)
+        groups[key].append(event)
+
+    user_type = ContentType.objects.get_for_model(User)
+    notifications = []
+    for (verb, content_type_id, object_id), group in groups.items():
+        latest = group[-1]
+        # distinct actors from the latest one
+        actors = list(
+            {event.actor_id: event.actor for event in reversed(group)}.values()
+        )
+        notifications.append(
+            Notification(
+                recipient_id=latest.recipient_id,
+                actor_content_type=user_type,
+                actor_object_id=latest.actor_id,
+                verb=verb,
+                description=describe(actors, verb),
+                action_object_content_type_id=content_type_id,
+                action_object_object_id=object_id,
+                timestamp=latest.created,
+                data={
+                    "actor_ids": [actor.pk for actor in actors],
+                    "events": len(group),
+                },
+            )
+        )
+    return sorted(notifications, key=lambda notification: notification.timestamp)
+
+
+def increase_unread(user_id: int, amount: int) -> None:
+    invalidate_unread_count(user_id)
+    counter = UnreadCounter.objects.filter(user_id=user_id)
+    if counter.update(unread=F("unread") + amount):
+        return
+    try:
+        with transaction.atomic():
+            UnreadCounter.objects.create(user_id=user_id, unread=amount)
+    except IntegrityError:
+        # created by another worker in the meantime
+        counter.update(unread=F("unread") + amount)
+
+
+def decrease_unread(user_id: int, amount: int) -> None:
+    if not amount:
+        return
+    invalidate_unread_count(user_id)
+    UnreadCounter.objects.filter(user_id=user_id).update(
+        unread=Greatest(F("unread") - amount, 0)
+    )
+
+
+@job(queue="notifications")
+def flush_notifications(recipient_id: int) -> int:
+    """Writes the collected events of the recipient. Returns the number of new notifications."""
+    with transaction.atomic():
+        events = list(
+            NotificationEvent.objects.select_for_update(of=("self",))
+            .select_related("actor")
+            .filter(recipient_id=recipient_id)
+            .order_by("pk")
+        )
+        if not events:
+            return 0
+
+        notifications = Notification.objects.bulk_create(coalesce(events))
+        NotificationEvent.objects.filter(pk__in=[event.pk for event in events]).delete()
+        increase_unread(recipient_id, len(notifications))
+
+    return len(notifications)
+
+
+# Reading the inbox
+
+
+def mark_as_read(user: User, notification_id: int) -> bool:
+    """Marks the user's notification as read. Returns False when it has been read already."""
+    with transaction.atomic():
+        marked = Notification.objects.filter(
+            pk=notification_id, recipient=user, unread=True
+        ).update(unread=False)
+        decrease_unread(user.pk, marked)
+    return bool(marked)
+
+
+def mark_all_as_read(user: User) -> int:
+    """Marks all notifications of the user as read. Returns how many were unread."""
+    with transaction.atomic():
+        marked = Notification.objects.filter(recipient=user, unread=True).update(
+            unread=False
+        )
+        decrease_unread(user.pk, marked)
+    return marked
+
+
+INBOX_ORDERING = ("-timestamp", "-pk")
+
+
+def get_inbox_page(
+    user: User, cursor: Optional[str] = None, per_page: int = 20
+) -> KeysetPage:
+    """
+    Returns the user's notifications which are older than the cursor. Every page is a range scan
+    of the index on (recipient, timestamp, id) however deep it is.
+    """
+    notifications = Notification.objects.filter(recipient=user).prefetch_related(
+        "actor"
+    )
+    return paginate_by_keyset(notifications, INBOX_ORDERING, cursor, per_page)
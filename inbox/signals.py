@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from notifications.models import Notification
+
+from .services import decrease_unread
+
+
+@receiver(post_delete, sender=Notification)
+def forget_deleted_notification(sender, instance, **kwargs):
+    if instance.unread:
+        decrease_unread(instance.recipient_id, 1)
@@ -0,0 +1,13 @@
+from django import template
+
+from inbox.cache import get_unread_count
+
+register = template.Library()
+
+
+@register.simple_tag
+def unread_count(user) -> int:
+    """Returns the cached number of the user's unread notifications."""
+    if not user.is_authenticated:
+        return 0
+    return get_unread_count(user.pk)
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest import mock
+
+from django.test import TestCase, override_settings, tag
+from notifications.models import Notification
+
+from account.factories import UserFactory
+from epuls_tools.jobs import run_pending_jobs
+from epuls_tools.models import Job
+from inbox.models import NotificationEvent, UnreadCounter
+from inbox.services import flush_notifications, notify_user
+
+
+@tag("in_services")
+@override_settings(INBOX={"WINDOW": 0})
+class NotifyUserTestCase(TestCase):
+    def setUp(self):
+        self.recipient = UserFactory()
+        self.actors = UserFactory.create_batch(3)
+        self.action_object = UserFactory()
+
+    def test_should_write_notification_when_job_is_run(self):
+        notify_user(self.actors[0], self.recipient, "verb", self.action_object)
+        self.assertFalse(Notification.objects.exists())
+
+        run_pending_jobs()
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.recipient, self.recipient)
+        self.assertEqual(notification.actor, self.actors[0])
+        self.assertEqual(notification.action_object, self.action_object)
+        self.assertIsNone(notification.description)
+        self.assertFalse(NotificationEvent.objects.exists())
+
+    def test_should_coalesce_events_of_the_same_object(self):
+        for actor in self.actors:
+            notify_user(actor, self.recipient, "commented", self.action_object)
+        notify_user(self.actors[0], self.recipient, "commented", self.action_object)
+
+        run_pending_jobs()
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.actor, self.actors[0])
+        self.assertEqual(
+            notification.description,
+            f"{self.actors[0].username} and 2 others commented",
+        )
+        self.assertEqual(notification.data["events"], 4)
+
+    def test_should_not_coalesce_events_of_different_objects(self):
+        notify_user(self.actors[0], self.recipient, "verb", self.action_object)
+        notify_user(self.actors[0], self.recipient, "verb", self.recipient)
+        notify_user(self.actors[0], self.recipient, "other verb", self.action_object)
+
+        run_pending_jobs()
+
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_should_write_notifications_with_one_insert(self):
+        notify_user(self.actors[0], self.recipient, "verb", self.action_object)
+        notify_user(self.actors[0], self.recipient, "verb", self.recipient)
+
+        with mock.patch.object(
+            Notification.objects, "bulk_create", wraps=Notification.objects.bulk_create
+        ) as bulk_create:
+            self.assertEqual(flush_notifications(recipient_id=self.recipient.pk), 2)
+
+        bulk_create.assert_called_once()
+
+    def test_should_increase_unread_counter(self):
+        notify_user(self.actors[0], self.recipient, "verb", self.action_object)
+        run_pending_jobs()
+        notify_user(self.actors[0], self.recipient, "verb", self.recipient)
+        notify_user(self.actors[1], self.recipient, "verb", self.recipient)
+        run_pending_jobs()
+
+        self.assertEqual(UnreadCounter.objects.get(user=self.recipient).unread, 2)
+
+
+@tag("in_services")
+@override_settings(INBOX={"WINDOW": 60})
+class NotificationWindowTestCase(TestCase):
+    def setUp(self):
+        self.recipient = UserFactory()
+        self.actor = UserFactory()
+
+    def test_should_schedule_one_flush_per_window(self):
+        now = datetime(2024, 1, 1, 12, 0, 10, tzinfo=dt_timezone.utc)
+        with mock.patch("inbox.services.timezone.now", return_value=now):
+            for _ in range(3):
+                notify_user(self.actor, self.recipient, "verb")
+
+        flush = Job.objects.get()
+        self.assertEqual(flush.run_at, now + timedelta(seconds=50))
+
+    def test_should_not_write_notifications_before_window_is_over(self):
+        notify_user(self.actor, self.recipient, "verb")
+
+        self.assertEqual(run_pending_jobs(), 0)
+        self.assertEqual(NotificationEvent.objects.count(), 1)
+
+    def test_should_schedule_flush_per_recipient(self):
+        notify_user(self.actor, self.recipient, "verb")
+        notify_user(self.recipient, self.actor, "verb")
+
+        self.assertEqual(Job.objects.count(), 2)
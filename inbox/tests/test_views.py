@@ -0,0 +1,176 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings, tag
+from django.urls import reverse
+from django.utils import timezone
+from notifications.models import Notification
+
+from account.factories import UserFactory
+from epuls_tools.jobs import run_pending_jobs
+from epuls_tools.test import AppQueriesMixin
+from inbox.cache import get_unread_count, get_unread_count_key
+from inbox.models import UnreadCounter
+from inbox.services import notify_user
+
+
+def create_notifications(recipient: User, amount: int) -> list:
+    """Creates read notifications with the same timestamp, so pages are decided by ids."""
+    actor = UserFactory()
+    timestamp = timezone.now() - timedelta(days=1)
+    return Notification.objects.bulk_create(
+        Notification(
+            recipient=recipient,
+            actor=actor,
+            verb=f"verb {number}",
+            timestamp=timestamp,
+            unread=False,
+        )
+        for number in range(amount)
+    )
+
+
+@tag("in_views")
+@override_settings(INBOX={"WINDOW": 0})
+class UnreadCountTestCase(AppQueriesMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.actors = UserFactory.create_batch(2)
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def notify(self, actor: User, action_object) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_user(actor, self.user, "verb", action_object)
+            run_pending_jobs()
+
+    def test_should_count_new_notifications(self):
+        self.assertEqual(get_unread_count(self.user.pk), 0)
+
+        self.notify(self.actors[0], self.actors[0])
+        self.notify(self.actors[1], self.actors[1])
+
+        self.assertEqual(get_unread_count(self.user.pk), 2)
+        self.assertEqual(UnreadCounter.objects.get(user=self.user).unread, 2)
+
+    def test_should_read_count_from_cache(self):
+        self.notify(self.actors[0], self.actors[0])
+        get_unread_count(self.user.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.user.pk), 1)
+
+    def test_should_pull_count_from_counter_when_it_is_not_cached(self):
+        self.notify(self.actors[0], self.actors[0])
+        cache.clear()
+
+        self.assertEqual(get_unread_count(self.user.pk), 1)
+
+    def test_should_pull_count_from_counter_after_it_is_changed(self):
+        # a drifted entry isn't adjusted but replaced with the counter
+        cache.set(get_unread_count_key(self.user.pk), 10)
+
+        self.notify(self.actors[0], self.actors[0])
+
+        self.assertEqual(get_unread_count(self.user.pk), 1)
+
+    def test_should_decrease_count_when_notification_is_read(self):
+        self.notify(self.actors[0], self.actors[0])
+        self.notify(self.actors[1], self.actors[1])
+        notification = Notification.objects.first()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("inbox:mark-as-read", args=[notification.pk]))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("inbox:mark-as-read", args=[notification.pk]))
+
+        self.assertEqual(get_unread_count(self.user.pk), 1)
+        self.assertEqual(UnreadCounter.objects.get(user=self.user).unread, 1)
+
+    def test_should_not_mark_notification_of_another_user(self):
+        self.notify(self.actors[0], self.actors[0])
+        self.client.force_login(self.actors[0])
+
+        self.client.post(
+            reverse("inbox:mark-as-read", args=[Notification.objects.get().pk])
+        )
+
+        self.assertTrue(Notification.objects.get().unread)
+
+    def test_should_reset_count_when_all_notifications_are_read(self):
+        self.notify(self.actors[0], self.actors[0])
+        self.notify(self.actors[1], self.actors[1])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("inbox:mark-all-as-read"))
+
+        self.assertEqual(get_unread_count(self.user.pk), 0)
+        self.assertFalse(Notification.objects.filter(unread=True).exists())
+
+    def test_should_decrease_count_when_unread_notification_is_deleted(self):
+        self.notify(self.actors[0], self.actors[0])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.get().delete()
+
+        self.assertEqual(get_unread_count(self.user.pk), 0)
+
+    def test_api_should_return_unread_count(self):
+        self.notify(self.actors[0], self.actors[0])
+
+        response = self.client.get(reverse("inbox:unread-count-api"))
+
+        self.assertEqual(response.json(), {"unread_count": 1})
+
+
+@tag("in_views")
+@override_settings(INBOX={"WINDOW": 0})
+class InboxViewTestCase(TestCase):
+    url = reverse("inbox:notifications")
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_login(self.user)
+
+    def test_should_list_only_notifications_of_user(self):
+        create_notifications(self.user, 2)
+        create_notifications(UserFactory(), 1)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(len(response.context["notifications"]), 2)
+        self.assertIsNone(response.context["next_cursor"])
+
+    def test_should_paginate_notifications_with_cursor(self):
+        notifications = create_notifications(self.user, 25)
+
+        first_page = self.client.get(self.url)
+        second_page = self.client.get(
+            self.url, {"cursor": first_page.context["next_cursor"]}
+        )
+
+        self.assertEqual(first_page.context["notifications"], notifications[:-21:-1])
+        self.assertEqual(second_page.context["notifications"], notifications[4::-1])
+        self.assertIsNone(second_page.context["next_cursor"])
+
+    def test_should_not_shift_pages_when_notification_is_added(self):
+        create_notifications(self.user, 25)
+        first_page = self.client.get(self.url)
+        last = first_page.context["notifications"][-1]
+
+        notify_user(UserFactory(), self.user, "verb")
+        run_pending_jobs()
+        second_page = self.client.get(
+            self.url, {"cursor": first_page.context["next_cursor"]}
+        )
+
+        self.assertLess(second_page.context["notifications"][0].pk, last.pk)
+
+    def test_should_reject_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "invalid"})
+
+        self.assertEqual(response.status_code, 400)
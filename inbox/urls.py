@@ -0,0 +1,17 @@
+from django.urls import path
+
+from .views import (
+    InboxView,
+    mark_all_notifications_as_read,
+    mark_notification_as_read,
+    unread_count_api,
+)
+
+app_name = "inbox"
+
+urlpatterns = [
+    path("", InboxView.as_view(), name="notifications"),
+    path("<int:pk>/read/", mark_notification_as_read, name="mark-as-read"),
+    path("read/", mark_all_notifications_as_read, name="mark-all-as-read"),
+    path("api/unread/", unread_count_api, name="unread-count-api"),
+]
@@ -0,0 +1,45 @@
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import HttpResponseRedirect, JsonResponse
+from django.shortcuts import redirect
+from django.views.decorators.http import require_POST
+from django.views.generic import TemplateView
+
+from .cache import get_unread_count
+from .services import get_inbox_page, mark_all_as_read, mark_as_read
+
+
+class InboxView(LoginRequiredMixin, TemplateView):
+    """Notifications of the user from the newest. Pages are selected by the 'cursor' parameter."""
+
+    template_name = "inbox/inbox.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = get_inbox_page(self.request.user, cursor=self.request.GET.get("cursor"))
+        page.query = self.request.GET
+        context.update(
+            page_obj=page,
+            notifications=page.object_list,
+            next_cursor=page.next_cursor,
+        )
+        return context
+
+
+@login_required
+@require_POST
+def mark_notification_as_read(request, pk: int) -> HttpResponseRedirect:
+    mark_as_read(request.user, pk)
+    return redirect("inbox:notifications")
+
+
+@login_required
+@require_POST
+def mark_all_notifications_as_read(request) -> HttpResponseRedirect:
+    mark_all_as_read(request.user)
+    return redirect("inbox:notifications")
+
+
+@login_required
+def unread_count_api(request) -> JsonResponse:
+    return JsonResponse({"unread_count": get_unread_count(request.user.pk)})
@@ -32,8 +32,15 @@ class LikePhotoComment(AbstractLike):
         )
 
 
-# class LikePhoto(AbstractLike):
-#     photo = models.ForeignKey('photo.Picture', on_delete=models.CASCADE, related_name='likes')
-#
-#     def __str__(self):
-#         return f"{self.user.username} liked photo {self.photo.id} at {self.timestamp}"
+class LikePicture(AbstractLike):
+    picture = models.ForeignKey(
+        "photo.Picture", on_delete=models.CASCADE, related_name="likes"
+    )
+
+    class Meta:
+        unique_together = ["picture", "user"]
+
+    def __str__(self):
+        return (
+            f"{self.user.username} liked picture {self.picture.id} at {self.timestamp}"
+        )
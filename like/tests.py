@@ -1,3 +1,60 @@
-from django.test import TestCase
+import os
 
-# Create your tests here.
+from django.test import TestCase, tag
+from django.urls import reverse
+
+from account.factories import UserFactory
+from like.models import LikePicture
+from photo.factories import GalleryFactory, PictureFactory
+from photo.models import GalleryStats, PictureStats
+
+
+@tag("lk_views")
+class LikePictureTestCase(TestCase):
+    def setUp(self):
+        profile = UserFactory().profile
+        self.picture = PictureFactory(
+            profile=profile, gallery=GalleryFactory(profile=profile)
+        )
+        self.url = reverse("like:like-picture", args=[self.picture.pk])
+        self.client.force_login(UserFactory())
+
+    def tearDown(self):
+        if os.path.exists(self.picture.picture.path):
+            os.remove(self.picture.picture.path)
+
+    def get_likes(self) -> int:
+        return PictureStats.objects.get(picture=self.picture).amt_likes
+
+    def test_should_count_like(self):
+        response = self.client.post(self.url)
+
+        self.assertRedirects(
+            response, self.picture.get_absolute_url(), fetch_redirect_response=False
+        )
+        self.assertEqual(self.get_likes(), 1)
+        self.assertEqual(
+            GalleryStats.objects.get(gallery=self.picture.gallery).amt_likes, 1
+        )
+
+    def test_should_take_like_back(self):
+        self.client.post(self.url)
+        self.client.post(self.url)
+
+        self.assertEqual(self.get_likes(), 0)
+        self.assertFalse(LikePicture.objects.get().active)
+
+        self.client.post(self.url)
+
+        self.assertEqual(self.get_likes(), 1)
+
+    def test_should_not_like_with_get(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(self.get_likes(), 0)
+
+    def test_should_return_404_for_unknown_picture(self):
+        response = self.client.post(reverse("like:like-picture", args=[0]))
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import like_picture
+
+app_name = "like"
+
+urlpatterns = [
+    path("picture/<int:pk>/", like_picture, name="like-picture"),
+]
@@ -1,3 +1,29 @@
-from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseRedirect
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_POST
 
-# Create your views here.
+from photo.counters import count_picture_stat
+from photo.models import Picture
+
+from .models import LikePicture
+
+
+@login_required
+@require_POST
+def like_picture(request, pk: int) -> HttpResponseRedirect:
+    """Likes the picture or takes the like back when the user has already liked it."""
+    picture = get_object_or_404(Picture, pk=pk)
+    like, created = LikePicture.objects.get_or_create(
+        picture=picture, user=request.user
+    )
+
+    if created:
+        count_picture_stat(picture, "amt_likes")
+    # the condition on 'active' makes a double-submitted form count once
+    elif LikePicture.objects.filter(pk=like.pk, active=like.active).update(
+        active=not like.active
+    ):
+        count_picture_stat(picture, "amt_likes", -1 if like.active else 1)
+
+    return HttpResponseRedirect(picture.get_absolute_url())
@@ -0,0 +1,145 @@
+"""
+Write-behind buffer of picture and gallery statistics.
+
+Views, likes and comments are summed in process and written with one UPDATE per stats row by a background
+thread every ``STATS_BUFFER["FLUSH_INTERVAL"]`` seconds or as soon as ``MAX_SIZE`` rows are waiting,
+so requests never write statistics. Leaderboards are refreshed by the same flush, once for all changed rows.
+'popularity' and the boards lag behind by at most the flush interval.
+When the buffer is disabled, every increment is written at once.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+
+from epuls_tools.background import PeriodicFlusher
+
+from .leaderboard import refresh_leaderboard
+from .models import GalleryStats, Picture, PictureStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 10
+
+STATS_FIELDS = ("amt_comments", "amt_likes", "total_views")
+
+# stats model: field which refers to the object of statistics
+STATS_LOOKUPS = {PictureStats: "picture_id", GalleryStats: "gallery_id"}
+
+
+def get_stats_settings() -> dict:
+    return getattr(settings, "STATS_BUFFER", {})
+
+
+class StatsBuffer:
+    """Sums increments of statistics in process and flushes them in batches."""
+
+    def __init__(self) -> None:
+        self._increments: Counter = Counter()
+        self._lock = threading.Lock()
+        self._flusher = PeriodicFlusher(self.flush, lambda: self.flush_interval)
+
+    def __len__(self) -> int:
+        return len({key[:2] for key in self._increments})
+
+    @property
+    def is_enabled(self) -> bool:
+        return bool(get_stats_settings().get("ENABLED", True))
+
+    @property
+    def max_size(self) -> int:
+        return get_stats_settings().get("MAX_SIZE", DEFAULT_MAX_SIZE)
+
+    @property
+    def flush_interval(self) -> float:
+        return get_stats_settings().get("FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+
+    def add(
+        self, model: type[models.Model], object_id: int, field: str, amount: int = 1
+    ) -> None:
+        if field not in STATS_FIELDS:
+            raise ValueError(f"Field must be one of {STATS_FIELDS}, not '{field}'.")
+
+        with self._lock:
+            self._increments[(model, object_id, field)] += amount
+            is_full = len(self) >= self.max_size
+
+        if not self.is_enabled:
+            self.flush()
+        elif not self._flusher.start():
+            # background tasks are disabled, so the calling thread flushes a full buffer
+            if is_full:
+                self.flush()
+        elif is_full:
+            self._flusher.wake()
+
+    def flush(self) -> None:
+        """
+        Writes all summed increments to the database.
+        When writing fails, the increments are put back, so they are written by the next flush.
+        """
+        with self._lock:
+            increments, self._increments = self._increments, Counter()
+
+        rows: Dict[Tuple, Dict[str, int]] = defaultdict(dict)
+        for (model, object_id, field), amount in increments.items():
+            if amount:
+                rows[(model, object_id)][field] = amount
+
+        if not rows:
+            return
+        try:
+            write_increments(rows)
+        except Exception:
+            logger.exception(
+                "Statistics couldn't be written, they wait for the next flush."
+            )
+            with self._lock:
+                self._increments.update(increments)
+            return
+
+        try:
+            refresh_leaderboards(rows)
+        except Exception:
+            logger.exception("Leaderboards couldn't be refreshed.")
+
+
+def write_increments(rows: Dict[Tuple, Dict[str, int]]) -> None:
+    """
+    Adds increments to stats rows with one UPDATE per row.
+    Rows are updated in the same order in every process, so concurrent flushes don't deadlock.
+    """
+    ordered = sorted(rows.items(), key=lambda row: (row[0][0].__name__, row[0][1]))
+    with transaction.atomic():
+        for (model, object_id), fields in ordered:
+            model.objects.filter(**{STATS_LOOKUPS[model]: object_id}).update(
+                **{field: F(field) + amount for field, amount in fields.items()}
+            )
+
+
+def refresh_leaderboards(rows: Iterable[Tuple]) -> None:
+    """Refreshes boards once for all changed (stats model, object id) rows."""
+    changed = defaultdict(set)
+    for model, object_id in rows:
+        changed[model].add(object_id)
+
+    for model, object_ids in changed.items():
+        refresh_leaderboard(model, object_ids)
+
+
+stats_buffer = StatsBuffer()
+
+# don't lose summed increments when the process is stopped
+atexit.register(stats_buffer.flush)
+
+
+def count_picture_stat(picture: Picture, field: str, amount: int = 1) -> None:
+    """Increases the statistic of the picture and its gallery."""
+    stats_buffer.add(PictureStats, picture.pk, field, amount)
+    stats_buffer.add(GalleryStats, picture.gallery_id, field, amount)
@@ -0,0 +1,119 @@
+"""
+Processing of uploaded images, run by the job queue.
+
+Pictures get resized renditions in WebP and JPEG, their dimensions and a tiny blurred placeholder (LQIP)
+which templates show until the rendition is loaded. Profile picture requests are shrunk to the profile picture size.
+"""
+import base64
+import os
+from io import BytesIO
+from typing import Dict, List
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageFilter, ImageOps
+
+from epuls_tools.jobs import job
+
+from .models import Picture, ProfilePictureRequest, Rendition
+
+# name: the longer side in pixels
+RENDITION_SIZES: Dict[str, int] = {"small": 160, "medium": 480, "large": 1024}
+RENDITION_FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+RENDITION_QUALITY = 80
+
+PLACEHOLDER_SIZE = 16
+PROFILE_PICTURE_SIZE = (300, 300)
+
+
+def make_placeholder(image: Image.Image) -> str:
+    """Returns a blurred, tiny JPEG of the image as data URI."""
+    placeholder = image.convert("RGB")
+    placeholder.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    placeholder = placeholder.filter(ImageFilter.GaussianBlur(1))
+
+    buffer = BytesIO()
+    placeholder.save(buffer, format="JPEG", quality=50)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def make_renditions(picture: Picture, image: Image.Image) -> List[Rendition]:
+    """
+    Returns not saved renditions of the image. Sizes bigger than the original are skipped,
+    except the smallest one, so every picture has at least one rendition of each format.
+    """
+    renditions = []
+    for index, (name, size) in enumerate(RENDITION_SIZES.items()):
+        if index and size > max(image.size):
+            break
+
+        resized = image.convert("RGB")
+        resized.thumbnail((size, size))
+
+        for extension, image_format in RENDITION_FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, format=image_format, quality=RENDITION_QUALITY)
+            renditions.append(
+                Rendition(
+                    picture=picture,
+                    name=name,
+                    format=extension,
+                    file=ContentFile(
+                        buffer.getvalue(), name=f"{picture.pk}-{name}.{extension}"
+                    ),
+                )
+            )
+
+    return renditions
+
+
+@job(queue="images")
+def process_picture(picture_id: int) -> None:
+    """Creates renditions, placeholder and records dimensions of the picture."""
+    picture = Picture.objects.filter(pk=picture_id).first()
+    if not picture:
+        return
+
+    with Image.open(picture.picture.path) as image:
+        image = ImageOps.exif_transpose(image)
+        width, height = image.size
+        placeholder = make_placeholder(image)
+        renditions = make_renditions(picture, image)
+
+    with transaction.atomic():
+        for rendition in picture.renditions.all():
+            rendition.delete()
+        for rendition in renditions:
+            rendition.save()
+
+        # update() doesn't send signals, so the picture isn't processed again
+        Picture.objects.filter(pk=picture_id).update(
+            width=width, height=height, placeholder=placeholder
+        )
+
+
+@job(queue="images")
+def shrink_profile_picture(request_id: int) -> None:
+    """Shrinks the requested profile picture to the size of profile pictures."""
+    request = ProfilePictureRequest.objects.filter(pk=request_id).first()
+    if not request:
+        return
+
+    with Image.open(request.picture.path) as image:
+        if image.height <= 300 and image.width <= 300:
+            return
+        image_format = image.format
+        image.thumbnail(PROFILE_PICTURE_SIZE)
+        buffer = BytesIO()
+        image.save(buffer, format=image_format)
+
+    # the file can be shared with other uploads, so the shrunk picture is saved as a new file
+    old_name = request.picture.name
+    request.picture.save(
+        os.path.basename(old_name), ContentFile(buffer.getvalue()), save=False
+    )
+    with transaction.atomic():
+        ProfilePictureRequest.objects.filter(pk=request_id).update(
+            picture=request.picture.name
+        )
+        request.picture.storage.delete(old_name)
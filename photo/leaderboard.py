@@ -0,0 +1,271 @@
+"""
+Leaderboards of the most popular pictures and galleries.
+
+Every board keeps at most ``LEADERBOARD_SIZE`` LeaderboardEntry rows per scope: the whole site, a voivodeship
+or a gender of the owner. Boards are refreshed incrementally for stats rows which were changed, so reading
+a page is a range scan of the board index instead of sorting all stats rows. Objects without any views,
+comments or likes aren't ranked.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import BadRequest
+from django.db import models, transaction
+from localflavor.pl.pl_voivodeships import VOIVODESHIP_CHOICES
+
+from account.models import Gender
+from epuls_tools.pagination import paginate_by_keyset
+
+from .models import Gallery, GalleryStats, LeaderboardEntry, Picture, PictureStats
+
+DEFAULT_SIZE = 100
+
+GLOBAL_SCOPE = "all"
+# object_id is unique in a board, so it completes the keyset of the board index
+BOARD_ORDERING = ("-popularity", "-object_id")
+VOIVODESHIPS = [voivodeship for voivodeship, _ in VOIVODESHIP_CHOICES]
+
+
+class Board(NamedTuple):
+    kind: str
+    # field of the stats model which refers to the ranked object
+    lookup: str
+    # path from the stats model to the profile of the owner
+    owner: str
+
+
+BOARDS = {
+    PictureStats: Board(
+        LeaderboardEntry.Kind.PICTURE, "picture_id", "picture__gallery__profile"
+    ),
+    GalleryStats: Board(
+        LeaderboardEntry.Kind.GALLERY, "gallery_id", "gallery__profile"
+    ),
+}
+
+STATS_MODELS = {board.kind: model for model, board in BOARDS.items()}
+
+
+def get_leaderboard_size() -> int:
+    return getattr(settings, "LEADERBOARD_SIZE", DEFAULT_SIZE)
+
+
+def get_scope(voivodeship: Optional[str] = None, gender: Optional[str] = None) -> str:
+    if voivodeship and gender:
+        raise ValueError(
+            "Board can be narrowed to a voivodeship or a gender, not both."
+        )
+    if voivodeship:
+        return f"voivodeship:{voivodeship}"
+    if gender:
+        return f"gender:{gender}"
+    return GLOBAL_SCOPE
+
+
+def get_all_scopes() -> List[str]:
+    return [
+        GLOBAL_SCOPE,
+        *(get_scope(gender=gender) for gender in Gender.values),
+        *(get_scope(voivodeship=voivodeship) for voivodeship in VOIVODESHIPS),
+    ]
+
+
+def get_scope_filter(owner: str, scope: str) -> Dict[str, str]:
+    if scope == GLOBAL_SCOPE:
+        return {}
+    field, value = scope.split(":", 1)
+    return {f"{owner}__{field}": value}
+
+
+def pull_candidates(stats_model: type[models.Model], **filters) -> Dict[str, Dict]:
+    """Returns the popularity of ranked objects in every scope they belong to."""
+    board = BOARDS[stats_model]
+    rows = stats_model.objects.filter(popularity__gt=0, **filters).values_list(
+        board.lookup,
+        "popularity",
+        f"{board.owner}__voivodeship",
+        f"{board.owner}__gender",
+    )
+
+    candidates: Dict[str, Dict[int, int]] = defaultdict(dict)
+    for object_id, popularity, voivodeship, gender in rows:
+        scopes = [GLOBAL_SCOPE, get_scope(gender=gender)]
+        if voivodeship:
+            scopes.append(get_scope(voivodeship=voivodeship))
+        for scope in scopes:
+            candidates[scope][object_id] = popularity
+    return candidates
+
+
+def pull_last_key(kind: str, scope: str) -> Optional[Tuple[int, int]]:
+    """Returns (popularity, object_id) of the last entry of a full board or None when the board isn't full."""
+    size = get_leaderboard_size()
+    return (
+        LeaderboardEntry.objects.filter(kind=kind, scope=scope)
+        .values_list("popularity", "object_id")[size - 1 : size]
+        .first()
+    )
+
+
+def trim_leaderboard(kind: str, scope: str) -> None:
+    entries = LeaderboardEntry.objects.filter(kind=kind, scope=scope)
+    overflow = entries.values_list("pk", flat=True)[get_leaderboard_size() :]
+    LeaderboardEntry.objects.filter(pk__in=list(overflow)).delete()
+
+
+def rebuild_leaderboard(stats_model: type[models.Model], scope: str) -> None:
+    """Fills a board from scratch. Ranked objects are read in the order of the stats popularity index."""
+    board = BOARDS[stats_model]
+    rows = (
+        stats_model.objects.filter(
+            popularity__gt=0, **get_scope_filter(board.owner, scope)
+        )
+        .order_by("-popularity", f"-{board.lookup}")
+        .values_list(board.lookup, "popularity")[: get_leaderboard_size()]
+    )
+
+    with transaction.atomic():
+        LeaderboardEntry.objects.filter(kind=board.kind, scope=scope).delete()
+        LeaderboardEntry.objects.bulk_create(
+            LeaderboardEntry(
+                kind=board.kind, scope=scope, object_id=object_id, popularity=popularity
+            )
+            for object_id, popularity in rows
+        )
+
+
+def rebuild_leaderboards() -> None:
+    for stats_model in BOARDS:
+        for scope in get_all_scopes():
+            rebuild_leaderboard(stats_model, scope)
+
+
+def refresh_leaderboard(
+    stats_model: type[models.Model], object_ids: Iterable[int]
+) -> None:
+    """
+    Updates boards with the current popularity of the given objects.
+    An object gets into a full board only when it beats the last entry. When an entry of a full board
+    drops below the last entry or leaves the scope, an object outside the board may take its place,
+    so such a board is rebuilt.
+    """
+    board = BOARDS[stats_model]
+    object_ids = set(object_ids)
+    if not object_ids:
+        return
+
+    candidates = pull_candidates(stats_model, **{f"{board.lookup}__in": object_ids})
+    existing: Dict[str, List[LeaderboardEntry]] = defaultdict(list)
+    for entry in LeaderboardEntry.objects.filter(
+        kind=board.kind, object_id__in=object_ids
+    ):
+        existing[entry.scope].append(entry)
+
+    to_update, to_create, to_delete, to_rebuild = [], [], [], set()
+    for scope in candidates.keys() | existing.keys():
+        last_key = pull_last_key(board.kind, scope)
+        scope_candidates = dict(candidates.get(scope, {}))
+
+        for entry in existing.get(scope, []):
+            popularity = scope_candidates.pop(entry.object_id, None)
+            if popularity is None:
+                to_delete.append(entry.pk)
+            elif popularity != entry.popularity:
+                entry.popularity = popularity
+                to_update.append(entry)
+
+            if last_key and (
+                popularity is None or (popularity, entry.object_id) < last_key
+            ):
+                to_rebuild.add(scope)
+
+        to_create.extend(
+            LeaderboardEntry(
+                kind=board.kind, scope=scope, object_id=object_id, popularity=popularity
+            )
+            for object_id, popularity in scope_candidates.items()
+            if not last_key or (popularity, object_id) > last_key
+        )
+
+    with transaction.atomic():
+        LeaderboardEntry.objects.filter(pk__in=to_delete).delete()
+        LeaderboardEntry.objects.bulk_update(to_update, ["popularity"])
+        LeaderboardEntry.objects.bulk_create(to_create)
+
+        for scope in {entry.scope for entry in to_create} - to_rebuild:
+            trim_leaderboard(board.kind, scope)
+        for scope in to_rebuild:
+            rebuild_leaderboard(stats_model, scope)
+
+
+def refresh_profile_leaderboards(profile_id: int) -> None:
+    """Moves pictures and galleries of the profile to the boards of its current voivodeship and gender."""
+    for stats_model, board in BOARDS.items():
+        object_ids = stats_model.objects.filter(**{board.owner: profile_id})
+        refresh_leaderboard(
+            stats_model, object_ids.values_list(board.lookup, flat=True)
+        )
+
+
+def remove_from_leaderboards(kind: str, object_id: int) -> None:
+    """Removes a deleted object. Full boards are rebuilt, so the next object takes the free place."""
+    entries = LeaderboardEntry.objects.filter(kind=kind, object_id=object_id)
+    scopes = list(entries.values_list("scope", flat=True))
+    if not scopes:
+        return
+
+    full_scopes = [scope for scope in scopes if pull_last_key(kind, scope)]
+    entries.delete()
+    for scope in full_scopes:
+        rebuild_leaderboard(STATS_MODELS[kind], scope)
+
+
+# Reading boards
+
+
+def get_scope_from_query(query) -> str:
+    """Returns the scope selected by the 'voivodeship' or 'gender' parameter of the query string."""
+    voivodeship, gender = query.get("voivodeship"), query.get("gender")
+    if voivodeship and voivodeship not in VOIVODESHIPS:
+        raise BadRequest(f"Unknown voivodeship '{voivodeship}'.")
+    if gender and gender not in Gender.values:
+        raise BadRequest(f"Unknown gender '{gender}'.")
+
+    try:
+        return get_scope(voivodeship=voivodeship, gender=gender)
+    except ValueError as error:
+        raise BadRequest(str(error))
+
+
+def attach_objects(
+    kind: str, entries: List[LeaderboardEntry]
+) -> List[LeaderboardEntry]:
+    """Sets 'object' of entries with one query. Entries of objects which don't exist anymore are skipped."""
+    if kind == LeaderboardEntry.Kind.PICTURE:
+        queryset = Picture.objects.select_related(
+            "gallery__profile__user"
+        ).prefetch_related("renditions")
+    else:
+        queryset = Gallery.objects.select_related("profile__user")
+
+    objects = queryset.in_bulk([entry.object_id for entry in entries])
+    for entry in entries:
+        entry.object = objects.get(entry.object_id)
+    return [entry for entry in entries if entry.object]
+
+
+def get_leaderboard_page(
+    kind: str, scope: str, cursor: Optional[str] = None, per_page: int = 20
+) -> Tuple[List[LeaderboardEntry], Optional[str]]:
+    """
+    Returns entries which come after the cursor with their objects and the cursor of the next page.
+    The cursor is the (popularity, object_id) of the last entry, so pages don't shift when boards change.
+    """
+    page = paginate_by_keyset(
+        LeaderboardEntry.objects.filter(kind=kind, scope=scope),
+        BOARD_ORDERING,
+        cursor,
+        per_page,
+    )
+    return attach_objects(kind, page.object_list), page.next_cursor
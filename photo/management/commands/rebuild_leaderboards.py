@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from photo.leaderboard import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = "Fills leaderboards of the most popular pictures and galleries from scratch."
+
+    def handle(self, *args, **options):
+        rebuild_leaderboards()
+
+        self.stdout.write(self.style.SUCCESS("Leaderboards have been rebuilt."))
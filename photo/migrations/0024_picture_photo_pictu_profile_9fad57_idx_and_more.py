@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0031_visitor_account_vis_receive_1803ab_idx"),
+        ("photo", "0023_rename_gallerystat_gallerystats"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="picture",
+            index=models.Index(
+                fields=["profile", "presentation_tag"],
+                name="photo_pictu_profile_9fad57_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profilepicturerequest",
+            index=models.Index(
+                fields=["is_accepted", "is_rejected"],
+                name="photo_profi_is_acce_cdf377_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profilepicturerequest",
+            index=models.Index(
+                condition=models.Q(("is_accepted", False), ("is_rejected", False)),
+                fields=["profile"],
+                name="picture_request_waiting_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("photo", "0024_picture_photo_pictu_profile_9fad57_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="picture",
+            name="height",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="picture",
+            name="placeholder",
+            field=models.TextField(
+                blank=True,
+                help_text="Tiny blurred picture shown until the picture is loaded.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="picture",
+            name="width",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name="Rendition",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=25)),
+                ("format", models.CharField(max_length=10)),
+                (
+                    "file",
+                    models.ImageField(
+                        height_field="height",
+                        upload_to="renditions",
+                        width_field="width",
+                    ),
+                ),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                (
+                    "picture",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="renditions",
+                        to="photo.picture",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["width"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="rendition",
+            constraint=models.UniqueConstraint(
+                fields=("picture", "name", "format"), name="unique_rendition"
+            ),
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:10
+
+from django.db import migrations, models
+from localflavor.pl.pl_voivodeships import VOIVODESHIP_CHOICES
+
+LEADERBOARD_SIZE = 100
+
+# kind: stats model, field which refers to the ranked object, path to the owner's profile
+BOARDS = {
+    "picture": ("PictureStats", "picture_id", "picture__gallery__profile"),
+    "gallery": ("GalleryStats", "gallery_id", "gallery__profile"),
+}
+
+
+def fill_leaderboards(apps, schema_editor):
+    """Ranks pictures and galleries which have been viewed before."""
+    LeaderboardEntry = apps.get_model("photo", "LeaderboardEntry")
+
+    scopes = {"all": {}}
+    scopes.update({f"gender:{gender}": {"gender": gender} for gender in ("M", "F")})
+    scopes.update(
+        {
+            f"voivodeship:{value}": {"voivodeship": value}
+            for value, _ in VOIVODESHIP_CHOICES
+        }
+    )
+
+    for kind, (model_name, lookup, owner) in BOARDS.items():
+        stats = apps.get_model("photo", model_name).objects.filter(popularity__gt=0)
+        for scope, filters in scopes.items():
+            rows = (
+                stats.filter(
+                    **{f"{owner}__{key}": value for key, value in filters.items()}
+                )
+                .order_by("-popularity", f"-{lookup}")
+                .values_list(lookup, "popularity")[:LEADERBOARD_SIZE]
+            )
+            LeaderboardEntry.objects.bulk_create(
+                LeaderboardEntry(
+                    kind=kind, scope=scope, object_id=object_id, popularity=popularity
+                )
+                for object_id, popularity in rows
+            )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("photo", "0025_picture_renditions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaderboardEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("picture", "Picture"), ("gallery", "Gallery")],
+                        max_length=10,
+                    ),
+                ),
+                ("scope", models.CharField(max_length=50)),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("popularity", models.IntegerField()),
+            ],
+            options={
+                "verbose_name_plural": "Leaderboard entries",
+                "ordering": ["-popularity", "-object_id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="gallerystats",
+            index=models.Index(
+                fields=["-popularity", "-gallery"],
+                name="photo_galle_popular_6acf9d_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="picturestats",
+            index=models.Index(
+                fields=["-popularity", "-picture"],
+                name="photo_pictu_popular_e3f337_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="leaderboardentry",
+            index=models.Index(
+                fields=["kind", "scope", "-popularity", "-object_id"],
+                name="photo_leade_kind_001a61_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="leaderboardentry",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "scope", "object_id"), name="unique_leaderboard_entry"
+            ),
+        ),
+        migrations.RunPython(fill_leaderboards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("account", "0032_profile_compiled_presentation"),
+        ("photo", "0026_leaderboard"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="gallery",
+            index=models.Index(
+                fields=["profile", "-date_created"],
+                name="photo_galle_profile_bd1693_idx",
+            ),
+        ),
+    ]
@@ -1,10 +1,9 @@
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import F
+from django.db.models import F, Q
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from PIL import Image
 
 from account.models.profile import PROFILE_PICTURE_PATH
 from epuls_tools.scaler import give_away_puls
@@ -22,15 +21,25 @@ class ProfilePictureRequest(models.Model):
     examination_date = models.DateTimeField(blank=True, null=True)
     date_created = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_accepted", "is_rejected"]),
+            # only the requests waiting for examination are looked up by profile
+            models.Index(
+                fields=["profile"],
+                condition=Q(is_accepted=False, is_rejected=False),
+                name="picture_request_waiting_idx",
+            ),
+        ]
+
     def save(self, *args, **kwargs) -> None:
+        is_new = self._state.adding
         super(ProfilePictureRequest, self).save(*args, **kwargs)
 
-        # TODO celery
-        img = Image.open(self.picture.path)
-        if img.height > 300 or img.width > 300:
-            max_size = (300, 300)
-            img.thumbnail(max_size)
-            img.save(self.picture.path)
+        if is_new:
+            from .images import shrink_profile_picture
+
+            shrink_profile_picture.enqueue(request_id=self.pk)
 
     def accept(self) -> None:
         """
@@ -71,6 +80,9 @@ class Gallery(models.Model):
 
     # is_private = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [models.Index(fields=["profile", "-date_created"])]
+
     def get_absolute_url(self):
         return reverse(
             "photo:gallery-detail",
@@ -93,9 +105,17 @@ class Picture(models.Model):
         help_text="Required. 50 characters or fewer. Letters, digits and @/./+/-/_ only.",
     )
 
+    # filled in by the background image processing
+    width = models.PositiveIntegerField(blank=True, null=True)
+    height = models.PositiveIntegerField(blank=True, null=True)
+    placeholder = models.TextField(
+        blank=True, help_text="Tiny blurred picture shown until the picture is loaded."
+    )
+
     class Meta:
         ordering = ["-date_created"]
         unique_together = [["title", "profile"]]
+        indexes = [models.Index(fields=["profile", "presentation_tag"])]
 
     # TODO likes
 
@@ -115,6 +135,29 @@ class Picture(models.Model):
         return reverse("photo:picture-detail", kwargs={"pk": self.pk})
 
 
+class Rendition(models.Model):
+    """Resized copy of a picture in a web format."""
+
+    picture = models.ForeignKey(
+        Picture, on_delete=models.CASCADE, related_name="renditions"
+    )
+    name = models.CharField(max_length=25)
+    format = models.CharField(max_length=10)
+    file = models.ImageField(
+        upload_to="renditions", width_field="width", height_field="height"
+    )
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ["width"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["picture", "name", "format"], name="unique_rendition"
+            )
+        ]
+
+
 class Stats(models.Model):
     """Abstract model represents statistics."""
 
@@ -141,6 +184,9 @@ class GalleryStats(Stats):
         Gallery, on_delete=models.CASCADE, related_name="stats"
     )
 
+    class Meta(Stats.Meta):
+        indexes = [models.Index(fields=["-popularity", "-gallery"])]
+
     @property
     def amt_pictures(self):
         return self.gallery.pictures.count()
@@ -152,3 +198,32 @@ class PictureStats(Stats):
     picture = models.OneToOneField(
         Picture, on_delete=models.CASCADE, related_name="stats"
     )
+
+    class Meta(Stats.Meta):
+        indexes = [models.Index(fields=["-popularity", "-picture"])]
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Materialized entry of the most popular pictures or galleries in a scope.
+    The scope is the whole site, a voivodeship or a gender of the owner.
+    """
+
+    class Kind(models.TextChoices):
+        PICTURE = "picture", "Picture"
+        GALLERY = "gallery", "Gallery"
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    scope = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    popularity = models.IntegerField()
+
+    class Meta:
+        ordering = ["-popularity", "-object_id"]
+        verbose_name_plural = "Leaderboard entries"
+        indexes = [models.Index(fields=["kind", "scope", "-popularity", "-object_id"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "scope", "object_id"], name="unique_leaderboard_entry"
+            )
+        ]
@@ -1,12 +1,22 @@
-import os
-
 from django.db.models import F
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from account.models import Profile
+from epuls_tools.presentation import invalidate_pictures
 
-from .models import Gallery, GalleryStats, Picture, PictureStats
+from .images import process_picture
+from .leaderboard import refresh_profile_leaderboards, remove_from_leaderboards
+from .models import (
+    Gallery,
+    GalleryStats,
+    LeaderboardEntry,
+    Picture,
+    PictureStats,
+    ProfilePictureRequest,
+    Rendition,
+)
 
 
 # Picture Signals
@@ -23,13 +33,14 @@ def delete_picture(sender, instance, **kwargs) -> None:
     """
     old_instance = instance.picture
 
-    if os.path.exists(old_instance.path):
+    if old_instance and old_instance.storage.exists(old_instance.name):
         # Update Profile
         Profile.objects.filter(user=instance.gallery.profile.user).update(
             size_of_pictures=F("size_of_pictures") - old_instance.size
         )
 
-        os.remove(old_instance.path)
+        # the file is removed when no other model refers to it
+        old_instance.delete(save=False)
 
 
 @receiver(pre_save, sender=Picture)
@@ -47,18 +58,74 @@ def delete_picture_when_updated(sender, instance, **kwargs) -> None:
 
     # if user's change photo then delete old one.
     if old_picture.path != new_picture.path:
-        if os.path.exists(old_picture.path):
+        instance._picture_uploaded_at = timezone.now()
+        if old_picture.storage.exists(old_picture.name):
             old_size = old_picture.size
             new_size = new_picture.size
-            os.remove(old_picture.path)
+            old_picture.storage.delete(old_picture.name)
 
             Profile.objects.filter(user=instance.gallery.profile.user).update(
                 size_of_pictures=F("size_of_pictures") - old_size + new_size
             )
 
 
+@receiver(post_save, sender=Picture)
+def process_uploaded_picture(sender, instance, created, **kwargs) -> None:
+    uploaded_at = (
+        instance.date_created
+        if created
+        else getattr(instance, "_picture_uploaded_at", None)
+    )
+    if uploaded_at:
+        instance._picture_uploaded_at = None
+        # the file name comes from its content, but a picture can be changed back to a file it had before,
+        # so the key contains the time of the upload too
+        process_picture.enqueue(
+            picture_id=instance.pk,
+            idempotency_key=f"process_picture:{instance.pk}:{instance.picture.name}:"
+            f"{uploaded_at.isoformat()}",
+        )
+
+
+@receiver(post_delete, sender=Rendition)
+def delete_rendition_file(sender, instance, **kwargs) -> None:
+    instance.file.delete(save=False)
+
+
+@receiver(post_delete, sender=ProfilePictureRequest)
+def delete_profile_picture_request_file(sender, instance, **kwargs) -> None:
+    if instance.picture:
+        instance.picture.delete(save=False)
+
+
+@receiver(post_save, sender=Picture)
+@receiver(post_delete, sender=Picture)
+def invalidate_presentation(sender, instance, **kwargs) -> None:
+    invalidate_pictures(instance.profile_id)
+
+
+@receiver(post_delete, sender=Picture)
+def remove_picture_from_leaderboards(sender, instance, **kwargs) -> None:
+    remove_from_leaderboards(LeaderboardEntry.Kind.PICTURE, instance.pk)
+
+
 # Gallery signal
 @receiver(post_save, sender=Gallery)
 def create_stats_instance_on_gallery(sender, instance, created, **kwargs):
     if created:
         GalleryStats.objects.create(gallery=instance)
+
+
+@receiver(post_delete, sender=Gallery)
+def remove_gallery_from_leaderboards(sender, instance, **kwargs) -> None:
+    remove_from_leaderboards(LeaderboardEntry.Kind.GALLERY, instance.pk)
+
+
+# Profile signal
+@receiver(post_save, sender=Profile)
+def move_leaderboard_entries(sender, instance, created, update_fields, **kwargs):
+    # boards are narrowed to the voivodeship and the gender of the owner
+    if not created and {"voivodeship", "gender"} & instance.get_changed_fields(
+        update_fields
+    ):
+        refresh_profile_leaderboards(instance.pk)
@@ -0,0 +1,18 @@
+from django import template
+
+from photo.models import Picture
+
+register = template.Library()
+
+
+@register.simple_tag
+def rendition_url(picture: Picture, width: int, format: str = "webp") -> str:
+    """
+    Returns URL of the smallest rendition which is at least 'width' pixels wide.
+    When the picture hasn't been processed yet or all renditions are smaller, returns URL of the original picture.
+    Prefetch 'renditions' when pictures are listed.
+    """
+    for rendition in picture.renditions.all():
+        if rendition.format == format and rendition.width >= width:
+            return rendition.file.url
+    return picture.picture.url
@@ -0,0 +1,170 @@
+import os
+from unittest import mock
+
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
+
+from account.factories import UserFactory
+from epuls_tools.test import AppQueriesMixin
+from photo.counters import StatsBuffer, count_picture_stat, stats_buffer
+from photo.factories import GalleryFactory, PictureFactory
+from photo.leaderboard import GLOBAL_SCOPE
+from photo.models import GalleryStats, LeaderboardEntry, PictureStats
+
+
+class PictureStatsMixin:
+    def setUp(self):
+        profile = UserFactory().profile
+        # the stats pk doesn't have to be equal to the picture or gallery pk
+        GalleryFactory(profile=profile).delete()
+        self.gallery = GalleryFactory(profile=profile)
+        self.pictures = PictureFactory.create_batch(
+            2, profile=profile, gallery=self.gallery
+        )
+
+    def tearDown(self):
+        path = self.pictures[0].picture.path
+        if os.path.exists(path):
+            os.remove(path)
+
+    def get_stats(self, picture):
+        return (
+            PictureStats.objects.get(picture=picture),
+            GalleryStats.objects.get(gallery=self.gallery),
+        )
+
+
+@tag("ph_sb")
+@override_settings(STATS_BUFFER={"ENABLED": False})
+class StatsWithoutBufferTestCase(PictureStatsMixin, TestCase):
+    def test_should_write_increment_at_once(self):
+        count_picture_stat(self.pictures[1], "total_views")
+
+        picture_stats, gallery_stats = self.get_stats(self.pictures[1])
+        self.assertEqual(picture_stats.total_views, 1)
+        self.assertEqual(gallery_stats.popularity, 1)
+        self.assertEqual(
+            PictureStats.objects.get(picture=self.pictures[0]).popularity, 0
+        )
+
+    def test_should_raise_error_for_unknown_field(self):
+        with self.assertRaises(ValueError):
+            count_picture_stat(self.pictures[0], "popularity")
+
+
+@tag("ph_sb")
+@override_settings(
+    STATS_BUFFER={"ENABLED": True, "MAX_SIZE": 100, "FLUSH_INTERVAL": 60}
+)
+class StatsBufferTestCase(PictureStatsMixin, AppQueriesMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.buffer = StatsBuffer()
+
+    def count(self, picture, field, amount=1):
+        self.buffer.add(PictureStats, picture.pk, field, amount)
+        self.buffer.add(GalleryStats, picture.gallery_id, field, amount)
+
+    def test_should_not_write_before_flush(self):
+        with self.assertNumQueries(0):
+            for _ in range(10):
+                self.count(self.pictures[0], "total_views")
+
+        picture_stats, _ = self.get_stats(self.pictures[0])
+        self.assertEqual(picture_stats.total_views, 0)
+
+    def test_should_write_one_update_per_row(self):
+        for _ in range(10):
+            self.count(self.pictures[0], "total_views")
+            self.count(self.pictures[1], "total_views")
+        self.count(self.pictures[0], "amt_comments")
+        self.count(self.pictures[0], "amt_likes", 2)
+
+        with CaptureQueriesContext(connection) as context:
+            self.buffer.flush()
+
+        updates = [
+            query
+            for query in context.captured_queries
+            if query["sql"].startswith(
+                ('UPDATE "photo_picturestats"', 'UPDATE "photo_gallerystats"')
+            )
+        ]
+        # 2 pictures and 1 gallery
+        self.assertEqual(len(updates), 3)
+
+        picture_stats, gallery_stats = self.get_stats(self.pictures[0])
+        self.assertEqual(
+            (
+                picture_stats.total_views,
+                picture_stats.amt_comments,
+                picture_stats.amt_likes,
+            ),
+            (10, 1, 2),
+        )
+        self.assertEqual(picture_stats.popularity, 13)
+        self.assertEqual(gallery_stats.popularity, 23)
+
+    def test_should_refresh_leaderboards_when_buffer_is_flushed(self):
+        self.count(self.pictures[0], "total_views")
+
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+        self.buffer.flush()
+
+        self.assertEqual(
+            set(
+                LeaderboardEntry.objects.filter(scope=GLOBAL_SCOPE).values_list(
+                    "kind", "object_id"
+                )
+            ),
+            {
+                (LeaderboardEntry.Kind.PICTURE, self.pictures[0].pk),
+                (LeaderboardEntry.Kind.GALLERY, self.gallery.pk),
+            },
+        )
+
+    def test_should_flush_when_buffer_is_full(self):
+        with override_settings(STATS_BUFFER={"ENABLED": True, "MAX_SIZE": 2}):
+            self.count(self.pictures[0], "total_views")
+
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(self.get_stats(self.pictures[0])[1].total_views, 1)
+
+    def test_should_wake_flusher_instead_of_flushing_in_request(self):
+        self.buffer._flusher = mock.Mock(**{"start.return_value": True})
+
+        with override_settings(
+            STATS_BUFFER={"ENABLED": True, "MAX_SIZE": 2}
+        ), self.assertNumQueries(0):
+            self.count(self.pictures[0], "total_views")
+
+        self.buffer._flusher.wake.assert_called_once()
+        self.assertEqual(len(self.buffer), 2)
+
+    def test_should_keep_increments_when_writing_fails(self):
+        self.count(self.pictures[0], "total_views")
+
+        with mock.patch(
+            "photo.counters.write_increments", side_effect=DatabaseError
+        ), self.assertLogs("photo.counters", "ERROR"):
+            self.buffer.flush()
+        self.count(self.pictures[0], "total_views")
+        self.buffer.flush()
+
+        self.assertEqual(self.get_stats(self.pictures[0])[0].total_views, 2)
+
+    def test_picture_view_should_be_counted_by_global_buffer(self):
+        self.client.force_login(UserFactory())
+        stats_buffer.flush()
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.pictures[0].get_absolute_url())
+        self.assertFalse(
+            [query for query in context.captured_queries if "_stats" in query["sql"]]
+        )
+
+        stats_buffer.flush()
+
+        self.assertEqual(self.get_stats(self.pictures[0])[0].total_views, 1)
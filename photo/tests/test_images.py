@@ -0,0 +1,143 @@
+import os
+
+from django.core.files.base import ContentFile
+from django.template import Context, Template
+from django.test import TestCase, tag
+from PIL import Image
+
+from account.factories import UserFactory
+from account.models import Profile
+from epuls_tools.jobs import get_job_name, run_pending_jobs
+from epuls_tools.models import Job
+from photo.factories import GalleryFactory, PictureFactory
+from photo.images import RENDITION_SIZES, process_picture
+from photo.models import Picture, ProfilePictureRequest, Rendition
+
+
+@tag("ph_i")
+class PictureProcessingTestCase(TestCase):
+    def setUp(self):
+        self.profile = UserFactory().profile
+        self.gallery = GalleryFactory(profile=self.profile)
+        self.files = []
+
+    def tearDown(self):
+        for path in self.files:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def create_picture(self, width, height):
+        picture = PictureFactory(
+            profile=self.profile,
+            gallery=self.gallery,
+            picture__width=width,
+            picture__height=height,
+        )
+        run_pending_jobs()
+        picture.refresh_from_db()
+        self.files.append(picture.picture.path)
+        self.files.extend(r.file.path for r in picture.renditions.all())
+        return picture
+
+    def test_should_create_renditions_smaller_than_original(self):
+        picture = self.create_picture(600, 300)
+
+        renditions = picture.renditions.all()
+
+        self.assertEqual(
+            sorted({(r.name, r.width, r.height) for r in renditions}),
+            [("medium", 480, 240), ("small", 160, 80)],
+        )
+        self.assertEqual(
+            sorted(r.format for r in renditions), ["jpeg", "jpeg", "webp", "webp"]
+        )
+
+    def test_should_create_smallest_rendition_of_small_picture(self):
+        picture = self.create_picture(100, 50)
+
+        self.assertEqual(
+            {(r.name, r.width) for r in picture.renditions.all()}, {("small", 100)}
+        )
+
+    def test_should_record_dimensions_and_placeholder(self):
+        picture = self.create_picture(600, 300)
+
+        self.assertEqual((picture.width, picture.height), (600, 300))
+        self.assertTrue(picture.placeholder.startswith("data:image/jpeg;base64,"))
+
+    def test_should_save_renditions_in_their_format(self):
+        picture = self.create_picture(600, 300)
+
+        for rendition in picture.renditions.all():
+            with Image.open(rendition.file.path) as image:
+                self.assertEqual(image.format, rendition.format.upper())
+
+    def test_should_delete_rendition_files(self):
+        picture = self.create_picture(200, 200)
+        paths = [r.file.path for r in picture.renditions.all()]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            picture.renditions.all().delete()
+
+        self.assertFalse(Rendition.objects.exists())
+        self.assertFalse(any(os.path.exists(path) for path in paths))
+
+    def test_should_not_process_picture_before_the_job_is_run(self):
+        picture = PictureFactory(profile=self.profile, gallery=self.gallery)
+        self.files.append(picture.picture.path)
+
+        self.assertFalse(picture.renditions.exists())
+
+    def test_should_process_picture_changed_back_to_previous_file(self):
+        picture = PictureFactory(profile=self.profile, gallery=self.gallery)
+        self.files.append(picture.picture.path)
+        with picture.picture.open("rb") as file:
+            content = file.read()
+        # the factory doesn't count the size of the picture
+        Profile.objects.filter(pk=self.profile.pk).update(size_of_pictures=len(content))
+
+        for name, data in [("other.jpg", b"other"), ("first.jpg", content)]:
+            picture.picture = ContentFile(data, name=name)
+            picture.save()
+            self.files.append(picture.picture.path)
+
+        self.assertEqual(
+            Job.objects.filter(name=get_job_name(process_picture)).count(), 3
+        )
+
+    def test_rendition_url_should_pick_the_smallest_suitable_rendition(self):
+        picture = self.create_picture(1200, 600)
+        template = Template(
+            "{% load photo_tags %}{% rendition_url picture width format %}"
+        )
+
+        def render(width, format="webp"):
+            picture = Picture.objects.prefetch_related("renditions").get()
+            return template.render(
+                Context({"picture": picture, "width": width, "format": format})
+            )
+
+        def url(name, format="webp"):
+            return picture.renditions.get(name=name, format=format).file.url
+
+        self.assertEqual(render(100), url("small"))
+        self.assertEqual(render(161), url("medium"))
+        self.assertEqual(render(400, "jpeg"), url("medium", "jpeg"))
+        self.assertEqual(render(RENDITION_SIZES["large"] + 1), picture.picture.url)
+
+
+@tag("ph_ppr")
+class ProfilePictureRequestProcessingTestCase(TestCase):
+    def test_should_shrink_picture_in_job(self):
+        profile = UserFactory().profile
+        image = Image.new("RGB", (900, 600))
+        content = ContentFile(b"", name="request.jpg")
+        image.save(content.file, format="JPEG")
+
+        request = ProfilePictureRequest.objects.create(profile=profile, picture=content)
+        run_pending_jobs()
+
+        request.refresh_from_db()
+        with Image.open(request.picture.path) as shrunk:
+            self.assertEqual(shrunk.size, (300, 200))
+        os.remove(request.picture.path)
@@ -0,0 +1,210 @@
+from unittest import mock
+
+from django.shortcuts import reverse
+from django.test import TestCase, override_settings, tag
+
+from account.factories import UserFactory
+from account.models import Gender
+from photo.counters import stats_buffer
+from photo.factories import GalleryFactory
+from photo.leaderboard import (
+    GLOBAL_SCOPE,
+    VOIVODESHIPS,
+    get_leaderboard_page,
+    get_scope,
+    rebuild_leaderboards,
+)
+from photo.models import GalleryStats, LeaderboardEntry
+
+VOIVODESHIP = VOIVODESHIPS[0]
+
+
+def view_gallery(gallery, amount):
+    # the buffer is disabled, so it flushes at once
+    stats_buffer.add(GalleryStats, gallery.pk, "total_views", amount)
+
+
+def pull_board(scope=GLOBAL_SCOPE):
+    return list(
+        LeaderboardEntry.objects.filter(
+            kind=LeaderboardEntry.Kind.GALLERY, scope=scope
+        ).values_list("object_id", "popularity")
+    )
+
+
+@tag("ph_lb")
+@override_settings(STATS_BUFFER={"ENABLED": False}, LEADERBOARD_SIZE=2)
+class LeaderboardTestCase(TestCase):
+    def setUp(self):
+        self.profile = UserFactory().profile
+        self.profile.voivodeship = VOIVODESHIP
+        self.profile.gender = Gender.FEMALE
+        self.profile.save()
+
+        self.galleries = GalleryFactory.create_batch(3, profile=self.profile)
+
+    def test_should_rank_gallery_in_every_scope_of_owner(self):
+        view_gallery(self.galleries[0], 3)
+
+        expected = [(self.galleries[0].pk, 3)]
+        self.assertEqual(pull_board(), expected)
+        self.assertEqual(pull_board(get_scope(gender=Gender.FEMALE)), expected)
+        self.assertEqual(pull_board(get_scope(voivodeship=VOIVODESHIP)), expected)
+        self.assertEqual(pull_board(get_scope(gender=Gender.MALE)), [])
+
+    def test_should_not_rank_galleries_without_popularity(self):
+        view_gallery(self.galleries[0], 0)
+
+        self.assertEqual(pull_board(), [])
+
+    def test_should_keep_only_the_most_popular(self):
+        first, second, third = self.galleries
+        view_gallery(first, 5)
+        view_gallery(second, 3)
+        view_gallery(third, 1)
+
+        self.assertEqual(pull_board(), [(first.pk, 5), (second.pk, 3)])
+
+        view_gallery(third, 5)
+
+        self.assertEqual(pull_board(), [(third.pk, 6), (first.pk, 5)])
+
+    def test_should_rebuild_board_when_entry_drops_below_the_last(self):
+        first, second, third = self.galleries
+        view_gallery(first, 5)
+        view_gallery(second, 3)
+        view_gallery(third, 2)
+
+        stats_buffer.add(GalleryStats, first.pk, "amt_likes", -4)
+
+        self.assertEqual(pull_board(), [(second.pk, 3), (third.pk, 2)])
+
+    def test_should_move_entries_when_owner_changes_voivodeship(self):
+        view_gallery(self.galleries[0], 1)
+
+        self.profile.voivodeship = VOIVODESHIPS[1]
+        self.profile.save(update_fields=["voivodeship"])
+
+        self.assertEqual(pull_board(get_scope(voivodeship=VOIVODESHIP)), [])
+        self.assertEqual(
+            pull_board(get_scope(voivodeship=VOIVODESHIPS[1])),
+            [(self.galleries[0].pk, 1)],
+        )
+
+    def test_should_not_refresh_boards_when_scope_of_owner_is_the_same(self):
+        view_gallery(self.galleries[0], 1)
+
+        with mock.patch("photo.signals.refresh_profile_leaderboards") as refresh:
+            self.profile.add_friend(UserFactory())
+            self.profile.voivodeship = VOIVODESHIP
+            self.profile.save()
+
+        refresh.assert_not_called()
+
+    def test_should_move_entries_when_profile_is_saved_with_new_gender(self):
+        view_gallery(self.galleries[0], 1)
+
+        self.profile.gender = Gender.MALE
+        self.profile.save()
+
+        self.assertEqual(pull_board(get_scope(gender=Gender.FEMALE)), [])
+        self.assertEqual(
+            pull_board(get_scope(gender=Gender.MALE)), [(self.galleries[0].pk, 1)]
+        )
+
+    def test_should_give_place_of_deleted_gallery_to_the_next(self):
+        first, second, third = self.galleries
+        view_gallery(first, 5)
+        view_gallery(second, 3)
+        view_gallery(third, 1)
+
+        first.delete()
+
+        self.assertEqual(pull_board(), [(second.pk, 3), (third.pk, 1)])
+
+    def test_rebuild_should_give_the_same_boards(self):
+        for amount, gallery in enumerate(self.galleries, start=1):
+            view_gallery(gallery, amount)
+        boards = list(
+            LeaderboardEntry.objects.values_list("kind", "scope", "object_id")
+        )
+
+        LeaderboardEntry.objects.all().delete()
+        rebuild_leaderboards()
+
+        self.assertCountEqual(
+            LeaderboardEntry.objects.values_list("kind", "scope", "object_id"), boards
+        )
+
+    def test_should_paginate_board_by_cursor(self):
+        first, second, _ = self.galleries
+        view_gallery(first, 2)
+        view_gallery(second, 2)
+
+        entries, cursor = get_leaderboard_page(
+            LeaderboardEntry.Kind.GALLERY, GLOBAL_SCOPE, per_page=1
+        )
+        self.assertEqual([entry.object for entry in entries], [second])
+
+        entries, cursor = get_leaderboard_page(
+            LeaderboardEntry.Kind.GALLERY, GLOBAL_SCOPE, cursor=cursor, per_page=1
+        )
+        self.assertEqual([entry.object for entry in entries], [first])
+        self.assertIsNone(cursor)
+
+
+@tag("ph_lb")
+@override_settings(STATS_BUFFER={"ENABLED": False})
+class LeaderboardViewTestCase(TestCase):
+    def setUp(self):
+        user = UserFactory()
+        self.client.force_login(user)
+        self.gallery = GalleryFactory(profile=user.profile)
+        view_gallery(self.gallery, 4)
+
+    def test_api_should_return_page_of_board(self):
+        response = self.client.get(
+            reverse("photo:leaderboard-api", kwargs={"kind": "gallery"})
+        )
+
+        self.assertEqual(
+            response.json(),
+            {
+                "results": [
+                    {
+                        "id": self.gallery.pk,
+                        "popularity": 4,
+                        "url": self.gallery.get_absolute_url(),
+                        "title": self.gallery.name,
+                    }
+                ],
+                "next": None,
+            },
+        )
+
+    def test_should_render_board(self):
+        response = self.client.get(
+            reverse("photo:leaderboard", kwargs={"kind": "gallery"}),
+            {"gender": Gender.MALE},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.gallery.name)
+
+    def test_should_reject_invalid_query(self):
+        url = reverse("photo:leaderboard-api", kwargs={"kind": "gallery"})
+
+        for query in (
+            {"cursor": "abc"},
+            {"gender": "X"},
+            {"gender": Gender.MALE, "voivodeship": VOIVODESHIP},
+        ):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(url, query).status_code, 400)
+
+    def test_should_return_404_for_unknown_board(self):
+        response = self.client.get(
+            reverse("photo:leaderboard-api", kwargs={"kind": "profile"})
+        )
+
+        self.assertEqual(response.status_code, 404)
@@ -5,13 +5,14 @@ from unittest.mock import Mock, patch
 
 from django.contrib.auth.models import User
 from django.shortcuts import reverse
-from django.test import TestCase, tag
+from django.test import TestCase, override_settings, tag
 from django.utils import timezone
 from notifications.models import Notification
 
 from account.factories import PASSWORD, UserFactory
 from action.models import Action, ActionMessage
 from comment.models import PhotoComment
+from epuls_tools.jobs import run_pending_jobs
 from epuls_tools.scaler import PULS_FOR_ACTION
 from photo.factories import GalleryFactory, PictureFactory
 from photo.models import Gallery, GalleryStats, Picture, PictureStats
@@ -121,29 +122,35 @@ class PictureDetailViewTestCase(TestCase):
         self.assertEqual(picture_popularity, 1)
         self.assertEqual(PhotoComment.objects.count(), 1)
 
+    @override_settings(INBOX={"WINDOW": 0})
     def test_should_not_create_notification_when_user_comment_own_photo(self):
         pk_picture = Picture.objects.first().pk
         self.client.post(self.url(kwargs={"pk": pk_picture}), data=self.payload)
+        run_pending_jobs()
 
         self.assertFalse(Notification.objects.count())
 
+    @override_settings(INBOX={"WINDOW": 0})
     def test_should_create_notification(self):
         _, new_picture = self.create_new_user_with_picture()
 
         self.client.post(self.url(kwargs={"pk": new_picture.pk}), data=self.payload)
+        run_pending_jobs()
 
         self.assertEqual(Notification.objects.count(), 1)
         n = Notification.objects.first()
         self.assertEqual(n.recipient, new_picture.profile.user)
         self.assertEqual(n.actor, self.user)
 
-    def test_should_create_five_notifications(self):
+    @override_settings(INBOX={"WINDOW": 0})
+    def test_should_coalesce_comments_into_one_notification(self):
         _, new_picture = self.create_new_user_with_picture()
 
         for _ in range(5):
             self.client.post(self.url(kwargs={"pk": new_picture.pk}), data=self.payload)
+        run_pending_jobs()
 
-        self.assertEqual(Notification.objects.count(), 5)
+        self.assertEqual(Notification.objects.get().data["events"], 5)
 
 
 class GalleryListViewTestCase(TestCase):
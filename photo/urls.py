@@ -6,11 +6,13 @@ from .views import (
     GalleryDetailView,
     GalleryListView,
     GalleryUpdateView,
+    LeaderboardView,
     PictureCreateView,
     PictureDeleteView,
     PictureDetailView,
     PictureUpdateView,
     ProfilePictureResponseView,
+    leaderboard_api,
     profile_picture_request,
 )
 
@@ -70,6 +72,8 @@ urlpatterns = [
             ]
         ),
     ),
+    path("leaderboard/<str:kind>/", LeaderboardView.as_view(), name="leaderboard"),
+    path("api/leaderboard/<str:kind>/", leaderboard_api, name="leaderboard-api"),
     path("create/", PictureCreateView.as_view(), name="picture-create"),
     path(
         "<int:pk>/",
@@ -5,20 +5,31 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.db.models import F
-from django.http import Http404, HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render, reverse
-from django.views.generic import CreateView, DeleteView, DetailView, UpdateView, View
+from django.views.generic import (
+    CreateView,
+    DeleteView,
+    DetailView,
+    TemplateView,
+    UpdateView,
+    View,
+)
 from django.views.generic.edit import FormMixin
 
 from account.models import Profile
 from comment.forms import PhotoCommentForm
 from comment.models import PhotoComment
+from epuls_tools.pagination import KeysetPaginationMixin
+from epuls_tools.sampling import sample_by_id_range
 from epuls_tools.tools import puls_valid_time_gap_comments
 from epuls_tools.views import ActionType, EpulsDetailView, EpulsListView
 from puls.models import PulsType
 
+from .counters import count_picture_stat
 from .forms import GalleryForm, PictureForm, ProfilePictureRequestForm
-from .models import Gallery, GalleryStats, Picture, PictureStats, ProfilePictureRequest
+from .leaderboard import get_leaderboard_page, get_scope_from_query
+from .models import Gallery, LeaderboardEntry, Picture, ProfilePictureRequest
 
 
 @login_required
@@ -56,11 +67,10 @@ class ProfilePictureResponseView(LoginRequiredMixin, UserPassesTestMixin, View):
 
     def get(self, request, *args, **kwargs):
         context = {}
-        profile_picture = (
-            ProfilePictureRequest.objects.filter(is_accepted=False, is_rejected=False)
-            .order_by("?")
-            .first()
-        )
+        profile_picture = sample_by_id_range(
+            ProfilePictureRequest.objects.filter(is_accepted=False, is_rejected=False),
+            k=1,
+        ).first()
         if profile_picture:
             currently_photo = profile_picture.profile.profile_picture
             if currently_photo:
@@ -151,16 +161,19 @@ class GalleryDetailView(LoginRequiredMixin, DetailView):
         username = self.kwargs.get("username")
         gallery_pk = self.kwargs.get("pk")
         try:
-            return Gallery.objects.select_related("profile__user").get(
-                profile__user__username=username, pk=gallery_pk
+            return (
+                Gallery.objects.select_related("profile__user")
+                .prefetch_related("pictures__renditions")
+                .get(profile__user__username=username, pk=gallery_pk)
             )
         except Gallery.DoesNotExist:
             raise Http404()
 
 
-class GalleryListView(LoginRequiredMixin, EpulsListView):
+class GalleryListView(LoginRequiredMixin, KeysetPaginationMixin, EpulsListView):
     model = Gallery
     template_name = "photo/gallery/list.html"
+    keyset_ordering = ("-date_created", "-pk")
     activity = ActionType.GALLERY
 
     def get_queryset(self) -> Any:
@@ -220,9 +233,11 @@ class PictureDetailView(LoginRequiredMixin, FormMixin, EpulsDetailView):
 
     def get_object(self, queryset=None):
         pk = self.kwargs.get("pk")
-        return Picture.objects.select_related(
-            "gallery", "profile", "profile__user"
-        ).get(pk=pk)
+        return (
+            Picture.objects.select_related("gallery", "profile", "profile__user")
+            .prefetch_related("renditions")
+            .get(pk=pk)
+        )
 
     def get_success_url(self) -> str:
         """Return the URL to redirect to after a successful form submission."""
@@ -248,20 +263,14 @@ class PictureDetailView(LoginRequiredMixin, FormMixin, EpulsDetailView):
             )
 
         # update stats
-        self.update_stats(
-            gallery_pk=object_instance.gallery.pk, picture_pk=object_instance.pk
-        )
+        count_picture_stat(object_instance, "amt_comments")
 
         return super().form_valid(form)
 
-    def update_stats(self, gallery_pk: int, picture_pk: int) -> None:
-        """Increases field 'amt_comment' by 1 on GalleryStats and PictureStats model."""
-        GalleryStats.objects.filter(pk=gallery_pk).update(
-            amt_comments=F("amt_comments") + 1
-        )
-        PictureStats.objects.filter(pk=picture_pk).update(
-            amt_comments=F("amt_comments") + 1
-        )
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        count_picture_stat(self.object, "total_views")
+        return response
 
     def post(self, request, *args, **kwargs) -> HttpResponseRedirect | Any:
         """Handle POST requests."""
@@ -280,13 +289,6 @@ class PictureDetailView(LoginRequiredMixin, FormMixin, EpulsDetailView):
         context["comments"] = comments.filter(photo=context["object"])
         return context
 
-    # def noti(self, actor: User, recipient: User, verb: str, act_obj: Any, **kwargs):
-    #     from notifications.signals import notify
-    #
-    #     notify.send(
-    #         sender=actor, actor=actor, recipient=recipient, verb=verb, action_object=act_obj, **kwargs
-    #     )
-
 
 class PictureDeleteView(LoginRequiredMixin, DeleteView):
     model = Picture
@@ -300,3 +302,52 @@ class PictureDeleteView(LoginRequiredMixin, DeleteView):
         return Picture.objects.filter(
             gallery__profile__user=self.request.user, pk=pk
         ).exists()
+
+
+# LEADERBOARD
+def pull_leaderboard_page(request, kind: str):
+    """Returns the page of the board selected by the URL and the query string."""
+    if kind not in LeaderboardEntry.Kind.values:
+        raise Http404()
+
+    scope = get_scope_from_query(request.GET)
+    return get_leaderboard_page(kind, scope, cursor=request.GET.get("cursor"))
+
+
+class LeaderboardView(LoginRequiredMixin, TemplateView):
+    """The most popular pictures or galleries of the whole site, a voivodeship or a gender."""
+
+    template_name = "photo/leaderboard.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        entries, next_cursor = pull_leaderboard_page(self.request, self.kwargs["kind"])
+        query = self.request.GET.copy()
+        query.pop("cursor", None)
+
+        context.update(
+            kind=self.kwargs["kind"],
+            entries=entries,
+            next_cursor=next_cursor,
+            query=query.urlencode(),
+        )
+        return context
+
+
+@login_required
+def leaderboard_api(request, kind: str) -> JsonResponse:
+    """Returns a page of the board as JSON. The 'next' cursor is null on the last page."""
+    entries, next_cursor = pull_leaderboard_page(request, kind)
+
+    results = [
+        {
+            "id": entry.object_id,
+            "popularity": entry.popularity,
+            "url": entry.object.get_absolute_url(),
+            "title": entry.object.title
+            if kind == LeaderboardEntry.Kind.PICTURE
+            else entry.object.name,
+        }
+        for entry in entries
+    ]
+    return JsonResponse({"results": results, "next": next_cursor})
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PulsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "puls"
+
+    def ready(self):
+        import puls.signals
@@ -0,0 +1,53 @@
+"""
+Cache of active bonus scalers.
+
+Entries are keyed by the day and hold the sum of active Bonus scalers for each bonus type, so a new day
+starts with a new entry and yesterday's bonuses are never used after midnight.
+They are kept in the shared cache under the version of the bonuses namespace. Bonus signals bump it,
+so every process, including the job worker, sees changed bonuses after at most the L1 timeout of the cache.
+Entries are written only after the transaction is committed.
+"""
+from datetime import date
+from typing import Dict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+
+from epuls_tools.cache import MISSING
+
+from .models import Bonus
+
+BONUSES_NAMESPACE = "bonuses"
+BONUSES_TIMEOUT = 60 * 60 * 24
+
+
+def get_active_bonuses(day: date) -> Dict[str, float]:
+    """Returns sum of scalers of bonuses active on the day by bonus type."""
+    version = cache.get_namespace_version(BONUSES_NAMESPACE)
+    key = f"bonuses:{day.isoformat()}"
+    bonuses = cache.get(key, MISSING, version=version)
+    if bonuses is MISSING:
+        bonuses = dict(
+            Bonus.objects.filter(start__lte=day, end__gte=day)
+            .values("type")
+            .annotate(scaler=Sum("scaler"))
+            .order_by()
+            .values_list("type", "scaler")
+        )
+        transaction.on_commit(
+            lambda: cache.set(key, bonuses, BONUSES_TIMEOUT, version=version)
+        )
+
+    return bonuses
+
+
+def get_bonus_scaler(puls_type: str, day: date) -> float:
+    """Returns sum of scalers of bonuses for all types and the puls type."""
+    bonuses = get_active_bonuses(day)
+    return bonuses.get("all", 0) + bonuses.get(puls_type, 0)
+
+
+def invalidate_bonuses() -> None:
+    cache.bump_namespace(BONUSES_NAMESPACE)
+    transaction.on_commit(lambda: cache.bump_namespace(BONUSES_NAMESPACE))
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from account.models import Profile, ProfileType
+from epuls_tools.scaler import give_away_puls_bulk
+from puls.models import PulsType, SinglePuls
+
+
+class Command(BaseCommand):
+    help = (
+        "Gives away the monthly TYPE pulses to all Pro/Xtreme/Divine profiles. "
+        "Profiles which have already got them this month are skipped, so it's safe to run it again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rate",
+            type=float,
+            required=True,
+            help="Pulses of a Basic profile, they are multiplied by the profile type like other pulses.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="How many profiles are awarded with one bulk insert.",
+        )
+
+    def handle(self, *args, **options):
+        first_day = timezone.now().replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        profiles = (
+            Profile.objects.exclude(type_of_profile=ProfileType.BASIC)
+            .exclude(puls=None)
+            .exclude(
+                Exists(
+                    SinglePuls.objects.filter(
+                        puls=OuterRef("puls"),
+                        type=PulsType.TYPE,
+                        created__gte=first_day,
+                    )
+                )
+            )
+            .only("puls_id", "type_of_profile")
+            .order_by("pk")
+        )
+
+        awarded = give_away_puls_bulk(
+            profiles.iterator(chunk_size=options["batch_size"]),
+            PulsType.TYPE,
+            batch_size=options["batch_size"],
+            rate=options["rate"],
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{awarded} profiles have got TYPE pulses.")
+        )
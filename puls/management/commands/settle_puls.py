@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from puls.services import settle_all_pending_puls
+
+
+class Command(BaseCommand):
+    help = "Accepts pending pulses of all users. It's meant to be run nightly."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="How many Puls are settled in one transaction.",
+        )
+
+    def handle(self, *args, **options):
+        settled = settle_all_pending_puls(options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"{settled} Puls have been settled."))
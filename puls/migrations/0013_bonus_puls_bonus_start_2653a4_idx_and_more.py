@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("puls", "0012_alter_singlepuls_type"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bonus",
+            index=models.Index(
+                fields=["start", "end", "type"], name="puls_bonus_start_2653a4_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="singlepuls",
+            index=models.Index(
+                fields=["puls", "is_accepted", "type", "created"],
+                name="puls_single_puls_id_2e668e_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="singlepuls",
+            index=models.Index(
+                condition=models.Q(("is_accepted", False)),
+                fields=["puls", "type"],
+                name="singlepuls_not_accepted_idx",
+            ),
+        ),
+    ]
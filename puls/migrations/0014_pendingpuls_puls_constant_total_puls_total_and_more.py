@@ -0,0 +1,182 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:32
+
+import django.db.models.deletion
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+def fill_pending_puls(apps, schema_editor):
+    SinglePuls = apps.get_model("puls", "SinglePuls")
+    PendingPuls = apps.get_model("puls", "PendingPuls")
+
+    pending = (
+        SinglePuls.objects.filter(is_accepted=False)
+        .values("puls", "type")
+        .annotate(sum=models.Sum("quantity"))
+        .order_by()
+    )
+    PendingPuls.objects.bulk_create(
+        [
+            PendingPuls(puls_id=p["puls"], type=p["type"], quantity=p["sum"])
+            for p in pending
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("puls", "0013_bonus_puls_bonus_start_2653a4_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingPuls",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("profile_photo", "PROFILE PHOTO"),
+                            ("about_me", "ABOUT ME"),
+                            ("presentation", "PRESENTATION"),
+                            ("schools", "SCHOOLS"),
+                            ("account_confirm", "ACCOUNT CONFIRM"),
+                            ("logins", "LOGINS"),
+                            ("guestbooks", "GUESTBOOKS"),
+                            ("messages", "MESSAGES"),
+                            ("diaries", "DIARIES"),
+                            ("surfing", "SURFING"),
+                            ("comment_activity_picture", "COMMENT ACTIVITY"),
+                            ("comment_activity_diary", "COMMENT ACTIVITY DIARY"),
+                            ("activity", "ACTIVITY"),
+                            ("type", "TYPE"),
+                            ("bonus", "BONUS"),
+                        ],
+                        max_length=25,
+                    ),
+                ),
+                ("quantity", models.FloatField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="puls",
+            name="constant_total",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    django.db.models.expressions.CombinedExpression(
+                        django.db.models.expressions.CombinedExpression(
+                            models.F("profile_photo"), "+", models.F("about_me")
+                        ),
+                        "+",
+                        models.F("presentation"),
+                    ),
+                    "+",
+                    models.F("schools"),
+                ),
+                output_field=models.IntegerField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="puls",
+            name="total",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    django.db.models.expressions.CombinedExpression(
+                        django.db.models.expressions.CombinedExpression(
+                            django.db.models.expressions.CombinedExpression(
+                                django.db.models.expressions.CombinedExpression(
+                                    django.db.models.expressions.CombinedExpression(
+                                        django.db.models.expressions.CombinedExpression(
+                                            django.db.models.expressions.CombinedExpression(
+                                                django.db.models.expressions.CombinedExpression(
+                                                    models.F("profile_photo"),
+                                                    "+",
+                                                    models.F("about_me"),
+                                                ),
+                                                "+",
+                                                models.F("presentation"),
+                                            ),
+                                            "+",
+                                            models.F("schools"),
+                                        ),
+                                        "+",
+                                        models.F("logins"),
+                                    ),
+                                    "+",
+                                    models.F("guestbooks"),
+                                ),
+                                "+",
+                                models.F("diaries"),
+                            ),
+                            "+",
+                            models.F("surfing"),
+                        ),
+                        "+",
+                        models.F("activity"),
+                    ),
+                    "+",
+                    models.F("type"),
+                ),
+                output_field=models.IntegerField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="puls",
+            name="variable_total",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    django.db.models.expressions.CombinedExpression(
+                        django.db.models.expressions.CombinedExpression(
+                            django.db.models.expressions.CombinedExpression(
+                                django.db.models.expressions.CombinedExpression(
+                                    models.F("logins"), "+", models.F("guestbooks")
+                                ),
+                                "+",
+                                models.F("diaries"),
+                            ),
+                            "+",
+                            models.F("surfing"),
+                        ),
+                        "+",
+                        models.F("activity"),
+                    ),
+                    "+",
+                    models.F("type"),
+                ),
+                output_field=models.IntegerField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="puls",
+            index=models.Index(fields=["-total"], name="puls_puls_total_57bb06_idx"),
+        ),
+        migrations.AddField(
+            model_name="pendingpuls",
+            name="puls",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="pending",
+                to="puls.puls",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="pendingpuls",
+            constraint=models.UniqueConstraint(
+                fields=("puls", "type"), name="unique_pending_puls"
+            ),
+        ),
+        migrations.RunPython(fill_pending_puls, migrations.RunPython.noop),
+    ]
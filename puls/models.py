@@ -1,8 +1,8 @@
-from typing import Optional
+from typing import Iterable
 
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.db.models import Q, QuerySet, Sum
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q, Sum
 
 
 class PulsTypeVariableValue(models.TextChoices):
@@ -33,6 +33,28 @@ class PulsType(models.TextChoices):
     BONUS = "bonus", "BONUS"
 
 
+CONSTANT_FIELDS = ("profile_photo", "about_me", "presentation", "schools")
+VARIABLE_FIELDS = ("logins", "guestbooks", "diaries", "surfing", "activity", "type")
+# types shown on the detail page and added to Puls by 'update_puls'
+PENDING_FIELDS = (
+    *CONSTANT_FIELDS,
+    "logins",
+    "guestbooks",
+    "messages",
+    "diaries",
+    "surfing",
+    "activity",
+    "type",
+)
+
+
+def sum_fields(fields) -> models.Expression:
+    expression = F(fields[0])
+    for field in fields[1:]:
+        expression += F(field)
+    return expression
+
+
 class Puls(models.Model):
     profile_photo = models.IntegerField(
         default=0,
@@ -74,6 +96,26 @@ class Puls(models.Model):
         help_text="PLUS for type of account: Pro/Extrime/Divine. Once a month.",
     )
 
+    # totals are computed by the database, reload the instance to read them after save
+    constant_total = models.GeneratedField(
+        expression=sum_fields(CONSTANT_FIELDS),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
+    variable_total = models.GeneratedField(
+        expression=sum_fields(VARIABLE_FIELDS),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
+    total = models.GeneratedField(
+        expression=sum_fields((*CONSTANT_FIELDS, *VARIABLE_FIELDS)),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=["-total"])]
+
     def constant_value(self) -> dict:
         """
         Returns dictionary with fields that the Puls is constant.
@@ -127,23 +169,13 @@ class Puls(models.Model):
 
         return value or is_pulses
 
-    def pull_not_accepted_puls(self) -> Optional[QuerySet["SinglePuls"]]:
-        pulses = self.pulses.filter(is_accepted=False).aggregate(
-            profile_photo=Sum(
-                "quantity", default=0, filter=Q(type=PulsType.PROFILE_PHOTO)
-            ),
-            about_me=Sum("quantity", default=0, filter=Q(type=PulsType.ABOUT_ME)),
-            presentation=Sum(
-                "quantity", default=0, filter=Q(type=PulsType.PRESENTATION)
-            ),
-            schools=Sum("quantity", default=0, filter=Q(type=PulsType.SCHOOLS)),
-            logins=Sum("quantity", default=0, filter=Q(type=PulsType.LOGINS)),
-            guestbooks=Sum("quantity", default=0, filter=Q(type=PulsType.GUESTBOOKS)),
-            messages=Sum("quantity", default=0, filter=Q(type=PulsType.MESSAGES)),
-            diaries=Sum("quantity", default=0, filter=Q(type=PulsType.DIARIES)),
-            surfing=Sum("quantity", default=0, filter=Q(type=PulsType.SURFING)),
-            activity=Sum("quantity", default=0, filter=Q(type=PulsType.ACTIVITY)),
-            type=Sum("quantity", default=0, filter=Q(type=PulsType.TYPE)),
+    def pull_not_accepted_puls(self) -> dict:
+        """
+        Returns quantity of not accepted pulses by type. Reads the PendingPuls ledger instead of summing SinglePuls.
+        """
+        pulses = dict.fromkeys(PENDING_FIELDS, 0)
+        pulses.update(
+            self.pending.filter(type__in=PENDING_FIELDS).values_list("type", "quantity")
         )
         return pulses
 
@@ -156,6 +188,66 @@ class SinglePuls(models.Model):
 
     created = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["puls", "is_accepted", "type", "created"]),
+            models.Index(
+                fields=["puls", "type"],
+                condition=Q(is_accepted=False),
+                name="singlepuls_not_accepted_idx",
+            ),
+        ]
+
+
+class PendingPuls(models.Model):
+    """
+    Ledger of not accepted pulses. Keeps running sum of SinglePuls quantity for each Puls and type.
+    """
+
+    puls = models.ForeignKey(Puls, on_delete=models.CASCADE, related_name="pending")
+    type = models.CharField(choices=PulsType.choices, max_length=25)
+    quantity = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["puls", "type"], name="unique_pending_puls")
+        ]
+
+    @classmethod
+    def add(cls, puls_id: int, type: str, quantity: float) -> None:
+        """
+        Atomically increases the pending quantity. The row is created by the first SinglePuls of the type.
+        """
+        increase = {"quantity": F("quantity") + quantity}
+        if cls.objects.filter(puls_id=puls_id, type=type).update(**increase):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(puls_id=puls_id, type=type, quantity=quantity)
+        except IntegrityError:
+            # other request has created the row in the meantime
+            cls.objects.filter(puls_id=puls_id, type=type).update(**increase)
+
+    @classmethod
+    def rebuild(cls, puls_ids: Iterable[int]) -> None:
+        """
+        Recomputes the ledger of given Puls from not accepted SinglePuls.
+        """
+        puls_ids = list(puls_ids)
+        pulses = (
+            SinglePuls.objects.filter(puls_id__in=puls_ids, is_accepted=False)
+            .values("puls_id", "type")
+            .annotate(sum=Sum("quantity"))
+            .order_by()
+        )
+        with transaction.atomic():
+            cls.objects.filter(puls_id__in=puls_ids).delete()
+            cls.objects.bulk_create(
+                cls(puls_id=p["puls_id"], type=p["type"], quantity=p["sum"])
+                for p in pulses
+            )
+
 
 class Bonus(models.Model):
     name = models.CharField(max_length=250)
@@ -171,6 +263,7 @@ class Bonus(models.Model):
 
     class Meta:
         verbose_name_plural = "Bonuses"
+        indexes = [models.Index(fields=["start", "end", "type"])]
 
     def __str__(self):
         return f"{self.name}"
@@ -0,0 +1,81 @@
+from collections import defaultdict
+from typing import Dict, Iterable
+
+from django.db import transaction
+from django.db.models import F
+
+from account.cache import invalidate_profile_snapshots
+
+from .models import PENDING_FIELDS, PendingPuls, Puls, SinglePuls
+
+
+def accept_pending_puls(puls_ids: Iterable[int]) -> Dict[int, Dict[str, float]]:
+    """
+    Accepts not accepted SinglePuls of given Puls in one transaction.
+
+    Pending rows are locked, their quantities are added to Puls fields with F() expressions and exactly those rows
+    are marked as accepted. SinglePuls created in the meantime stay pending for the next acceptance.
+    Each field gets the integer part of the pending sum, like the detail page shows it.
+
+    Returns dictionary with positive pending sums by type for each Puls which has been updated.
+    """
+    with transaction.atomic():
+        pending = list(
+            SinglePuls.objects.select_for_update()
+            .filter(puls_id__in=puls_ids, is_accepted=False)
+            .values_list("pk", "puls_id", "type", "quantity")
+        )
+        if not pending:
+            return {}
+
+        sums: Dict[int, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for _, puls_id, puls_type, quantity in pending:
+            if puls_type in PENDING_FIELDS:
+                sums[puls_id][puls_type] += quantity
+
+        accepted = {}
+        for puls_id, quantities in sums.items():
+            quantities = {key: value for key, value in quantities.items() if value > 0}
+            if not quantities:
+                continue
+
+            Puls.objects.filter(pk=puls_id).update(
+                **{key: F(key) + int(value) for key, value in quantities.items()}
+            )
+            accepted[puls_id] = quantities
+
+        SinglePuls.objects.filter(pk__in=[row[0] for row in pending]).update(
+            is_accepted=True
+        )
+        PendingPuls.rebuild({row[1] for row in pending})
+
+        if accepted:
+            # the total is shown on the profile
+            invalidate_profile_snapshots(
+                Puls.objects.filter(pk__in=accepted).values_list(
+                    "profile__user_id", flat=True
+                )
+            )
+
+    return accepted
+
+
+def settle_all_pending_puls(batch_size: int = 500) -> int:
+    """
+    Accepts pending pulses of all users, 'batch_size' Puls in one transaction.
+    Returns amount of updated Puls.
+    """
+    settled = 0
+    last_id = 0
+    while True:
+        puls_ids = list(
+            PendingPuls.objects.filter(puls_id__gt=last_id)
+            .order_by("puls_id")
+            .values_list("puls_id", flat=True)
+            .distinct()[:batch_size]
+        )
+        if not puls_ids:
+            return settled
+
+        settled += len(accept_pending_puls(puls_ids))
+        last_id = puls_ids[-1]
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_bonuses
+from .models import Bonus, PendingPuls, SinglePuls
+
+
+@receiver(post_save, sender=SinglePuls)
+def add_pending_puls(sender, instance, created, **kwargs):
+    if created and not instance.is_accepted:
+        PendingPuls.add(instance.puls_id, instance.type, instance.quantity)
+
+
+@receiver(post_delete, sender=SinglePuls)
+def remove_pending_puls(sender, instance, **kwargs):
+    if not instance.is_accepted:
+        PendingPuls.add(instance.puls_id, instance.type, -instance.quantity)
+
+
+@receiver(post_save, sender=Bonus)
+@receiver(post_delete, sender=Bonus)
+def clear_bonus_cache(sender, **kwargs):
+    invalidate_bonuses()
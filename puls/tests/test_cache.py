@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, tag
+from django.utils import timezone
+
+from account.factories import UserFactory
+from epuls_tools.scaler import give_away_puls
+from epuls_tools.test import AppQueriesMixin
+from puls.cache import get_bonus_scaler
+from puls.models import Bonus, PulsType, SinglePuls
+
+
+@tag("p_bc")
+class BonusCacheTestCase(AppQueriesMixin, TestCase):
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.profile = UserFactory().profile
+
+    def tearDown(self):
+        cache.clear()
+
+    def create_bonus(self, scaler, type="all", days=1):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Bonus.objects.create(
+                name="bonus",
+                start=self.today - timedelta(days=days),
+                end=self.today + timedelta(days=days),
+                scaler=scaler,
+                type=type,
+            )
+
+    def cache_bonuses(self, day):
+        with self.captureOnCommitCallbacks(execute=True):
+            get_bonus_scaler(PulsType.LOGINS, day)
+
+    def test_should_sum_bonuses_for_all_and_puls_type(self):
+        self.create_bonus(1)
+        self.create_bonus(0.5, type=PulsType.LOGINS)
+        self.create_bonus(3, type=PulsType.SURFING)
+
+        self.assertEqual(get_bonus_scaler(PulsType.LOGINS, self.today), 1.5)
+
+    def test_should_return_zero_without_bonuses(self):
+        self.assertEqual(get_bonus_scaler(PulsType.LOGINS, self.today), 0)
+
+    def test_should_not_query_cached_day(self):
+        self.create_bonus(1)
+        self.cache_bonuses(self.today)
+
+        with self.assertNumQueries(0):
+            scaler = get_bonus_scaler(PulsType.GUESTBOOKS, self.today)
+
+        self.assertEqual(scaler, 1)
+
+    def test_should_share_cached_day_with_other_processes(self):
+        self.create_bonus(1)
+        self.cache_bonuses(self.today)
+        # memory of another process is empty
+        cache.local.clear()
+
+        with self.assertNumQueries(0):
+            scaler = get_bonus_scaler(PulsType.LOGINS, self.today)
+
+        self.assertEqual(scaler, 1)
+
+    def test_should_query_next_day(self):
+        self.create_bonus(1, days=0)
+        self.cache_bonuses(self.today)
+
+        with self.assertNumQueries(1):
+            scaler = get_bonus_scaler(PulsType.LOGINS, self.today + timedelta(days=1))
+
+        self.assertEqual(scaler, 0)
+
+    def test_should_be_invalidated_when_bonus_is_changed(self):
+        bonus = self.create_bonus(1)
+        self.cache_bonuses(self.today)
+
+        bonus.scaler = 2
+        with self.captureOnCommitCallbacks(execute=True):
+            bonus.save()
+
+        self.assertEqual(get_bonus_scaler(PulsType.LOGINS, self.today), 2)
+
+    def test_should_be_invalidated_when_bonus_is_deleted(self):
+        bonus = self.create_bonus(1)
+        self.cache_bonuses(self.today)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bonus.delete()
+
+        self.assertEqual(get_bonus_scaler(PulsType.LOGINS, self.today), 0)
+
+    def test_give_away_puls_should_create_bonus_puls(self):
+        self.create_bonus(1)
+        self.cache_bonuses(self.today)
+
+        give_away_puls(user_profile=self.profile, type=PulsType.LOGINS)
+
+        bonus = SinglePuls.objects.get(type=PulsType.BONUS)
+        self.assertAlmostEqual(bonus.quantity, 0.1)
@@ -0,0 +1,44 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, tag
+
+from account.factories import UserFactory
+from account.models import Profile, ProfileType
+from puls.models import PulsType, SinglePuls
+
+
+@tag("p_atp")
+class AwardTypePulsCommandTestCase(TestCase):
+    def setUp(self):
+        UserFactory.create_batch(4)
+        for profile, type_of_profile in zip(Profile.objects.all(), ProfileType):
+            profile.type_of_profile = type_of_profile
+            profile.save()
+
+    def test_should_award_not_basic_profiles(self):
+        out = StringIO()
+
+        call_command("award_type_puls", "--rate", "1", stdout=out)
+
+        self.assertIn("3 profiles have got TYPE pulses.", out.getvalue())
+        self.assertEqual(
+            sorted(SinglePuls.objects.values_list("quantity", flat=True)), [2, 3, 4]
+        )
+        self.assertFalse(
+            SinglePuls.objects.filter(
+                puls__profile__type_of_profile=ProfileType.BASIC
+            ).exists()
+        )
+
+    def test_should_award_once_a_month(self):
+        call_command("award_type_puls", "--rate", "1", stdout=StringIO())
+        call_command("award_type_puls", "--rate", "1", stdout=StringIO())
+
+        self.assertEqual(SinglePuls.objects.filter(type=PulsType.TYPE).count(), 3)
+
+    def test_should_require_rate(self):
+        with self.assertRaises(CommandError):
+            call_command("award_type_puls", stdout=StringIO())
+
+        self.assertFalse(SinglePuls.objects.exists())
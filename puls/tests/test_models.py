@@ -0,0 +1,114 @@
+from django.test import TestCase, tag
+from django.urls import reverse
+
+from account.factories import UserFactory
+from epuls_tools.scaler import give_away_puls
+from epuls_tools.test import AppQueriesMixin
+from puls.factories import SinglePulsFactory
+from puls.models import PENDING_FIELDS, PendingPuls, PulsType
+
+
+@tag("p_t")
+class PulsTotalTestCase(TestCase):
+    def setUp(self):
+        self.puls = UserFactory().profile.puls
+
+    def test_totals_should_be_zero_for_new_puls(self):
+        self.assertEqual(self.puls.total, 0)
+        self.assertEqual(self.puls.constant_total, 0)
+        self.assertEqual(self.puls.variable_total, 0)
+
+    def test_totals_should_match_properties(self):
+        self.puls.profile_photo = 15
+        self.puls.schools = 15
+        self.puls.logins = 3
+        self.puls.type = 2
+        self.puls.account_confirm = 15
+        self.puls.messages = 4
+        self.puls.save()
+        self.puls.refresh_from_db()
+
+        self.assertEqual(self.puls.constant_total, self.puls.sum_constant_value)
+        self.assertEqual(self.puls.variable_total, self.puls.sum_variable_value)
+        self.assertEqual(self.puls.total, self.puls.puls)
+        self.assertEqual(self.puls.total, 35)
+
+
+@tag("p_pp")
+class PendingPulsTestCase(AppQueriesMixin, TestCase):
+    def setUp(self):
+        self.profile = UserFactory().profile
+        self.puls = self.profile.puls
+
+    def test_should_add_quantity_when_single_puls_is_created(self):
+        SinglePulsFactory.create_batch(
+            3, puls=self.puls, type=PulsType.LOGINS, quantity=2
+        )
+
+        pending = PendingPuls.objects.get(puls=self.puls, type=PulsType.LOGINS)
+        self.assertEqual(pending.quantity, 6)
+
+    def test_should_not_add_accepted_single_puls(self):
+        SinglePulsFactory(puls=self.puls, type=PulsType.LOGINS, is_accepted=True)
+
+        self.assertFalse(PendingPuls.objects.exists())
+
+    def test_should_subtract_quantity_when_single_puls_is_deleted(self):
+        single_puls = SinglePulsFactory(
+            puls=self.puls, type=PulsType.SCHOOLS, quantity=15
+        )
+        SinglePulsFactory(puls=self.puls, type=PulsType.SCHOOLS, quantity=15)
+
+        single_puls.delete()
+
+        pending = PendingPuls.objects.get(puls=self.puls, type=PulsType.SCHOOLS)
+        self.assertEqual(pending.quantity, 15)
+
+    def test_give_away_puls_should_update_ledger(self):
+        give_away_puls(user_profile=self.profile, type=PulsType.ABOUT_ME)
+
+        pulses = self.puls.pull_not_accepted_puls()
+
+        self.assertEqual(pulses[PulsType.ABOUT_ME], 15)
+
+    def test_pull_not_accepted_puls_should_return_all_types(self):
+        SinglePulsFactory(puls=self.puls, type=PulsType.BONUS, quantity=1)
+
+        pulses = self.puls.pull_not_accepted_puls()
+
+        self.assertEqual(list(pulses), list(PENDING_FIELDS))
+        self.assertFalse(any(pulses.values()))
+
+    def test_pull_not_accepted_puls_should_match_single_pulses(self):
+        for puls_type in (PulsType.LOGINS, PulsType.GUESTBOOKS, PulsType.SURFING):
+            SinglePulsFactory.create_batch(2, puls=self.puls, type=puls_type)
+        expected = dict.fromkeys(PENDING_FIELDS, 0)
+        for single_puls in self.puls.pulses.all():
+            expected[single_puls.type] += single_puls.quantity
+
+        with self.assertNumQueries(1):
+            pulses = self.puls.pull_not_accepted_puls()
+
+        self.assertEqual(pulses, expected)
+
+    def test_rebuild_should_recompute_ledger(self):
+        SinglePulsFactory(puls=self.puls, type=PulsType.LOGINS, quantity=3)
+        SinglePulsFactory(puls=self.puls, type=PulsType.LOGINS, is_accepted=True)
+        PendingPuls.objects.update(quantity=100)
+
+        PendingPuls.rebuild([self.puls.pk])
+
+        pending = PendingPuls.objects.get(puls=self.puls)
+        self.assertEqual(pending.quantity, 3)
+
+    def test_update_puls_should_clear_ledger(self):
+        user = self.profile.user
+        self.client.force_login(user)
+        SinglePulsFactory(puls=self.puls, type=PulsType.LOGINS, quantity=2)
+
+        self.client.get(reverse("account:puls-update", args=[user.username]))
+
+        self.puls.refresh_from_db()
+        self.assertEqual(self.puls.logins, 2)
+        self.assertEqual(self.puls.total, 2)
+        self.assertFalse(PendingPuls.objects.exists())
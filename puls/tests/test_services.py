@@ -0,0 +1,84 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, tag
+
+from account.factories import UserFactory
+from puls.factories import SinglePulsFactory
+from puls.models import PendingPuls, PulsType, SinglePuls
+from puls.services import accept_pending_puls, settle_all_pending_puls
+
+
+@tag("p_s")
+class AcceptPendingPulsTestCase(TestCase):
+    def setUp(self):
+        self.puls = UserFactory().profile.puls
+
+    def test_should_add_pending_pulses_to_fields(self):
+        SinglePulsFactory(puls=self.puls, type=PulsType.PROFILE_PHOTO, quantity=15)
+        SinglePulsFactory.create_batch(
+            3, puls=self.puls, type=PulsType.LOGINS, quantity=0.5
+        )
+
+        accepted = accept_pending_puls([self.puls.pk])
+
+        self.puls.refresh_from_db()
+        self.assertEqual(self.puls.profile_photo, 15)
+        self.assertEqual(self.puls.logins, 1)
+        self.assertEqual(accepted, {self.puls.pk: {"profile_photo": 15, "logins": 1.5}})
+
+    def test_should_accept_all_pending_rows(self):
+        SinglePulsFactory(puls=self.puls, type=PulsType.LOGINS)
+        SinglePulsFactory(puls=self.puls, type=PulsType.BONUS)
+
+        accept_pending_puls([self.puls.pk])
+
+        self.assertFalse(SinglePuls.objects.filter(is_accepted=False).exists())
+        self.assertFalse(PendingPuls.objects.exists())
+
+    def test_should_not_count_accepted_rows_again(self):
+        SinglePulsFactory(puls=self.puls, type=PulsType.LOGINS, quantity=2)
+        accept_pending_puls([self.puls.pk])
+        SinglePulsFactory(puls=self.puls, type=PulsType.LOGINS, quantity=3)
+
+        accept_pending_puls([self.puls.pk])
+
+        self.puls.refresh_from_db()
+        self.assertEqual(self.puls.logins, 5)
+
+    def test_should_return_empty_dict_without_pending_pulses(self):
+        self.assertEqual(accept_pending_puls([self.puls.pk]), {})
+
+    def test_should_not_touch_other_users(self):
+        other_puls = UserFactory().profile.puls
+        SinglePulsFactory(puls=other_puls, type=PulsType.LOGINS, quantity=2)
+
+        accept_pending_puls([self.puls.pk])
+
+        other_puls.refresh_from_db()
+        self.assertEqual(other_puls.logins, 0)
+        self.assertTrue(PendingPuls.objects.filter(puls=other_puls).exists())
+
+
+@tag("p_sa")
+class SettleAllPendingPulsTestCase(TestCase):
+    def setUp(self):
+        self.pulses = [user.profile.puls for user in UserFactory.create_batch(5)]
+        for puls in self.pulses:
+            SinglePulsFactory(puls=puls, type=PulsType.GUESTBOOKS, quantity=2)
+
+    def test_should_settle_all_users_in_batches(self):
+        settled = settle_all_pending_puls(batch_size=2)
+
+        self.assertEqual(settled, 5)
+        for puls in self.pulses:
+            puls.refresh_from_db()
+            self.assertEqual(puls.guestbooks, 2)
+
+    def test_command_should_settle_pulses(self):
+        out = StringIO()
+
+        call_command("settle_puls", stdout=out)
+
+        self.assertIn("5 Puls have been settled.", out.getvalue())
+        self.assertFalse(SinglePuls.objects.filter(is_accepted=False).exists())
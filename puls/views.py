@@ -5,6 +5,7 @@ from django.shortcuts import redirect
 from epuls_tools.views import ActionType, EpulsDetailView
 
 from .models import Puls
+from .services import accept_pending_puls
 
 
 class PulsDetailView(LoginRequiredMixin, EpulsDetailView):
@@ -36,19 +37,8 @@ def update_puls(request, username):
     """
     Updates the puls  values for user's profile.
     """
-    pulses = request.user.profile.puls
-    new_pulses = pulses.pull_not_accepted_puls()
-
-    # Filter out non-positive values
-    new_pulses = dict(filter(lambda x: x[1] > 0, new_pulses.items()))
-
-    # Update the fields
-    for key, value in new_pulses.items():
-        current_value = getattr(pulses, key)
-        setattr(pulses, key, current_value + int(value))
-
-    # Save the updated object
-    pulses.save()
+    puls_id = request.user.profile.puls_id
+    new_pulses = accept_pending_puls([puls_id]).get(puls_id)
 
     # Create messages
     if new_pulses:
@@ -56,7 +46,4 @@ def update_puls(request, username):
     else:
         messages.info(request, "You have not scored any pulses.")
 
-    # Change SinglePuls status
-    pulses.pulses.filter(is_accepted=False).update(is_accepted=True)
-
     return redirect("account:puls", username=username)
@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from .models import Shouter
+from .models import ArchivedShouter, Shouter
 
 admin.site.register(Shouter)
+admin.site.register(ArchivedShouter)
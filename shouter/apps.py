@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ShouterConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "shouter"
+
+    def ready(self):
+        import shouter.signals
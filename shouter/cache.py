@@ -0,0 +1,21 @@
+"""
+Pool of live shouters shown by the ticker.
+
+The pool holds ids and expiration dates of shouters which haven't expired. Expired shouters are left out
+of samples at once, new and deleted ones after the pool is reloaded or cleared by Shouter signals.
+"""
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from epuls_tools.sampling import SamplingPool
+
+from .models import Shouter
+
+
+def get_live_shouters() -> QuerySet:
+    return Shouter.objects.filter(
+        Q(expiration__isnull=True) | Q(expiration__gt=timezone.now())
+    )
+
+
+shouter_pool = SamplingPool(get_live_shouters, expiration_field="expiration")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from shouter.services import archive_expired_shouters
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves expired shouters to the archive. It's meant to be run every few minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="How many shouters are archived in one transaction.",
+        )
+
+    def handle(self, *args, **options):
+        archived = archive_expired_shouters(options["batch_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{archived} shouters have been archived.")
+        )
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shouter", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="shouter",
+            index=models.Index(
+                fields=["expiration"], name="shouter_sho_expirat_e7c69a_idx"
+            ),
+        ),
+    ]
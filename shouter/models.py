@@ -12,3 +12,22 @@ class Shouter(models.Model):
     text = models.CharField(max_length=200)
     created = models.DateTimeField(auto_now_add=True)
     expiration = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["expiration"])]
+
+
+class ArchivedShouter(models.Model):
+    """
+    Expired Shouter moved out of the live table by the sweeper.
+    It's kept only for the history of the user, so it has no expiration index.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    text = models.CharField(max_length=200)
+    created = models.DateTimeField()
+    expiration = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created"]
+        indexes = [models.Index(fields=["user", "-created"])]
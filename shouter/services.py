@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedShouter, Shouter
+
+
+def archive_expired_shouters(batch_size: int = 1000) -> int:
+    """
+    Moves expired shouters to the archive, 'batch_size' shouters in one transaction.
+    Expired rows are found by the expiration index. Returns amount of archived shouters.
+    """
+    archived = 0
+    now = timezone.now()
+    while True:
+        with transaction.atomic():
+            shouters = list(
+                Shouter.objects.select_for_update()
+                .filter(expiration__lte=now)
+                .order_by("expiration")[:batch_size]
+            )
+            if not shouters:
+                return archived
+
+            ArchivedShouter.objects.bulk_create(
+                ArchivedShouter(
+                    user_id=shouter.user_id,
+                    text=shouter.text,
+                    created=shouter.created,
+                    expiration=shouter.expiration,
+                )
+                for shouter in shouters
+            )
+            Shouter.objects.filter(pk__in=[shouter.pk for shouter in shouters]).delete()
+
+        archived += len(shouters)
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from epuls_tools.background import run_in_background
+
+from .cache import shouter_pool
+from .models import Shouter
+from .ticker import regenerate_ticker
+
+
+def is_expired(shouter: Shouter) -> bool:
+    return bool(shouter.expiration and shouter.expiration <= timezone.now())
+
+
+@receiver(post_save, sender=Shouter)
+@receiver(post_delete, sender=Shouter)
+def invalidate_shouter_pool(sender, instance, **kwargs) -> None:
+    # expired shouters are already left out, so the sweeper doesn't reload the pool
+    if not is_expired(instance):
+        shouter_pool.invalidate()
+
+
+@receiver(post_save, sender=Shouter)
+@receiver(post_delete, sender=Shouter)
+def regenerate_shared_ticker(sender, instance, **kwargs) -> None:
+    if not is_expired(instance):
+        run_in_background(regenerate_ticker)
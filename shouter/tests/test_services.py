@@ -0,0 +1,49 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, tag
+from django.utils import timezone
+
+from account.factories import UserFactory
+from shouter.cache import shouter_pool
+from shouter.factory import ShouterFactory
+from shouter.models import ArchivedShouter, Shouter
+from shouter.services import archive_expired_shouters
+
+
+@tag("sh_sv")
+class ArchiveExpiredShoutersTestCase(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        user = UserFactory()
+        self.expired = ShouterFactory.create_batch(
+            3, user=user, expiration=now - timedelta(minutes=1)
+        )
+        self.live = ShouterFactory(user=user, expiration=now + timedelta(hours=1))
+
+    def test_should_move_only_expired_shouters(self):
+        archived = archive_expired_shouters(batch_size=2)
+
+        self.assertEqual(archived, 3)
+        self.assertQuerySetEqual(Shouter.objects.all(), [self.live])
+        self.assertCountEqual(
+            ArchivedShouter.objects.values_list("text", "created", "expiration"),
+            [(s.text, s.created, s.expiration) for s in self.expired],
+        )
+
+    def test_should_not_reload_pool_for_expired_shouters(self):
+        shouter_pool.sample(1)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            archive_expired_shouters()
+
+        self.assertEqual(callbacks, [])
+        shouter_pool.invalidate()
+
+    def test_command_should_report_archived_shouters(self):
+        out = StringIO()
+
+        call_command("sweep_shouters", stdout=out)
+
+        self.assertIn("3 shouters have been archived.", out.getvalue())
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings, tag
+from django.utils import timezone
+
+from account.factories import UserFactory
+from epuls_tools.test import AppQueriesMixin
+from shouter.cache import shouter_pool
+from shouter.factory import ShouterFactory
+from shouter.ticker import (
+    CACHE_KEY,
+    get_ticker,
+    get_ticker_timeout,
+    get_ticker_variants,
+)
+
+
+@tag("sh_tk")
+@override_settings(
+    BACKGROUND_TASKS={"ASYNC": False},
+    SHOUTER_TICKER={"VARIANTS": 3, "SIZE": 2, "TIMEOUT": 300},
+)
+class ShouterTickerTestCase(AppQueriesMixin, TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+
+    def tearDown(self):
+        shouter_pool.invalidate()
+        cache.clear()
+
+    def create_shouter(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ShouterFactory(user=self.user, **kwargs)
+
+    def test_should_show_only_live_shouters(self):
+        now = timezone.now()
+        live = self.create_shouter(expiration=now + timedelta(hours=1))
+        expired = self.create_shouter(expiration=now - timedelta(hours=1))
+
+        for variant in get_ticker_variants():
+            self.assertIn(live.text, variant)
+            self.assertNotIn(expired.text, variant)
+
+    def test_should_render_variants_of_limited_size(self):
+        for _ in range(5):
+            self.create_shouter()
+
+        variants = get_ticker_variants()
+
+        self.assertEqual(len(variants), 3)
+        for variant in variants:
+            self.assertEqual(variant.count("text-dark"), 2)
+
+    def test_should_regenerate_variants_when_shouter_is_created(self):
+        self.create_shouter()
+        self.assertEqual(get_ticker_variants()[0].count("text-dark"), 1)
+
+        self.create_shouter()
+
+        self.assertEqual(cache.get(CACHE_KEY)[0].count("text-dark"), 2)
+
+    def test_should_expire_variants_with_first_shouter(self):
+        self.create_shouter(expiration=timezone.now() + timedelta(seconds=30))
+
+        self.assertLessEqual(get_ticker_timeout(), 30)
+
+    def test_should_serve_variants_from_process_memory(self):
+        self.create_shouter()
+        get_ticker_variants()
+
+        with self.assertNumQueries(0):
+            get_ticker("session")
+
+    def test_session_should_keep_its_variant(self):
+        for _ in range(5):
+            self.create_shouter()
+
+        self.assertEqual(get_ticker("session"), get_ticker("session"))
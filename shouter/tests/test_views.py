@@ -9,7 +9,7 @@ from parameterized import parameterized
 
 from account.factories import PASSWORD, UserFactory
 from shouter.factory import ShouterFactory
-from shouter.models import Shouter
+from shouter.models import ArchivedShouter, Shouter
 
 
 @tag("scv_t")
@@ -60,3 +60,25 @@ class ShouterCreateViewTestCase(TestCase):
         self.client.post(self.url, data=payload)
 
         self.assertFalse(Shouter.objects.count())
+
+
+@tag("shv_t")
+class ShouterHistoryViewTestCase(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client.force_login(self.user)
+        self.url = reverse("shouter:history")
+
+    def test_should_show_only_archived_shouters_of_user(self):
+        now = timezone.now()
+        own = ArchivedShouter.objects.create(
+            user=self.user, text="own-shouter", created=now, expiration=now
+        )
+        ArchivedShouter.objects.create(
+            user=UserFactory(), text="other-shouter", created=now, expiration=now
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertQuerySetEqual(response.context["object_list"], [own])
+        self.assertNotContains(response, "other-shouter")
@@ -0,0 +1,103 @@
+"""
+Pre-rendered shouter ticker shared by all sessions.
+
+A few variants of the ticker, each with other random shouters, are kept under one cache key.
+Every session sees one variant chosen by its session key. Variants are regenerated in the background when
+shouters are created or deleted, and they expire together with the first live shouter.
+The amount and size of variants are set by the SHOUTER_TICKER setting.
+"""
+import random
+import zlib
+from typing import List, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.shortcuts import reverse
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .cache import get_live_shouters, shouter_pool
+from .models import Shouter
+
+DEFAULT_SETTINGS = {"VARIANTS": 4, "SIZE": 10, "TIMEOUT": 300}
+
+CACHE_KEY = "shouter_ticker"
+
+
+def get_ticker_settings() -> dict:
+    return {**DEFAULT_SETTINGS, **getattr(settings, "SHOUTER_TICKER", {})}
+
+
+def get_user_profile_url(username: str) -> str:
+    """
+    Generate URL for user profile page.
+    """
+    return reverse("account:profile", kwargs={"username": username})
+
+
+def make_user_tag(user: User) -> str:
+    """
+    Generate HTML tag for user with link to their profile.
+    """
+    username = user.username
+    url = get_user_profile_url(username)
+
+    return f'<a href="{url}" class="fs-5 fw-bold link-offset-2 link-underline link-underline-opacity-0 link-secondary">{username}</a>'
+
+
+def render_ticker(shouters: List[Shouter]) -> str:
+    text_list = [
+        f'{make_user_tag(s.user)} : <span class="text-dark">{strip_tags(s.text)}</span>'
+        for s in shouters
+    ]
+    space = "&nbsp;" * 10
+
+    return f"{space}".join(text_list)
+
+
+def get_ticker_timeout() -> float:
+    timeout = get_ticker_settings()["TIMEOUT"]
+    expiration = shouter_pool.get_next_expiration()
+    if expiration:
+        left = (expiration - timezone.now()).total_seconds()
+        timeout = max(min(timeout, left), 1)
+    return timeout
+
+
+def render_variants() -> List[str]:
+    """Renders variants of the ticker with one query for all shouters."""
+    config = get_ticker_settings()
+    samples = [shouter_pool.sample(config["SIZE"]) for _ in range(config["VARIANTS"])]
+    shouters = (
+        get_live_shouters()
+        .select_related("user")
+        .in_bulk({pk for sample in samples for pk in sample})
+    )
+
+    return [
+        render_ticker([shouters[pk] for pk in sample if pk in shouters])
+        for sample in samples
+    ]
+
+
+def regenerate_ticker() -> None:
+    cache.set(CACHE_KEY, render_variants(), get_ticker_timeout())
+
+
+def get_ticker_variants() -> List[str]:
+    variants = cache.get(CACHE_KEY)
+    if variants is None:
+        variants = cache.get_or_set(CACHE_KEY, render_variants, get_ticker_timeout())
+    return variants
+
+
+def get_ticker(session_key: Optional[str]) -> str:
+    """Returns the variant of the session. Sessions without a key get a random one."""
+    variants = get_ticker_variants()
+    if not variants:
+        return ""
+
+    if session_key:
+        return variants[zlib.crc32(session_key.encode()) % len(variants)]
+    return random.choice(variants)
@@ -1,7 +1,10 @@
 from django.urls import path
 
-from .views import ShouterCreateView
+from .views import ShouterCreateView, ShouterHistoryView
 
 app_name = "shouter"
 
-urlpatterns = [path("create/", ShouterCreateView.as_view(), name="create")]
+urlpatterns = [
+    path("create/", ShouterCreateView.as_view(), name="create"),
+    path("history/", ShouterHistoryView.as_view(), name="history"),
+]
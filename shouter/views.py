@@ -3,13 +3,14 @@ from datetime import timedelta
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.views.generic import ListView
 from django.views.generic.edit import FormView
 
 from epuls_tools.scaler import give_away_puls
 from puls.models import PulsType
 
 from .forms import ShouterForm
-from .models import Shouter
+from .models import ArchivedShouter, Shouter
 
 
 class ShouterCreateView(LoginRequiredMixin, FormView):
@@ -44,3 +45,13 @@ class ShouterCreateView(LoginRequiredMixin, FormView):
         give_away_puls(user_profile=self.request.user.profile, type=PulsType.SURFING)
 
         return super().form_valid(form)
+
+
+class ShouterHistoryView(LoginRequiredMixin, ListView):
+    """Expired shouters of the user, read from the archive."""
+
+    template_name = "shouter/history.html"
+    paginate_by = 10
+
+    def get_queryset(self):
+        return ArchivedShouter.objects.filter(user=self.request.user)